@@ -1,47 +1,24 @@
+from __future__ import annotations
+
 import argparse
+import contextlib
+import importlib.util
 import json
+import os
 import sys
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from mcp_protocol.models import ToolError, ToolResult
+    from pydantic import BaseModel
+
+# Target packages are detected without importing them; their tools are
+# registered through lazy descriptors and only imported when invoked.
+HAS_BLENDER = importlib.util.find_spec("mcp_target_blender") is not None
+HAS_UE5 = importlib.util.find_spec("mcp_target_ue5") is not None
 
-from mcp_core import __version__ as core_version
-from mcp_core import register_system_tools
-from mcp_core.execution import executor
-from mcp_core.observability import configure_logging
-from mcp_core.registry import registry
-from mcp_protocol.models import (
-    AddObjectInput,
-    ConfigGetInput,
-    ConfigSetInput,
-    DebugBlueprintInput,
-    ExportAssetInput,
-    GenerateBlueprintInput,
-    GenerateSceneInput,
-    GenerateTerrainInput,
-    GenerateTextureInput,
-    HelpInput,
-    ImportAssetInput,
-    ListCommandsInput,
-    OptimizeLevelInput,
-    PopulateLevelInput,
-    ProfilePerformanceInput,
-    ResetConfigInput,
-    ToolError,
-    ToolResult,
-    Vec3,
-)
-
-# Try to import Blender tools
-try:
-    from mcp_target_blender import register_blender_tools
-    HAS_BLENDER = True
-except ImportError:
-    HAS_BLENDER = False
-
-# Try to import UE5 tools
-try:
-    from mcp_target_ue5 import register_ue5_tools
-    HAS_UE5 = True
-except ImportError:
-    HAS_UE5 = False
+_bootstrapped = False
 
 
 def _print_result(result: ToolResult | ToolError):
@@ -49,64 +26,127 @@ def _print_result(result: ToolResult | ToolError):
     # For now, just dump the model to stdout
     print(json.dumps(result.model_dump(), indent=2))
 
+def _run(tool_name: str, inp: BaseModel) -> None:
+    from mcp_core.execution import executor
+
+    result = executor.execute(tool_name, inp)
+    _print_result(result)
+
 def _handle_list_commands(args: argparse.Namespace):
+    from mcp_protocol.models import ListCommandsInput
+
     # Input is empty
     inp = ListCommandsInput()
-    result = executor.execute("mcp.list_commands", inp)
-    _print_result(result)
+    _run("mcp.list_commands", inp)
 
 def _handle_help(args: argparse.Namespace):
+    from mcp_protocol.models import HelpInput
+
     inp = HelpInput(command_name=args.command)
-    result = executor.execute("mcp.help", inp)
-    _print_result(result)
+    _run("mcp.help", inp)
 
 def _handle_config_get(args: argparse.Namespace):
+    from mcp_protocol.models import ConfigGetInput
+
     inp = ConfigGetInput(key=args.key)
-    result = executor.execute("mcp.config_get", inp)
-    _print_result(result)
+    _run("mcp.config_get", inp)
 
 def _handle_config_set(args: argparse.Namespace):
+    from mcp_protocol.models import ConfigSetInput
+
     inp = ConfigSetInput(key=args.key, value=args.value)
-    result = executor.execute("mcp.config_set", inp)
-    _print_result(result)
+    _run("mcp.config_set", inp)
 
 def _handle_reset_config(args: argparse.Namespace):
+    from mcp_protocol.models import ResetConfigInput
+
     inp = ResetConfigInput(confirm=args.confirm)
-    result = executor.execute("mcp.reset_config", inp)
-    _print_result(result)
+    _run("mcp.reset_config", inp)
+
+def _handle_batch(args: argparse.Namespace):
+    from mcp_core.execution import BatchRunner
+
+    runner = BatchRunner(max_workers=args.jobs)
+    with contextlib.ExitStack() as stack:
+        lines = sys.stdin if args.input == "-" else stack.enter_context(open(args.input, encoding="utf-8"))
+        # One JSON envelope per line, written as each request completes
+        for result in runner.run(lines, ordered=args.ordered):
+            print(result.model_dump_json(), flush=True)
+
+def _handle_pipeline_run(args: argparse.Namespace):
+    from mcp_core.planning import Pipeline, PipelineRunner
+
+    try:
+        pipeline = Pipeline.load(Path(args.spec))
+        results = PipelineRunner(max_workers=args.jobs).run(pipeline, dry_run=args.dry_run)
+    except (OSError, ValueError) as e:
+        print(f"Invalid pipeline: {e}", file=sys.stderr)
+        return 2
+
+    ok = all(result.status == "ok" for result in results.values())
+    print(json.dumps({
+        "pipeline": pipeline.name,
+        "status": "ok" if ok else "error",
+        "nodes": {name: result.model_dump() for name, result in results.items()},
+    }, indent=2))
+    return 0 if ok else 1
+
+def _handle_artifacts_gc(args: argparse.Namespace):
+    from mcp_core.storage import RetentionPolicy, retention
+
+    policy = RetentionPolicy.from_settings()
+    overrides = {
+        "max_age_days": args.max_age_days,
+        "failure_max_age_days": args.failure_max_age_days,
+        "max_total_bytes": args.max_bytes,
+        "keep_last_per_tool": args.keep_last,
+        "compact_after_days": args.compact_after_days,
+    }
+    policy = policy._replace(**{k: v for k, v in overrides.items() if v is not None})
+    report = retention.collect(policy, dry_run=args.dry_run)
+    print(json.dumps({"policy": policy._asdict(), **report}, indent=2))
 
 # --- Blender Handlers ---
 
 def _handle_generate_scene(args: argparse.Namespace):
+    from mcp_protocol.models import GenerateSceneInput
+
     inp = GenerateSceneInput(
         description=args.description,
         seed=args.seed,
         style=args.style,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.generate_scene", inp)
-    _print_result(result)
+    _run("mcp.generate_scene", inp)
 
 def _handle_add_object(args: argparse.Namespace):
+    from mcp_protocol.models import AddObjectInput, Vec3
+
     inp = AddObjectInput(
         object_type=args.object_type,
         location=Vec3(x=args.x, y=args.y, z=args.z),
         dry_run=args.dry_run if hasattr(args, "dry_run") else False # AddObjectInput in schema has dry_run? Checked model, yes it does in schema but not explicitly in command args in commands.md example. Adding for consistency if model supports it.
         # Wait, checking models.py: AddObjectInput has dry_run: bool = False.
     )
-    result = executor.execute("mcp.add_object", inp)
-    _print_result(result)
+    _run("mcp.add_object", inp)
 
 def _handle_generate_texture(args: argparse.Namespace):
+    from mcp_protocol.models import GenerateTextureInput
+
     inp = GenerateTextureInput(
         object_name=args.object_name,
         texture_type=args.texture_type,
+        pattern=args.pattern,
+        seed=args.seed,
+        resolution=args.resolution,
+        normal_map=args.normal_map,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.generate_texture", inp)
-    _print_result(result)
+    _run("mcp.generate_texture", inp)
 
 def _handle_export_asset(args: argparse.Namespace):
+    from mcp_protocol.models import ExportAssetInput
+
     inp = ExportAssetInput(
         object_name=args.object_name,
         format=args.format,
@@ -115,74 +155,123 @@ def _handle_export_asset(args: argparse.Namespace):
         overwrite=args.overwrite,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.export_asset", inp)
-    _print_result(result)
+    _run("mcp.export_asset", inp)
 
 
 # --- UE5 Handlers ---
 
 def _handle_import_asset(args: argparse.Namespace):
+    from mcp_protocol.models import ImportAssetInput
+
     inp = ImportAssetInput(
         manifest_path=args.manifest_path,
         dry_run=args.dry_run,
         overwrite=args.overwrite
     )
-    result = executor.execute("mcp.import_asset", inp)
-    _print_result(result)
+    _run("mcp.import_asset", inp)
+
+def _handle_import_assets(args: argparse.Namespace):
+    from mcp_protocol.models import ImportAssetsInput
+
+    inp = ImportAssetsInput(
+        manifest_paths=args.manifest_paths,
+        manifest_glob=args.glob,
+        dry_run=args.dry_run,
+        overwrite=args.overwrite
+    )
+    _run("mcp.import_assets", inp)
+
+def _handle_query_assets(args: argparse.Namespace):
+    from mcp_protocol.models import QueryAssetsInput
+
+    inp = QueryAssetsInput(
+        prefix=args.prefix,
+        class_name=args.class_name,
+        tag=args.tag,
+        limit=args.limit,
+        refresh=args.refresh
+    )
+    _run("mcp.query_assets", inp)
 
 def _handle_generate_terrain(args: argparse.Namespace):
+    from mcp_protocol.models import GenerateTerrainInput
+
     inp = GenerateTerrainInput(
         width=args.width,
         height=args.height,
         detail_level=args.detail_level,
         seed=args.seed,
+        components_per_tile=args.components_per_tile,
+        write_heightmap=args.write_heightmap,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.generate_terrain", inp)
-    _print_result(result)
+    _run("mcp.generate_terrain", inp)
 
 def _handle_populate_level(args: argparse.Namespace):
+    from mcp_protocol.models import PopulateLevelInput
+
     inp = PopulateLevelInput(
         asset_type=args.asset_type,
         density=args.density,
         seed=args.seed,
         budget_max_instances=args.budget_max_instances,
+        method=args.method,
+        bounds=args.bounds,
+        min_spacing=args.min_spacing,
+        heightmap_path=args.heightmap,
+        height_range=args.height_range,
+        max_slope_deg=args.max_slope,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.populate_level", inp)
-    _print_result(result)
+    _run("mcp.populate_level", inp)
 
 def _handle_generate_blueprint(args: argparse.Namespace):
+    from mcp_protocol.models import GenerateBlueprintInput
+
     inp = GenerateBlueprintInput(
         logic_description=args.logic_description,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.generate_blueprint", inp)
-    _print_result(result)
+    _run("mcp.generate_blueprint", inp)
 
 def _handle_profile_performance(args: argparse.Namespace):
+    from mcp_protocol.models import ProfilePerformanceInput
+
     inp = ProfilePerformanceInput(
-        level_name=args.level_name
+        level_name=args.level_name,
+        frames=args.frames,
+        hitch_threshold_ms=args.hitch_threshold_ms,
     )
-    result = executor.execute("mcp.profile_performance", inp)
-    _print_result(result)
+    _run("mcp.profile_performance", inp)
 
 def _handle_optimize_level(args: argparse.Namespace):
+    from mcp_protocol.models import OptimizeLevelInput
+
+    budgets = {}
+    for item in args.budget or []:
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise SystemExit(f"Invalid --budget '{item}': expected KEY=VALUE")
+        budgets[key] = float(value)
+    inventory = json.loads(Path(args.inventory).read_text(encoding="utf-8")) if args.inventory else None
     inp = OptimizeLevelInput(
         dry_run=args.dry_run,
-        budgets=None # CLI arg for budgets is complex, leaving None for now
+        budgets=budgets or None,
+        inventory=inventory,
     )
-    result = executor.execute("mcp.optimize_level", inp)
-    _print_result(result)
+    _run("mcp.optimize_level", inp)
 
 def _handle_debug_blueprint(args: argparse.Namespace):
+    from mcp_protocol.models import DebugBlueprintInput
+
     inp = DebugBlueprintInput(
         blueprint_name=args.blueprint_name
     )
-    result = executor.execute("mcp.debug_blueprint", inp)
-    _print_result(result)
+    _run("mcp.debug_blueprint", inp)
 
 def _handle_export_asset_ue5(args: argparse.Namespace):
+    from mcp_protocol.models import ExportAssetInput
+
     inp = ExportAssetInput(
         object_name=args.object_name,
         format=args.format,
@@ -191,27 +280,77 @@ def _handle_export_asset_ue5(args: argparse.Namespace):
         overwrite=args.overwrite,
         dry_run=args.dry_run
     )
-    result = executor.execute("mcp.export_asset_ue5", inp)
-    _print_result(result)
+    _run("mcp.export_asset_ue5", inp)
+
+
+# --- Daemon Handlers ---
+
+def _serve_request(argv: list[str]) -> int:
+    # Requests forwarded to the daemon always run in-process
+    return main(argv, forward=False)
 
+def _handle_serve(args: argparse.Namespace) -> int:
+    from mcp_core.config.settings import reload_settings, settings
+
+    from mcp.daemon import default_socket_path, is_daemon_running, serve, stop_daemon
+
+    # Resolved like the forwarding clients' socket, so both always agree
+    socket_path = args.socket or default_socket_path()
+    if args.stop:
+        if not stop_daemon(socket_path):
+            print(f"No mcp daemon is listening on {socket_path}", file=sys.stderr)
+            return 1
+        return 0
+    if is_daemon_running(socket_path):
+        print(f"An mcp daemon is already listening on {socket_path}", file=sys.stderr)
+        return 1
+    return serve(
+        socket_path,
+        _serve_request,
+        detach=args.daemon,
+        log_path=settings.daemon.log_path,
+        # Each run uses the forwarding client's MCP_* overrides
+        on_environment_change=reload_settings,
+    )
+
+
+def _bootstrap() -> None:
+    global _bootstrapped
+    # The daemon runs many commands in one process; register tools only once
+    if _bootstrapped:
+        return
+    _bootstrapped = True
+
+    from mcp_core import register_system_tools
+    from mcp_core.observability import configure_logging
+    from mcp_core.registry import registry
 
-def main(argv: list[str] | None = None) -> int:
     # Configure logging
     configure_logging()
 
     # Ensure system tools are registered
     register_system_tools(registry)
 
-    # Register Blender tools if available
+    # Register Blender tools if available (handlers are imported on first use)
     if HAS_BLENDER:
+        from mcp_target_blender import register_blender_tools
+
         register_blender_tools(registry)
 
-    # Register UE5 tools if available
+    # Register UE5 tools if available (handlers are imported on first use)
     if HAS_UE5:
+        from mcp_target_ue5 import register_ue5_tools
+
         register_ue5_tools(registry)
 
+
+def main(argv: list[str] | None = None, *, forward: bool = True) -> int:
     parser = argparse.ArgumentParser(prog="mcp", description="UE5-MCP Command Line Interface")
     parser.add_argument("--version", action="store_true", help="Show version")
+    parser.add_argument(
+        "--no-daemon", action="store_true",
+        help="Run in this process even if an mcp daemon is listening",
+    )
 
     subparsers = parser.add_subparsers(dest="subcommand", help="Available commands")
 
@@ -244,6 +383,43 @@ def main(argv: list[str] | None = None) -> int:
     parser_config_reset.add_argument("--confirm", action="store_true", help="Confirm reset")
     parser_config_reset.set_defaults(func=_handle_reset_config)
 
+    # batch
+    parser_batch = subparsers.add_parser("batch", help="Run JSONL tool requests in parallel")
+    parser_batch.add_argument("--input", "-i", required=True, help="JSONL file of {tool, input} requests ('-' for stdin)")
+    parser_batch.add_argument("--jobs", "-j", type=int, help="Maximum concurrent requests (default: batch.max_workers)")
+    parser_batch.add_argument("--ordered", action="store_true", help="Emit results in input order")
+    parser_batch.set_defaults(func=_handle_batch)
+
+    # pipeline
+    parser_pipeline = subparsers.add_parser("pipeline", help="Run declarative tool pipelines")
+    pipeline_subparsers = parser_pipeline.add_subparsers(dest="pipeline_op", required=True)
+    parser_pipeline_run = pipeline_subparsers.add_parser("run", help="Run a pipeline spec as a DAG")
+    parser_pipeline_run.add_argument("spec", help="Pipeline spec file (JSON, or YAML with PyYAML installed)")
+    parser_pipeline_run.add_argument("--jobs", "-j", type=int, help="Maximum concurrent nodes (default: batch.max_workers)")
+    parser_pipeline_run.add_argument("--dry-run", action="store_true", help="Run every node in dry-run mode")
+    parser_pipeline_run.set_defaults(func=_handle_pipeline_run)
+
+    # artifacts
+    parser_artifacts = subparsers.add_parser("artifacts", help="Manage stored artifacts")
+    artifacts_subparsers = parser_artifacts.add_subparsers(dest="artifacts_op", required=True)
+    parser_artifacts_gc = artifacts_subparsers.add_parser("gc", help="Apply artifact retention and compaction")
+    parser_artifacts_gc.add_argument("--dry-run", action="store_true", help="Report what would be removed")
+    parser_artifacts_gc.add_argument("--max-age-days", type=float, help="Delete runs older than this")
+    parser_artifacts_gc.add_argument("--failure-max-age-days", type=float, help="Age limit for failed runs")
+    parser_artifacts_gc.add_argument("--max-bytes", type=int, help="Delete the oldest runs beyond this total size")
+    parser_artifacts_gc.add_argument("--keep-last", type=int, help="Always keep the newest N runs per tool")
+    parser_artifacts_gc.add_argument(
+        "--compact-after-days", type=float, help="Pack manifest-only runs older than this"
+    )
+    parser_artifacts_gc.set_defaults(func=_handle_artifacts_gc)
+
+    # serve
+    parser_serve = subparsers.add_parser("serve", help="Run a long-lived mcp daemon")
+    parser_serve.add_argument("--daemon", action="store_true", help="Detach and run in the background")
+    parser_serve.add_argument("--socket", type=Path, help="Unix socket path (default: daemon.socket_path)")
+    parser_serve.add_argument("--stop", action="store_true", help="Stop a running daemon")
+    parser_serve.set_defaults(func=_handle_serve)
+
     if HAS_BLENDER:
         # mcp.generate_scene
         p_gen_scene = subparsers.add_parser("generate_scene", help="Generate a scene scaffold")
@@ -273,6 +449,13 @@ def main(argv: list[str] | None = None) -> int:
         p_gen_tex = subparsers.add_parser("generate_texture", help="Generate/apply texture")
         p_gen_tex.add_argument("object_name", help="Target object name")
         p_gen_tex.add_argument("texture_type", help="Type of texture")
+        p_gen_tex.add_argument(
+            "--pattern", choices=["noise", "marble", "wood", "checker", "bricks"],
+            help="Synthesize a procedural pattern"
+        )
+        p_gen_tex.add_argument("--seed", type=int, help="Random seed")
+        p_gen_tex.add_argument("--resolution", help="Texture resolution (e.g. 2K or 1024)")
+        p_gen_tex.add_argument("--normal-map", action="store_true", help="Also generate a normal map")
         p_gen_tex.add_argument("--dry-run", action="store_true", help="Simulate execution")
         p_gen_tex.set_defaults(func=_handle_generate_texture)
 
@@ -295,12 +478,35 @@ def main(argv: list[str] | None = None) -> int:
         p_import.add_argument("--dry-run", action="store_true", help="Simulate execution")
         p_import.set_defaults(func=_handle_import_asset)
 
+        # mcp.import_assets
+        p_import_many = subparsers.add_parser("import_assets", help="Import many assets in one transaction")
+        p_import_many.add_argument("manifest_paths", nargs="*", help="Paths to export manifests")
+        p_import_many.add_argument("--glob", help="Glob matching export manifests (e.g. 'exports/**/*.manifest.json')")
+        p_import_many.add_argument("--overwrite", action="store_true", help="Overwrite existing assets")
+        p_import_many.add_argument("--dry-run", action="store_true", help="Simulate execution")
+        p_import_many.set_defaults(func=_handle_import_assets)
+
+        # mcp.query_assets
+        p_query_assets = subparsers.add_parser("query_assets", help="Query assets by path, class and tag")
+        p_query_assets.add_argument("--prefix", help="Object path prefix (e.g. '/Game/Props/')")
+        p_query_assets.add_argument("--class", dest="class_name", help="Asset class (e.g. StaticMesh)")
+        p_query_assets.add_argument("--tag", help="Asset Registry tag as KEY or KEY=VALUE")
+        p_query_assets.add_argument("--limit", type=int, default=1000, help="Maximum assets returned")
+        p_query_assets.add_argument("--refresh", action="store_true", help="Rescan the Asset Registry first")
+        p_query_assets.set_defaults(func=_handle_query_assets)
+
         # mcp.generate_terrain
         p_gen_terrain = subparsers.add_parser("generate_terrain", help="Generate terrain")
         p_gen_terrain.add_argument("width", type=int, help="Width")
         p_gen_terrain.add_argument("height", type=int, help="Height")
         p_gen_terrain.add_argument("detail_level", choices=["low", "medium", "high"], help="Detail level")
         p_gen_terrain.add_argument("--seed", type=int, help="Random seed")
+        p_gen_terrain.add_argument(
+            "--components-per-tile", type=int, default=8, help="Landscape components per tile side"
+        )
+        p_gen_terrain.add_argument(
+            "--write-heightmap", action="store_true", help="Also write the full heightmap as a memory-mapped .npy"
+        )
         p_gen_terrain.add_argument("--dry-run", action="store_true", help="Simulate execution")
         p_gen_terrain.set_defaults(func=_handle_generate_terrain)
 
@@ -310,6 +516,19 @@ def main(argv: list[str] | None = None) -> int:
         p_pop_level.add_argument("density", type=int, help="Density (count)")
         p_pop_level.add_argument("--seed", type=int, help="Random seed")
         p_pop_level.add_argument("--budget-max-instances", type=int, help="Max instances budget")
+        p_pop_level.add_argument(
+            "--method", choices=["jittered_grid", "poisson"], default="jittered_grid", help="Placement method"
+        )
+        p_pop_level.add_argument(
+            "--bounds", type=float, nargs=4, metavar=("MIN_X", "MIN_Y", "MAX_X", "MAX_Y"),
+            help="Placement bounds in world units"
+        )
+        p_pop_level.add_argument("--min-spacing", type=float, help="Minimum spacing for poisson placement")
+        p_pop_level.add_argument("--heightmap", help="Heightmap (.npy) covering the bounds")
+        p_pop_level.add_argument(
+            "--height-range", type=float, nargs=2, metavar=("MIN", "MAX"), help="Allowed terrain heights"
+        )
+        p_pop_level.add_argument("--max-slope", type=float, help="Maximum terrain slope in degrees")
         p_pop_level.add_argument("--dry-run", action="store_true", help="Simulate execution")
         p_pop_level.set_defaults(func=_handle_populate_level)
 
@@ -322,11 +541,20 @@ def main(argv: list[str] | None = None) -> int:
         # mcp.profile_performance
         p_profile = subparsers.add_parser("profile_performance", help="Profile level performance")
         p_profile.add_argument("level_name", help="Level name")
+        p_profile.add_argument("--frames", type=int, default=300, help="Frames to sample")
+        p_profile.add_argument(
+            "--hitch-threshold-ms", type=float, help="Hitch threshold (default: twice the median frame time)"
+        )
         p_profile.set_defaults(func=_handle_profile_performance)
 
         # mcp.optimize_level
         p_opt = subparsers.add_parser("optimize_level", help="Optimize level")
         p_opt.add_argument("--dry-run", action="store_true", help="Simulate execution")
+        p_opt.add_argument(
+            "--budget", action="append", metavar="KEY=VALUE",
+            help="Budget override (max_draw_calls, max_polycount, max_instances); repeatable"
+        )
+        p_opt.add_argument("--inventory", help="Level inventory JSON to plan against")
         p_opt.set_defaults(func=_handle_optimize_level)
 
         # mcp.debug_blueprint
@@ -337,13 +565,32 @@ def main(argv: list[str] | None = None) -> int:
     args = parser.parse_args(argv)
 
     if args.version:
+        from mcp_core import __version__ as core_version
+
         # We use the core version as the system version for now
         print(core_version)
         return 0
 
     if hasattr(args, "func"):
-        args.func(args)
-        return 0
+        if (
+            forward
+            and args.subcommand != "serve"
+            # The daemon cannot read this process's stdin
+            and getattr(args, "input", None) != "-"
+            and not args.no_daemon
+            and not os.environ.get("MCP_NO_DAEMON")
+        ):
+            from mcp.daemon import default_socket_path, forward_to_daemon
+
+            # Only the socket is probed here so forwarding stays as cheap as
+            # possible; without a reachable daemon the command runs locally.
+            rc = forward_to_daemon(argv if argv is not None else sys.argv[1:], default_socket_path())
+            if rc is not None:
+                return rc
+
+        # Settings, logging and tool registration are only needed to run a command
+        _bootstrap()
+        return args.func(args) or 0
 
     parser.print_help()
     return 0
@@ -0,0 +1,319 @@
+"""
+Long-lived daemon for the mcp CLI.
+
+``mcp serve`` listens on a Unix socket and runs CLI invocations in-process,
+so the tool registry, target transports (including a running Blender
+process) and caches stay warm between calls. Other ``mcp`` invocations
+forward their arguments to the daemon when its socket is present and fall
+back to running locally otherwise.
+
+Wire protocol: newline-delimited JSON. The client sends one request line
+(``{"op": "run", "argv": [...], "cwd": "...", "env": {...}}``,
+``{"op": "ping"}`` or ``{"op": "shutdown"}``); the daemon streams back
+``{"out": ...}`` and ``{"err": ...}`` frames followed by a final
+``{"exit": <code>}`` frame.
+
+``env`` carries the client's ``MCP_*`` settings overrides and provider API
+keys. The daemon applies it before each run and reloads settings when it
+differs from the previous run's, so a command behaves the same with and
+without a daemon.
+"""
+from __future__ import annotations
+
+import contextlib
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import traceback
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+# Connect timeout for clients probing the socket; runs themselves are unbounded
+_CONNECT_TIMEOUT = 2.0
+
+# Environment forwarded with each run: settings overrides and provider API keys
+_FORWARDED_PREFIX = "MCP_"
+_FORWARDED_KEYS = ("OPENAI_API_KEY",)
+
+
+def forwarded_environment() -> dict[str, str]:
+    """The variables of this process's environment that are sent with a run."""
+    return {
+        key: value for key, value in os.environ.items()
+        if key.startswith(_FORWARDED_PREFIX) or key in _FORWARDED_KEYS
+    }
+
+
+class _FrameWriter:
+    """File-like object that forwards writes to the client as JSON frames."""
+
+    def __init__(self, wfile: io.BufferedIOBase, key: str):
+        self._wfile = wfile
+        self._key = key
+
+    def write(self, text: str) -> int:
+        if text:
+            _send_frame(self._wfile, {self._key: text})
+        return len(text)
+
+    def flush(self) -> None:
+        self._wfile.flush()
+
+    def isatty(self) -> bool:
+        return False
+
+
+def _send_frame(wfile: io.BufferedIOBase, frame: dict[str, Any]) -> None:
+    wfile.write(json.dumps(frame).encode("utf-8") + b"\n")
+    wfile.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: DaemonServer
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+        try:
+            request = json.loads(line)
+        except json.JSONDecodeError:
+            _send_frame(self.wfile, {"err": "Invalid request\n"})
+            _send_frame(self.wfile, {"exit": 2})
+            return
+
+        op = request.get("op", "run")
+        if op == "ping":
+            _send_frame(self.wfile, {"exit": 0, "pid": os.getpid()})
+        elif op == "shutdown":
+            _send_frame(self.wfile, {"exit": 0})
+            threading.Thread(target=self.server.shutdown, daemon=True).start()
+        elif op == "run":
+            code = self.server.run_request(
+                request.get("argv", []), request.get("cwd"), self.wfile, request.get("env")
+            )
+            _send_frame(self.wfile, {"exit": code})
+        else:
+            _send_frame(self.wfile, {"err": f"Unknown op: {op}\n"})
+            _send_frame(self.wfile, {"exit": 2})
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """
+    Unix socket server that executes CLI invocations in the daemon process.
+    Runs are serialized: stdout/cwd redirection is process-wide, and target
+    sessions (Blender scene, UE5 editor) are shared mutable state anyway.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        socket_path: Path,
+        runner: Callable[[list[str]], int],
+        on_environment_change: Callable[[], Any] | None = None,
+    ):
+        self.socket_path = socket_path
+        self.runner = runner
+        self.on_environment_change = on_environment_change
+        self._run_lock = threading.Lock()
+        socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if socket_path.exists():
+            if is_daemon_running(socket_path):
+                raise RuntimeError(f"An mcp daemon is already listening on {socket_path}")
+            # Stale socket left by a daemon that did not shut down cleanly
+            socket_path.unlink()
+        # Owner-only from the moment bind creates it; a chmod afterwards would leave a window
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(str(socket_path), _RequestHandler)
+        finally:
+            os.umask(previous_umask)
+
+    def apply_environment(self, env: dict[str, str]) -> None:
+        """
+        Make the forwarded variables of the daemon's environment match env,
+        calling on_environment_change if anything changed.
+        """
+        current = forwarded_environment()
+        if env == current:
+            return
+        for key in current.keys() - env.keys():
+            del os.environ[key]
+        os.environ.update(env)
+        if self.on_environment_change is not None:
+            self.on_environment_change()
+
+    def run_request(
+        self, argv: list[str], cwd: str | None, wfile: io.BufferedIOBase, env: dict[str, str] | None = None
+    ) -> int:
+        with self._run_lock:
+            previous_cwd = os.getcwd()
+            out = _FrameWriter(wfile, "out")
+            err = _FrameWriter(wfile, "err")
+            try:
+                if cwd:
+                    os.chdir(cwd)
+                with contextlib.redirect_stdout(out), contextlib.redirect_stderr(err):
+                    try:
+                        if env is not None:
+                            self.apply_environment(env)
+                        return self.runner(argv)
+                    except SystemExit as e:
+                        # argparse errors and explicit exits
+                        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+                    except Exception:
+                        traceback.print_exc()
+                        return 1
+            finally:
+                os.chdir(previous_cwd)
+
+    def server_close(self) -> None:
+        super().server_close()
+        self.socket_path.unlink(missing_ok=True)
+
+
+def _connect(socket_path: Path) -> socket.socket | None:
+    if not socket_path.exists():
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(_CONNECT_TIMEOUT)
+    try:
+        sock.connect(str(socket_path))
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def _request(sock: socket.socket, request: dict[str, Any]) -> int:
+    with sock, sock.makefile("rwb") as stream:
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        for line in stream:
+            frame = json.loads(line)
+            if "out" in frame:
+                sys.stdout.write(frame["out"])
+            if "err" in frame:
+                sys.stderr.write(frame["err"])
+            if "exit" in frame:
+                sys.stdout.flush()
+                return int(frame["exit"])
+    raise ConnectionError("mcp daemon closed the connection without an exit status")
+
+
+def default_socket_path() -> Path:
+    """
+    The configured daemon.socket_path, shared by ``mcp serve`` and
+    forwarding clients. Read without loading the full settings so that
+    forwarding stays cheap.
+    """
+    from mcp_core.config.files import config_value
+
+    return Path(config_value("daemon", "socket_path", default="~/.mcp/daemon.sock")).expanduser()
+
+
+def forward_to_daemon(argv: list[str], socket_path: Path) -> int | None:
+    """
+    Run argv on the daemon listening at socket_path, streaming its output.
+    Returns the exit code, or None if no daemon is reachable.
+    """
+    sock = _connect(socket_path)
+    if sock is None:
+        return None
+    return _request(sock, {"op": "run", "argv": argv, "cwd": os.getcwd(), "env": forwarded_environment()})
+
+
+def is_daemon_running(socket_path: Path) -> bool:
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    try:
+        return _request(sock, {"op": "ping"}) == 0
+    except (OSError, ValueError):
+        return False
+
+
+def stop_daemon(socket_path: Path) -> bool:
+    """Ask the daemon at socket_path to shut down. Returns False if none is running."""
+    sock = _connect(socket_path)
+    if sock is None:
+        return False
+    _request(sock, {"op": "shutdown"})
+    return True
+
+
+def _detach(log_path: Path) -> None:
+    """Fork into the background, detach from the terminal and redirect output to log_path."""
+    if os.fork() > 0:
+        os._exit(0)
+    os.setsid()
+    if os.fork() > 0:
+        os._exit(0)
+
+    log_path.parent.mkdir(parents=True, exist_ok=True)
+    log_fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o600)
+    null_fd = os.open(os.devnull, os.O_RDONLY)
+    os.dup2(null_fd, 0)
+    os.dup2(log_fd, 1)
+    os.dup2(log_fd, 2)
+    os.close(null_fd)
+    os.close(log_fd)
+
+
+def _disconnect_transports() -> None:
+    # Only targets that were actually used have their tools module loaded
+    for module_name in ("mcp_target_blender.tools", "mcp_target_ue5.tools"):
+        module = sys.modules.get(module_name)
+        if module is None:
+            continue
+        # Blender keeps one session per concurrency slot
+        transports = list(getattr(module, "_transports", {}).values())
+        if getattr(module, "_transport", None) is not None:
+            transports.append(module._transport)
+        for transport in transports:
+            try:
+                transport.disconnect()
+            except Exception as e:
+                print(f"Failed to disconnect {module_name} transport: {e}", file=sys.stderr)
+
+
+def serve(
+    socket_path: Path,
+    runner: Callable[[list[str]], int],
+    detach: bool = False,
+    log_path: Path | None = None,
+    ready: threading.Event | None = None,
+    on_environment_change: Callable[[], Any] | None = None,
+) -> int:
+    """
+    Serve CLI requests on socket_path until shut down. on_environment_change
+    is called before a run whose forwarded environment differs from the
+    previous one (e.g. to reload settings).
+    """
+    if detach:
+        _detach(log_path or socket_path.with_suffix(".log"))
+
+    server = DaemonServer(socket_path, runner, on_environment_change)
+
+    if threading.current_thread() is threading.main_thread():
+        signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    print(f"mcp daemon listening on {socket_path} (pid {os.getpid()})", flush=True)
+    if ready is not None:
+        ready.set()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        _disconnect_transports()
+    return 0
@@ -1,6 +1,18 @@
-from .system_tools import register_system_tools
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .system_tools import register_system_tools
 
 __all__ = ["__version__", "register_system_tools"]
 
 
 __version__ = "1.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    # Imported lazily so reading __version__ does not load the tool runtime
+    if name == "register_system_tools":
+        from .system_tools import register_system_tools
+
+        return register_system_tools
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
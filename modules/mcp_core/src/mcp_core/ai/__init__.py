@@ -1,6 +1,7 @@
 from .budget import AIBudgetConfig, AIRequestCost, BudgetTracker
 from .client import AIClient
 from .factory import create_ai_client
+from .image_cache import ImageCache, generate_image_artifacts, image_cache
 from .models import (
     AICompletionRequest,
     AICompletionResponse,
@@ -16,6 +17,9 @@ from .safety import SafetyPolicy, SafetyValidator
 __all__ = [
     "AIClient",
     "create_ai_client",
+    "ImageCache",
+    "image_cache",
+    "generate_image_artifacts",
     "AIProvider",
     "OpenAIProvider",
     "AICompletionRequest",
@@ -3,7 +3,13 @@ from typing import Any
 from mcp_core.config.settings import AIConfig, SafetyConfig
 
 from .budget import AIBudgetConfig, AIRequestCost, BudgetTracker
-from .models import AICompletionRequest, AICompletionResponse
+from .models import (
+    AICompletionRequest,
+    AICompletionResponse,
+    AIModelUsage,
+    ImageGenerationRequest,
+    ImageGenerationResponse,
+)
 from .prompts import PromptRegistry
 from .provider import AIProvider
 from .safety import SafetyPolicy, SafetyValidator
@@ -85,12 +91,29 @@ class AIClient:
             raise ValueError("AI response violates safety policy.")
 
         # 6. Track Usage
-        if response.usage:
-            cost = AIRequestCost(
-                total_cost_usd=response.usage.cost_usd or 0.0,
-                prompt_tokens=response.usage.prompt_tokens,
-                completion_tokens=response.usage.completion_tokens
-            )
-            self.budget_tracker.track_usage(cost)
+        self.track_usage(response.usage)
 
         return response
+
+    async def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        """
+        Generate images, enforcing budget and safety. Callers that can reuse
+        earlier images should go through mcp_core.ai.image_cache instead.
+        """
+        self.budget_tracker.check_budget()
+
+        if not self.safety_validator.validate_content(request.prompt):
+            raise ValueError("Input prompt violates safety policy.")
+
+        response = await self.provider.generate_image(request)
+        self.track_usage(response.usage)
+        return response
+
+    def track_usage(self, usage: AIModelUsage | None) -> None:
+        """Charge a request's usage to the budget."""
+        if usage:
+            self.budget_tracker.track_usage(AIRequestCost(
+                total_cost_usd=usage.cost_usd or 0.0,
+                prompt_tokens=usage.prompt_tokens,
+                completion_tokens=usage.completion_tokens
+            ))
@@ -0,0 +1,194 @@
+"""
+Persistent cache of generated images.
+
+Image generation is slow and billed per image, while prompts (such as a
+texture type) repeat across objects and runs. Images are keyed by
+(provider, prompt, model, size, n); their bytes live in the artifact
+store's content-addressed blobs and each cache entry is a small JSON file
+under ``<artifacts root>/image_cache`` listing the blob hashes. Entries are
+evicted least-recently-used once the images they hold exceed
+``ai.image_cache.max_bytes``.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from mcp_protocol import Artifact
+
+from ..config.settings import settings
+from ..storage import artifact_manager
+from ..storage.result_cache import canonical_json
+from .client import AIClient
+from .models import AIModelUsage, ImageGenerationRequest
+
+
+class _Entry(NamedTuple):
+    size: int
+    blobs: tuple[str, ...]
+
+
+class ImageCache:
+    def __init__(self, root: Path | None = None, max_bytes: int | None = None):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> entry, ordered from least to most recently used
+        self._index: OrderedDict[str, _Entry] | None = None
+        self._total_bytes = 0
+
+    @property
+    def root(self) -> Path:
+        return (self._root or settings.artifacts.root) / "image_cache"
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes if self._max_bytes is not None else settings.ai.image_cache.max_bytes
+
+    @staticmethod
+    def make_key(provider: str, request: ImageGenerationRequest) -> str:
+        material = canonical_json({
+            "provider": provider,
+            "prompt": request.prompt,
+            "model": request.model,
+            "size": request.size,
+            "n": request.n,
+        })
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, _Entry]:
+        if self._index is None:
+            entries: list[tuple[float, str, _Entry]] = []
+            if self.root.exists():
+                for path in self.root.glob("*/*.json"):
+                    try:
+                        record = json.loads(path.read_text(encoding="utf-8"))
+                        blobs = record["blobs"]
+                        entry = _Entry(sum(b["size"] for b in blobs), tuple(b["sha256"] for b in blobs))
+                        entries.append((path.stat().st_mtime, path.stem, entry))
+                    except (OSError, ValueError, KeyError, TypeError):
+                        continue
+            entries.sort()
+            self._index = OrderedDict((key, entry) for _, key, entry in entries)
+            self._total_bytes = sum(e.size for e in self._index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        index = self._load_index()
+        entry = index.pop(key, None)
+        self._path(key).unlink(missing_ok=True)
+        if entry is None:
+            return
+        self._total_bytes -= entry.size
+        # Blobs shared with another entry stay; copies linked into runs are unaffected
+        referenced = {sha for e in index.values() for sha in e.blobs}
+        for sha in entry.blobs:
+            if sha not in referenced:
+                artifact_manager.blob_path(sha).unlink(missing_ok=True)
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        """Return the cached record for key, or None on a miss."""
+        with self._lock:
+            index = self._load_index()
+            path = self._path(key)
+            try:
+                record: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                index.pop(key, None)
+                return None
+            except ValueError:
+                self._drop(key)
+                return None
+
+            if not all(artifact_manager.blob_path(b["sha256"]).exists() for b in record["blobs"]):
+                self._drop(key)
+                return None
+
+            if key in index:
+                index.move_to_end(key)
+            os.utime(path)
+            return record
+
+    def put(self, key: str, artifacts: list[Artifact], cost_usd: float = 0.0) -> None:
+        """Record the stored images for key and evict old entries if over the size limit."""
+        blobs = [{"sha256": a.metadata["sha256"], "size": a.metadata["size"]} for a in artifacts if a.metadata]
+        entry = _Entry(sum(b["size"] for b in blobs), tuple(b["sha256"] for b in blobs))
+        with self._lock:
+            index = self._load_index()
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+            tmp_path.write_text(canonical_json({"blobs": blobs, "cost_usd": cost_usd}), encoding="utf-8")
+            os.replace(tmp_path, path)
+
+            previous = index.get(key)
+            self._total_bytes += entry.size - (previous.size if previous else 0)
+            index[key] = entry
+            index.move_to_end(key)
+            while len(index) > 1 and self._total_bytes > self.max_bytes:
+                self._drop(next(iter(index)))
+
+    def clear(self) -> None:
+        """Remove all cache entries (and the blobs only they reference)."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+
+# Global image cache
+image_cache = ImageCache()
+
+
+def _filename(filename: str, i: int) -> str:
+    if i == 0:
+        return filename
+    stem, dot, suffix = filename.rpartition(".")
+    return f"{stem}_{i}.{suffix}" if dot else f"{filename}_{i}"
+
+
+def generate_image_artifacts(
+    client: AIClient,
+    request: ImageGenerationRequest,
+    run_id: str,
+    filename: str,
+    metadata: dict[str, Any] | None = None,
+) -> list[Artifact]:
+    """
+    Return the images for request as artifacts in the run directory,
+    generating and downloading them only when they are not cached.
+    """
+    config = settings.ai.image_cache
+    key = ImageCache.make_key(client.provider.name, request)
+
+    record = image_cache.get(key) if config.enabled else None
+    if record is not None:
+        if config.count_against_budget:
+            client.budget_tracker.check_budget(estimated_cost=record.get("cost_usd", 0.0))
+            client.track_usage(AIModelUsage(cost_usd=record.get("cost_usd", 0.0)))
+        return [
+            artifact_manager.link_blob(
+                run_id, blob["sha256"], _filename(filename, i), "image/png", {**(metadata or {}), "cached": True}
+            )
+            for i, blob in enumerate(record["blobs"])
+        ]
+
+    response = asyncio.run(client.generate_image(request))
+    artifacts = [
+        artifact_manager.download(run_id, url, _filename(filename, i), "image/png", metadata)
+        for i, url in enumerate(response.urls)
+    ]
+    if config.enabled and artifacts:
+        cost = (response.usage.cost_usd or 0.0) if response.usage else 0.0
+        image_cache.put(key, artifacts, cost)
+    return artifacts
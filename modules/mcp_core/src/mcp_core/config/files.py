@@ -0,0 +1,42 @@
+"""
+Locations of the JSON config files, and a lightweight reader for single
+settings. The reader follows McpSettings' precedence (environment, then the
+files in order) without loading the full settings, for callers such as the
+CLI's daemon probe that must stay cheap.
+"""
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+# Earlier files take precedence over later ones
+CONFIG_FILES = (
+    Path("~/.mcp/blender_mcp_config.json").expanduser(),
+    Path("~/.mcp/ue5_mcp_config.json").expanduser(),
+)
+
+ENV_PREFIX = "MCP_"
+ENV_NESTED_DELIMITER = "__"
+
+
+def config_value(*keys: str, default: Any = None) -> Any:
+    """
+    The setting at keys (e.g. ``"daemon", "socket_path"``) as configured in
+    the environment or the config files, or default. Values are returned as
+    written, without the validation McpSettings applies.
+    """
+    env_name = ENV_PREFIX + ENV_NESTED_DELIMITER.join(keys).upper()
+    if env_name in os.environ:
+        return os.environ[env_name]
+    for path in CONFIG_FILES:
+        try:
+            value: Any = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            continue
+        for key in keys:
+            if not isinstance(value, dict) or key not in value:
+                break
+            value = value[key]
+        else:
+            return value
+    return default
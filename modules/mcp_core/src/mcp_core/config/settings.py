@@ -1,5 +1,7 @@
+import hashlib
+import json
 from pathlib import Path
-from typing import Literal
+from typing import Any, Literal, cast
 
 from pydantic import Field
 from pydantic_settings import (
@@ -9,90 +11,156 @@ from pydantic_settings import (
     SettingsConfigDict,
 )
 
+from .files import CONFIG_FILES, ENV_NESTED_DELIMITER, ENV_PREFIX
 
-class LoggingConfig(BaseSettings):
+# Incremented whenever a settings field is assigned, so derived state
+# (such as the config hash) can be rebuilt only when configuration changes.
+_generation = 0
+
+
+def config_generation() -> int:
+    """Return a counter that changes whenever any settings field is assigned."""
+    return _generation
+
+
+class ConfigSection(BaseSettings):
+    """Base class for settings models that tracks field assignment."""
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        global _generation
+        super().__setattr__(name, value)
+        _generation += 1
+
+
+class LoggingConfig(ConfigSection):
     level: str = "INFO"
     format: Literal["json", "text"] = "json"
     output: str = "stdout"
 
-class ArtifactsConfig(BaseSettings):
+class ArtifactsRetentionConfig(ConfigSection):
+    # None disables the limit
+    max_age_days: float | None = None
+    # Age limit for failed runs; defaults to max_age_days
+    failure_max_age_days: float | None = None
+    max_total_bytes: int | None = None
+    keep_last_per_tool: int = 5
+    compact_after_days: float | None = 7.0
+    background: bool = False
+    background_interval_seconds: int = 3600
+
+class ArtifactsConfig(ConfigSection):
     root: Path = Path("~/.mcp/artifacts").expanduser()
     write_manifests: bool = True
+    # Queue manifest writes to a background thread instead of writing inline
+    write_behind: bool = True
+    # Do not record manifests for read-only system tools (mcp.help, mcp.config_get, ...)
+    skip_read_only_manifests: bool = False
+    retention: ArtifactsRetentionConfig = Field(default_factory=ArtifactsRetentionConfig)
+
+class CacheConfig(ConfigSection):
+    enabled: bool = False
+    root: Path = Path("~/.mcp/cache").expanduser()
+    max_entries: int = 10000
+    max_bytes: int = 512 * 1024 * 1024
+    # Disk budget of generated procedural textures under <root>/textures
+    texture_max_bytes: int = 2 * 1024 * 1024 * 1024
+    # Skip exports/imports whose inputs are unchanged since the last build
+    incremental_builds: bool = False
 
-class PolicyConfig(BaseSettings):
+class DaemonConfig(ConfigSection):
+    socket_path: Path = Path("~/.mcp/daemon.sock").expanduser()
+    log_path: Path = Path("~/.mcp/daemon.log").expanduser()
+
+class BatchConfig(ConfigSection):
+    max_workers: int = 4
+    # Maximum concurrent requests per target (or declared concurrency group);
+    # tools without either are unlimited
+    target_concurrency: dict[str, int] = Field(default_factory=lambda: {"blender": 1, "ue5": 1})
+
+class PolicyConfig(ConfigSection):
     allow_destructive: bool = False
     allowed_paths: list[str] = Field(default_factory=list)
     tool_allowlist: list[str] = Field(default_factory=list)
 
-class AIBudgetConfig(BaseSettings):
+class AIBudgetConfig(ConfigSection):
     max_requests_per_run: int = 20
     max_total_tokens: int = 20000
     max_total_cost_usd: float = 5.0
     timeout_seconds: int = 60
 
-class AIConfig(BaseSettings):
+class AIImageCacheConfig(ConfigSection):
+    enabled: bool = True
+    max_bytes: int = 1024 * 1024 * 1024
+    # Whether images served from the cache are charged to the run's AI budget
+    count_against_budget: bool = False
+
+class AIConfig(ConfigSection):
     enabled: bool = True
     provider: str = "openai"
     budget: AIBudgetConfig = Field(default_factory=AIBudgetConfig)
+    image_cache: AIImageCacheConfig = Field(default_factory=AIImageCacheConfig)
 
-class SafetyConfig(BaseSettings):
+class SafetyConfig(ConfigSection):
     block_injection_patterns: bool = True
     allowed_tools: list[str] | None = None
     deny_tools: list[str] = ["os.system", "subprocess.call", "eval", "exec"]
 
-class BlenderSceneGenerationConfig(BaseSettings):
+class BlenderSceneGenerationConfig(ConfigSection):
     default_style: str = "realistic"
     object_variation: bool = True
     default_seed: int = 0
 
-class BlenderAssetProcessingConfig(BaseSettings):
+class BlenderAssetProcessingConfig(ConfigSection):
     texture_resolution: str = "4K"
     lod_levels: int = 3
     batch_processing: bool = True
 
-class BlenderExportConfig(BaseSettings):
+class BlenderExportConfig(ConfigSection):
     default_format: str = "fbx"
     include_textures_by_default: bool = False
     axis: str = "-Z+Y"
     scale: float = 1.0
 
-class BlenderTransportConfig(BaseSettings):
+class BlenderTransportConfig(ConfigSection):
     executable_path: str = "blender"
 
-class BlenderConfig(BaseSettings):
+class BlenderConfig(ConfigSection):
     transport: BlenderTransportConfig = Field(default_factory=BlenderTransportConfig)
     scene_generation: BlenderSceneGenerationConfig = Field(default_factory=BlenderSceneGenerationConfig)
     asset_processing: BlenderAssetProcessingConfig = Field(default_factory=BlenderAssetProcessingConfig)
     export: BlenderExportConfig = Field(default_factory=BlenderExportConfig)
 
-class UE5LevelDesignConfig(BaseSettings):
+class UE5LevelDesignConfig(ConfigSection):
     default_terrain_size: tuple[int, int] = (1000, 1000)
     auto_populate: bool = False
     default_seed: int = 0
 
-class UE5PerformanceBudgetsConfig(BaseSettings):
+class UE5PerformanceBudgetsConfig(ConfigSection):
     max_instances: int = 200000
     max_draw_calls: int = 5000
 
-class UE5PerformanceConfig(BaseSettings):
+class UE5PerformanceConfig(ConfigSection):
     dynamic_lighting: bool = False
     max_polycount: int = 500000
     physics_enabled: bool = True
     budgets: UE5PerformanceBudgetsConfig = Field(default_factory=UE5PerformanceBudgetsConfig)
 
-class UE5TransportConfig(BaseSettings):
+class UE5TransportConfig(ConfigSection):
     host: str = "localhost"
     port: int = 8080
 
-class UE5Config(BaseSettings):
+class UE5Config(ConfigSection):
     transport: UE5TransportConfig = Field(default_factory=UE5TransportConfig)
     level_design: UE5LevelDesignConfig = Field(default_factory=UE5LevelDesignConfig)
     performance: UE5PerformanceConfig = Field(default_factory=UE5PerformanceConfig)
 
-class McpSettings(BaseSettings):
+class McpSettings(ConfigSection):
     protocol_version: str = "1.0"
     logging: LoggingConfig = Field(default_factory=LoggingConfig)
     artifacts: ArtifactsConfig = Field(default_factory=ArtifactsConfig)
+    cache: CacheConfig = Field(default_factory=CacheConfig)
+    daemon: DaemonConfig = Field(default_factory=DaemonConfig)
+    batch: BatchConfig = Field(default_factory=BatchConfig)
     policy: PolicyConfig = Field(default_factory=PolicyConfig)
     ai: AIConfig = Field(default_factory=AIConfig)
     safety: SafetyConfig = Field(default_factory=SafetyConfig)
@@ -100,8 +168,8 @@ class McpSettings(BaseSettings):
     ue5: UE5Config = Field(default_factory=UE5Config)
 
     model_config = SettingsConfigDict(
-        env_prefix="MCP_",
-        env_nested_delimiter="__",
+        env_prefix=ENV_PREFIX,
+        env_nested_delimiter=ENV_NESTED_DELIMITER,
         case_sensitive=False,
         extra="ignore"
     )
@@ -118,16 +186,95 @@ class McpSettings(BaseSettings):
         return (
             init_settings,
             env_settings,
-            JsonConfigSettingsSource(
-                settings_cls,
-                json_file=Path("~/.mcp/blender_mcp_config.json").expanduser()
-            ),
-            JsonConfigSettingsSource(
-                settings_cls,
-                json_file=Path("~/.mcp/ue5_mcp_config.json").expanduser()
-            ),
+            *(JsonConfigSettingsSource(settings_cls, json_file=path) for path in CONFIG_FILES),
             file_secret_settings,
         )
 
-# Global settings instance loaded with defaults, config files, and environment variables
-settings = McpSettings()
+
+_settings: McpSettings | None = None
+
+
+def get_settings() -> McpSettings:
+    """Return the global settings, loading them on first use."""
+    global _settings
+    if _settings is None:
+        _settings = McpSettings()
+    return _settings
+
+
+def reload_settings() -> McpSettings:
+    """Discard the loaded settings and read config files and environment again."""
+    global _settings, _generation
+    _settings = McpSettings()
+    _generation += 1
+    return _settings
+
+
+class _LazySettings:
+    """
+    Stand-in for the global McpSettings instance.
+    Config files and environment variables are only read when an attribute
+    is first accessed, so importing modules that reference settings is cheap.
+    """
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_settings(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(get_settings(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(get_settings(), name)
+
+    def __repr__(self) -> str:
+        if _settings is None:
+            return "<McpSettings (not loaded)>"
+        return repr(_settings)
+
+
+def container_snapshot(section: BaseSettings) -> tuple[Any, ...]:
+    """
+    Contents of every list and dict field under section, as nested tuples.
+    These can change in place (``allowed_paths.append(...)``) without an
+    assignment, so caches keyed on config_generation() compare this too.
+    """
+    items: list[Any] = []
+    for name in type(section).model_fields:
+        value = getattr(section, name)
+        if isinstance(value, BaseSettings):
+            items.append(container_snapshot(value))
+        elif isinstance(value, list):
+            items.append(tuple(value))
+        elif isinstance(value, dict):
+            items.append(tuple(value.items()))
+    return tuple(items)
+
+
+_hash_cache: tuple[McpSettings, int, tuple[Any, ...], str] | None = None
+
+
+def config_hash(config: McpSettings) -> str:
+    """
+    Return a stable SHA-256 fingerprint of the effective configuration.
+    The canonical JSON form is hashed once and reused until a settings
+    field is assigned, a list or dict field changes in place, or a
+    different settings instance is passed.
+    """
+    global _hash_cache
+    if isinstance(config, _LazySettings):
+        config = get_settings()
+    generation = _generation
+    snapshot = container_snapshot(config)
+    cached = _hash_cache
+    if cached is not None and cached[0] is config and cached[1] == generation and cached[2] == snapshot:
+        return cached[3]
+
+    canonical = json.dumps(
+        config.model_dump(mode="json"), sort_keys=True, separators=(",", ":")
+    )
+    digest = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    _hash_cache = (config, generation, snapshot, digest)
+    return digest
+
+# Global settings instance loaded lazily from defaults, config files, and environment variables
+settings = cast(McpSettings, _LazySettings())
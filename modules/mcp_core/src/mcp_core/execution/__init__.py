@@ -1,3 +1,4 @@
+from .batch import BatchRunner
 from .tool_executor import ToolExecutor, executor
 
-__all__ = ["ToolExecutor", "executor"]
+__all__ = ["BatchRunner", "ToolExecutor", "executor"]
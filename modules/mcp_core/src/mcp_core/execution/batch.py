@@ -0,0 +1,213 @@
+import itertools
+import json
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, NamedTuple
+
+from mcp_protocol import ToolError, ToolErrorDetail, ToolResult
+from pydantic import BaseModel, ValidationError
+
+from ..config.settings import settings
+from ..observability import get_logger, set_context
+from ..registry import ToolRegistry, registry
+from .tool_executor import ToolExecutor, executor
+
+logger = get_logger(__name__)
+
+BATCH_TOOL_NAME = "mcp.batch"
+
+
+class BatchRequest(NamedTuple):
+    # Position of the request in the input stream
+    seq: int
+    tool: str
+    input: BaseModel
+    request_id: str | None
+    # Concurrency group (the tool's target unless declared otherwise)
+    group: str | None
+
+
+class TargetSlots:
+    """
+    Tracks in-flight requests per target (concurrency group) against limits.
+    Each request holds a numbered slot of its target's limit, so targets that
+    keep one session per slot (Blender) can route it to that slot's session.
+    Only used from the scheduling thread, so it needs no locking.
+    """
+
+    def __init__(self, limits: dict[str, int]):
+        self.limits = limits
+        self.active: dict[str, set[int]] = {}
+
+    def free_slot(self, target: str | None, preferred: int | None = None) -> int | None:
+        """The lowest free slot of target (or preferred, if it is free), None when all are taken."""
+        if target is None:
+            return 0
+        active = self.active.get(target, set())
+        if preferred is not None:
+            return None if preferred in active else preferred
+        limit = self.limits.get(target)
+        candidates = itertools.count() if limit is None else range(max(1, limit))
+        return next((slot for slot in candidates if slot not in active), None)
+
+    def available(self, target: str | None, preferred: int | None = None) -> bool:
+        return self.free_slot(target, preferred) is not None
+
+    def acquire(self, target: str | None, preferred: int | None = None) -> int:
+        slot = self.free_slot(target, preferred)
+        if slot is None:
+            raise RuntimeError(f"No free concurrency slot for '{target}'")
+        if target is not None:
+            self.active.setdefault(target, set()).add(slot)
+        return slot
+
+    def release(self, target: str | None, slot: int) -> None:
+        if target is not None:
+            self.active[target].discard(slot)
+
+
+def run_in_slot(slot: int, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call fn on a worker thread with the request's target slot in its context."""
+    token = set_context(target_slot=slot)
+    try:
+        return fn(*args, **kwargs)
+    finally:
+        token.reset()
+
+
+class BatchRunner:
+    """
+    Runs a stream of ``{"tool": ..., "input": {...}}`` requests through the
+    executor with bounded parallelism.
+
+    At most ``max_workers`` requests run at once, and at most
+    ``target_concurrency[target]`` of them may drive the same target
+    application. Requests are read lazily, so arbitrarily long input streams
+    are processed with a bounded amount of read-ahead. Results are yielded in
+    completion order, or in input order when ``ordered`` is set.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        target_concurrency: dict[str, int] | None = None,
+        tool_executor: ToolExecutor | None = None,
+        tool_registry: ToolRegistry | None = None,
+    ):
+        self.max_workers = max(1, max_workers or settings.batch.max_workers)
+        self.target_concurrency = (
+            target_concurrency if target_concurrency is not None else settings.batch.target_concurrency
+        )
+        self.executor = tool_executor or executor
+        self.registry = tool_registry or registry
+
+    def parse(self, index: int, line: str) -> BatchRequest | ToolError:
+        """Parse and validate one request line against the tool's input model."""
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            return self._error(BATCH_TOOL_NAME, None, "VALIDATION_ERROR", f"Request {index + 1}: invalid JSON: {e}")
+
+        if not isinstance(data, dict) or not isinstance(data.get("tool"), str):
+            return self._error(
+                BATCH_TOOL_NAME, None, "VALIDATION_ERROR",
+                f"Request {index + 1}: expected an object with a 'tool' name",
+            )
+
+        tool_name: str = data["tool"]
+        request_id = data.get("request_id")
+        entry = self.registry.get_tool(tool_name)
+        if entry is None:
+            return self._error(tool_name, request_id, "VALIDATION_ERROR", f"Tool '{tool_name}' not found.")
+
+        try:
+            input_model = self.registry.validate_input(tool_name, data.get("input") or {})
+        except ValidationError as e:
+            return self._error(tool_name, request_id, "VALIDATION_ERROR", f"Input validation failed: {e}")
+
+        return BatchRequest(index, tool_name, input_model, request_id, entry.metadata.group)
+
+    def run(self, lines: Iterable[str], ordered: bool = False) -> Iterator[ToolResult | ToolError]:
+        """Execute requests from lines, yielding each result as it becomes available."""
+        trace_id = str(uuid.uuid4())
+        # Bound read-ahead so long streams are not buffered in memory
+        max_pending = self.max_workers * 4
+
+        source = enumerate(line for line in lines if line.strip())
+        exhausted = False
+        pending: deque[BatchRequest] = deque()
+        running: dict[Future, tuple[BatchRequest, int]] = {}
+        slots = TargetSlots(self.target_concurrency)
+        # Results waiting for earlier lines when ordered output is requested
+        finished: dict[int, ToolResult | ToolError] = {}
+        next_index = 0
+
+        def emit(index: int, result: ToolResult | ToolError) -> Iterator[ToolResult | ToolError]:
+            nonlocal next_index
+            if not ordered:
+                yield result
+                return
+            finished[index] = result
+            while next_index in finished:
+                yield finished.pop(next_index)
+                next_index += 1
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-batch") as pool:
+            while True:
+                while not exhausted and len(pending) < max_pending:
+                    item = next(source, None)
+                    if item is None:
+                        exhausted = True
+                        break
+                    index, line = item
+                    parsed = self.parse(index, line)
+                    if isinstance(parsed, ToolError):
+                        yield from emit(index, parsed)
+                    else:
+                        pending.append(parsed)
+
+                # Start requests in input order, skipping those whose target is saturated
+                for request in list(pending):
+                    if len(running) >= self.max_workers:
+                        break
+                    if not slots.available(request.group):
+                        continue
+                    pending.remove(request)
+                    slot = slots.acquire(request.group)
+                    future = pool.submit(
+                        run_in_slot,
+                        slot,
+                        self.executor.execute,
+                        request.tool,
+                        request.input,
+                        request_id=request.request_id,
+                        parent_trace_id=trace_id,
+                    )
+                    running[future] = (request, slot)
+
+                if not running:
+                    if exhausted and not pending:
+                        break
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    request, slot = running.pop(future)
+                    slots.release(request.group, slot)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        logger.exception("Batch request failed")
+                        result = self._error(request.tool, request.request_id, "INTERNAL_ERROR", str(e))
+                    yield from emit(request.seq, result)
+
+    @staticmethod
+    def _error(tool: str, request_id: Any, code: str, message: str) -> ToolError:
+        return ToolError(
+            tool=tool,
+            request_id=request_id if isinstance(request_id, str) else str(uuid.uuid4()),
+            run_id=str(uuid.uuid4()),
+            error=ToolErrorDetail(code=code, message=message),
+        )
@@ -1,3 +1,4 @@
+import os
 import time
 import uuid
 from datetime import UTC, datetime
@@ -12,11 +13,11 @@ from mcp_protocol import (
 )
 from pydantic import BaseModel
 
-from ..config.settings import settings
+from ..config.settings import config_hash, settings
 from ..observability import get_logger, set_context
 from ..policy import policy_engine
 from ..registry import registry
-from ..storage import artifact_manager
+from ..storage import artifact_manager, build_cache, result_cache, retention
 
 logger = get_logger(__name__)
 
@@ -58,7 +59,7 @@ class ToolExecutor:
             end_time="",  # placeholder
             duration_seconds=0.0,
             inputs={},  # populated later
-            config_hash=None,  # TODO: implement config hashing
+            config_hash=config_hash(settings),
             tool_version=settings.protocol_version,
         )
 
@@ -70,7 +71,7 @@ class ToolExecutor:
             # 3. Input Validation
             if isinstance(input_data, dict):
                 try:
-                    input_model = tool_entry.input_model.model_validate(input_data)
+                    input_model = registry.validate_input(tool_name, input_data)
                 except Exception as e:
                     error_result = self._create_error(
                         tool_name,
@@ -96,29 +97,50 @@ class ToolExecutor:
                     return error_result
                 input_model = input_data
 
+            # Warm workers (the daemon, a Blender subprocess) may run in another cwd
+            input_model = tool_entry.metadata.with_absolute_paths(input_model)
+
             # Update manifest inputs
             manifest.inputs = input_model.model_dump(mode="json")
 
             # 4. Policy Check
             policy_engine.check_tool_allowed(tool_name)
 
-            # Check if operation is destructive (not dry_run and mutates state)
-            is_dry_run = getattr(input_model, "dry_run", True)
-            is_destructive = not is_dry_run and tool_name not in [
-                "mcp.list_commands", "mcp.help", "mcp.config_get",
-                "mcp.profile_performance", "mcp.debug_blueprint"
-            ]
+            # Destructive calls mutate the target application (see ToolMetadata)
+            metadata = tool_entry.metadata
+            is_destructive = metadata.is_destructive(input_model)
             policy_engine.check_destructive_allowed(tool_name, is_destructive)
 
-            # Check path allowlist for file operations
-            filepath = getattr(input_model, "filepath", None)
-            if filepath:
-                policy_engine.check_path_allowed(filepath)
-
-            # 5. Execution
+            # Check path allowlist for the tool's declared path fields
+            for path in metadata.paths(input_model):
+                policy_engine.check_path_allowed(path)
+
+            # 5. Result cache lookup (deterministic, non-destructive calls only)
+            cache_key: str | None = None
+            if settings.cache.enabled and metadata.deterministic and not is_destructive:
+                # Input files are keyed by content, so a file rewritten at the same path misses
+                file_hashes = self._file_hashes(metadata.paths(input_model))
+                if file_hashes is not None:
+                    cache_key = result_cache.make_key(
+                        tool_name, manifest.inputs, manifest.config_hash, manifest.tool_version, file_hashes
+                    )
+            if cache_key is not None:
+                cached = result_cache.get(cache_key)
+                if cached is not None:
+                    logger.info("Result cache hit")
+                    cached.run_id = run_id
+                    cached.request_id = req_id
+                    manifest.end_time = datetime.now(UTC).isoformat()
+                    manifest.duration_seconds = time.time() - start_ts
+                    manifest.status = "success"
+                    manifest.outputs = cached.result
+                    manifest.artifacts = cached.artifacts
+                    return cached
+
+            # 6. Execution
             result_or_error = cast(ToolResult | ToolError, tool_entry.handler(input_model))
 
-            # 6. Result Handling
+            # 7. Result Handling
             end_time = datetime.now(UTC)
             duration = time.time() - start_ts
 
@@ -143,7 +165,7 @@ class ToolExecutor:
             result_or_error.run_id = run_id
             result_or_error.request_id = req_id
 
-            # 7. Artifact Persistence
+            # 8. Artifact Persistence
             stored_artifacts: list[Artifact] = []
             for art in result_or_error.artifacts:
                 stored = artifact_manager.store_artifact(run_id, art)
@@ -152,6 +174,12 @@ class ToolExecutor:
             result_or_error.artifacts = stored_artifacts
             manifest.artifacts = stored_artifacts
 
+            if cache_key is not None:
+                try:
+                    result_cache.put(cache_key, result_or_error)
+                except Exception as e:
+                    logger.warning(f"Failed to store result in cache: {e}")
+
             logger.info("Tool execution successful")
             return result_or_error
 
@@ -172,14 +200,32 @@ class ToolExecutor:
             return error_result
 
         finally:
-            # 8. Write Manifest
+            # 9. Write Manifest (queued to a background writer by default)
             try:
-                artifact_manager.write_run_manifest(manifest)
+                skip = (
+                    settings.artifacts.skip_read_only_manifests
+                    and tool_entry is not None and tool_entry.read_only and tool_entry.target is None
+                )
+                if not skip:
+                    artifact_manager.write_run_manifest(manifest)
             except Exception as e:
                 logger.error(f"Failed to write run manifest: {e}")
 
+            # Incremental artifact GC runs in a background thread, if enabled
+            try:
+                retention.schedule()
+            except Exception as e:
+                logger.warning(f"Failed to schedule artifact GC: {e}")
+
             ctx_token.reset()
 
+    @staticmethod
+    def _file_hashes(paths: list[str]) -> dict[str, str | None] | None:
+        """Content hashes of the given input files, or None if one is a directory (not cacheable)."""
+        if any(os.path.isdir(path) for path in paths):
+            return None
+        return {path: build_cache.file_hash(path) for path in paths}
+
     def _create_error(
         self, tool: str, req_id: str, run_id: str, code: str, msg: str
     ) -> ToolError:
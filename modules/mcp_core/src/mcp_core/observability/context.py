@@ -1,5 +1,5 @@
-from contextvars import ContextVar
-from typing import NamedTuple
+from contextvars import ContextVar, Token
+from typing import Any, NamedTuple
 
 
 class ExecutionContext(NamedTuple):
@@ -7,12 +7,15 @@ class ExecutionContext(NamedTuple):
     run_id: str | None
     trace_id: str | None
     tool_name: str | None
+    # Slot of its target's concurrency limit the request holds (see TargetSlots)
+    target_slot: int = 0
 
 # Context variables with default None
 _request_id_ctx: ContextVar[str | None] = ContextVar("request_id", default=None)
 _run_id_ctx: ContextVar[str | None] = ContextVar("run_id", default=None)
 _trace_id_ctx: ContextVar[str | None] = ContextVar("trace_id", default=None)
 _tool_name_ctx: ContextVar[str | None] = ContextVar("tool_name", default=None)
+_target_slot_ctx: ContextVar[int] = ContextVar("target_slot", default=0)
 
 def get_current_context() -> ExecutionContext:
     return ExecutionContext(
@@ -20,6 +23,7 @@ def get_current_context() -> ExecutionContext:
         run_id=_run_id_ctx.get(),
         trace_id=_trace_id_ctx.get(),
         tool_name=_tool_name_ctx.get(),
+        target_slot=_target_slot_ctx.get(),
     )
 
 class ContextToken:
@@ -35,8 +39,9 @@ def set_context(
     run_id: str | None = None,
     trace_id: str | None = None,
     tool_name: str | None = None,
+    target_slot: int | None = None,
 ) -> ContextToken:
-    tokens = {}
+    tokens: dict[ContextVar[Any], Token[Any]] = {}
     if request_id is not None:
         tokens[_request_id_ctx] = _request_id_ctx.set(request_id)
     if run_id is not None:
@@ -45,5 +50,7 @@ def set_context(
         tokens[_trace_id_ctx] = _trace_id_ctx.set(trace_id)
     if tool_name is not None:
         tokens[_tool_name_ctx] = _tool_name_ctx.set(tool_name)
+    if target_slot is not None:
+        tokens[_target_slot_ctx] = _target_slot_ctx.set(target_slot)
 
     return ContextToken(tokens)
@@ -1 +1,3 @@
-__all__ = []
+from .pipeline import Pipeline, PipelineNode, PipelineRunner, resolve_references
+
+__all__ = ["Pipeline", "PipelineNode", "PipelineRunner", "resolve_references"]
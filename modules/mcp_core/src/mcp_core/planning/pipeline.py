@@ -0,0 +1,290 @@
+import json
+import re
+import uuid
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from mcp_protocol import ToolError, ToolErrorDetail, ToolResult
+
+from ..config.settings import settings
+from ..execution import ToolExecutor, executor
+from ..execution.batch import TargetSlots, run_in_slot
+from ..observability import get_logger
+from ..registry import ToolRegistry, registry
+
+logger = get_logger(__name__)
+
+# ${node.result.key.subkey}, ${node.artifacts}, ${node.artifacts.0} or ${node.artifacts.<metadata type>}
+REFERENCE_PATTERN = re.compile(r"\$\{([A-Za-z0-9_-]+)\.(result|artifacts)((?:\.[A-Za-z0-9_-]+)*)\}")
+
+
+class PipelineNode(NamedTuple):
+    name: str
+    tool: str
+    input: dict[str, Any]
+    needs: tuple[str, ...]
+
+
+def _references(value: Any) -> set[str]:
+    """Return the names of nodes referenced anywhere in value."""
+    if isinstance(value, str):
+        return {m.group(1) for m in REFERENCE_PATTERN.finditer(value)}
+    if isinstance(value, Mapping):
+        return set().union(*(_references(v) for v in value.values())) if value else set()
+    if isinstance(value, list):
+        return set().union(*(_references(v) for v in value)) if value else set()
+    return set()
+
+
+class Pipeline:
+    """
+    A DAG of tool invocations.
+
+    Spec format (JSON, or YAML when PyYAML is installed)::
+
+        {
+          "name": "chair",
+          "nodes": {
+            "scene": {"tool": "mcp.generate_scene", "input": {"description": "..."}},
+            "export": {"tool": "mcp.export_asset", "input": {...}, "needs": ["scene"]},
+            "import": {"tool": "mcp.import_asset",
+                       "input": {"manifest_path": "${export.artifacts.export_manifest}"}}
+          }
+        }
+
+    A node depends on the nodes listed in ``needs`` and on every node its
+    input references.
+    """
+
+    def __init__(self, name: str, nodes: list[PipelineNode]):
+        self.name = name
+        self.nodes = {node.name: node for node in nodes}
+        self.order = self._topological_order()
+
+    @classmethod
+    def from_dict(cls, spec: Mapping[str, Any]) -> "Pipeline":
+        raw_nodes = spec.get("nodes")
+        if not isinstance(raw_nodes, Mapping) or not raw_nodes:
+            raise ValueError("Pipeline spec must define a non-empty 'nodes' mapping.")
+
+        nodes = []
+        for name, raw in raw_nodes.items():
+            if not isinstance(raw, Mapping) or not isinstance(raw.get("tool"), str):
+                raise ValueError(f"Pipeline node '{name}' must define a 'tool'.")
+            node_input = raw.get("input") or {}
+            if not isinstance(node_input, Mapping):
+                raise ValueError(f"Pipeline node '{name}' input must be a mapping.")
+            needs = set(raw.get("needs") or []) | _references(node_input)
+            nodes.append(PipelineNode(str(name), raw["tool"], dict(node_input), tuple(sorted(needs))))
+
+        return cls(str(spec.get("name") or "pipeline"), nodes)
+
+    @classmethod
+    def load(cls, path: Path) -> "Pipeline":
+        text = path.read_text(encoding="utf-8")
+        if path.suffix in (".yaml", ".yml"):
+            try:
+                import yaml
+            except ImportError:
+                raise ValueError("YAML pipeline specs require PyYAML; install it or use JSON.")
+            spec = yaml.safe_load(text)
+        else:
+            spec = json.loads(text)
+        if not isinstance(spec, Mapping):
+            raise ValueError("Pipeline spec must be a mapping.")
+        return cls.from_dict(spec)
+
+    def _topological_order(self) -> list[str]:
+        for node in self.nodes.values():
+            for dep in node.needs:
+                if dep not in self.nodes:
+                    raise ValueError(f"Pipeline node '{node.name}' depends on unknown node '{dep}'.")
+
+        order: list[str] = []
+        state: dict[str, int] = {}  # 1 = visiting, 2 = done
+
+        def visit(name: str, path: list[str]) -> None:
+            if state.get(name) == 2:
+                return
+            if state.get(name) == 1:
+                cycle = path[path.index(name):] + [name]
+                raise ValueError(f"Pipeline has a dependency cycle: {' -> '.join(cycle)}")
+            state[name] = 1
+            for dep in self.nodes[name].needs:
+                visit(dep, path + [name])
+            state[name] = 2
+            order.append(name)
+
+        for name in self.nodes:
+            visit(name, [])
+        return order
+
+
+def _lookup(result: ToolResult, kind: str, path: list[str]) -> Any:
+    if kind == "result":
+        value: Any = result.result
+        for key in path:
+            if isinstance(value, Mapping) and key in value:
+                value = value[key]
+            elif isinstance(value, list) and key.isdigit() and int(key) < len(value):
+                value = value[int(key)]
+            else:
+                raise KeyError(f"'{'.'.join(path)}' not found in result of '{result.tool}'")
+        return value
+
+    uris = [art.uri.removeprefix("file://") if art.uri else None for art in result.artifacts]
+    if not path:
+        return uris
+    if len(path) > 1:
+        raise KeyError(f"Invalid artifact reference '{'.'.join(path)}'")
+    key = path[0]
+    if key.isdigit():
+        if int(key) < len(uris):
+            return uris[int(key)]
+    else:
+        for art, uri in zip(result.artifacts, uris, strict=True):
+            if (art.metadata or {}).get("type") == key:
+                return uri
+    raise KeyError(f"Artifact '{key}' not found in result of '{result.tool}'")
+
+
+def resolve_references(value: Any, results: Mapping[str, ToolResult]) -> Any:
+    """
+    Substitute ${node...} references in value with upstream results.
+    A string consisting of a single reference takes the referenced value's type.
+    """
+    if isinstance(value, str):
+        match = REFERENCE_PATTERN.fullmatch(value)
+        if match:
+            name, kind, path = match.groups()
+            return _lookup(results[name], kind, path.split(".")[1:])
+        return REFERENCE_PATTERN.sub(
+            lambda m: str(_lookup(results[m.group(1)], m.group(2), m.group(3).split(".")[1:])),
+            value,
+        )
+    if isinstance(value, Mapping):
+        return {k: resolve_references(v, results) for k, v in value.items()}
+    if isinstance(value, list):
+        return [resolve_references(v, results) for v in value]
+    return value
+
+
+class PipelineRunner:
+    """
+    Executes a Pipeline, running every node whose dependencies have succeeded
+    as soon as a worker and its target's concurrency slot are free. Each node
+    runs through the executor, so it records its own run manifest; all nodes
+    of a run share one trace id. Nodes downstream of a failure are skipped.
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        target_concurrency: dict[str, int] | None = None,
+        tool_executor: ToolExecutor | None = None,
+        tool_registry: ToolRegistry | None = None,
+    ):
+        self.max_workers = max(1, max_workers or settings.batch.max_workers)
+        self.target_concurrency = (
+            target_concurrency if target_concurrency is not None else settings.batch.target_concurrency
+        )
+        self.executor = tool_executor or executor
+        self.registry = tool_registry or registry
+
+    def run(self, pipeline: Pipeline, dry_run: bool = False) -> dict[str, ToolResult | ToolError]:
+        """Run all nodes and return their results keyed by node name, in topological order."""
+        trace_id = str(uuid.uuid4())
+        entries = {}
+        for node in pipeline.nodes.values():
+            entry = self.registry.get_tool(node.tool)
+            if entry is None:
+                raise ValueError(f"Pipeline node '{node.name}' uses unknown tool '{node.tool}'.")
+            entries[node.name] = entry
+
+        results: dict[str, ToolResult | ToolError] = {}
+        waiting = list(pipeline.order)
+        running: dict[Future, tuple[str, int]] = {}
+        slots = TargetSlots(self.target_concurrency)
+        # Slot held per group by each node or its upstream nodes; a node reuses
+        # its upstream's slot so it runs in the same target session (scene state)
+        node_slots: dict[str, dict[str, int]] = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="mcp-pipeline") as pool:
+            while waiting or running:
+                for name in list(waiting):
+                    node = pipeline.nodes[name]
+                    failed = [dep for dep in node.needs if isinstance(results.get(dep), ToolError)]
+                    if failed:
+                        waiting.remove(name)
+                        results[name] = self._skipped(pipeline, node, failed[0])
+                        continue
+                    if not all(dep in results for dep in node.needs):
+                        continue
+                    if len(running) >= self.max_workers:
+                        break
+                    entry = entries[name]
+                    group = entry.metadata.group
+                    inherited: dict[str, int] = {}
+                    for dep in node.needs:
+                        inherited.update(node_slots.get(dep, {}))
+                    preferred = inherited.get(group) if group is not None else None
+                    if not slots.available(group, preferred):
+                        continue
+
+                    waiting.remove(name)
+                    # Failed dependencies were skipped above, so every upstream result succeeded
+                    upstream = {
+                        dep: result for dep in node.needs if isinstance(result := results[dep], ToolResult)
+                    }
+                    try:
+                        node_input = resolve_references(node.input, upstream)
+                    except KeyError as e:
+                        results[name] = self._error(pipeline, node, "VALIDATION_ERROR", str(e.args[0]))
+                        continue
+                    if dry_run and "dry_run" in entry.input_model.model_fields:
+                        node_input["dry_run"] = True
+
+                    slot = slots.acquire(group, preferred)
+                    node_slots[name] = inherited if group is None else {**inherited, group: slot}
+                    future = pool.submit(
+                        run_in_slot,
+                        slot,
+                        self.executor.execute,
+                        node.tool,
+                        node_input,
+                        request_id=f"{pipeline.name}:{name}",
+                        parent_trace_id=trace_id,
+                    )
+                    running[future] = (name, slot)
+
+                if not running:
+                    continue
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name, slot = running.pop(future)
+                    node = pipeline.nodes[name]
+                    slots.release(entries[name].metadata.group, slot)
+                    try:
+                        results[name] = future.result()
+                    except Exception as e:
+                        logger.exception(f"Pipeline node '{name}' failed")
+                        results[name] = self._error(pipeline, node, "INTERNAL_ERROR", str(e))
+
+        return {name: results[name] for name in pipeline.order}
+
+    def _skipped(self, pipeline: Pipeline, node: PipelineNode, failed: str) -> ToolError:
+        return self._error(
+            pipeline, node, "EXECUTION_ERROR", f"Skipped: upstream node '{failed}' did not succeed."
+        )
+
+    @staticmethod
+    def _error(pipeline: Pipeline, node: PipelineNode, code: str, message: str) -> ToolError:
+        return ToolError(
+            tool=node.tool,
+            request_id=f"{pipeline.name}:{node.name}",
+            run_id=str(uuid.uuid4()),
+            error=ToolErrorDetail(code=code, message=message),
+        )
@@ -1,9 +1,23 @@
+import os
 from pathlib import Path
+from typing import Any
 
-from ..config.settings import settings
+from ..config.settings import config_generation, settings
+
+# Marks a trie node whose path is an allowed root (path parts are never empty)
+_ALLOWED = ""
+
+
+def _parts(path: Path) -> list[str]:
+    # normcase keeps Windows comparisons case-insensitive, like relative_to
+    return [os.path.normcase(part) for part in path.parts]
 
 
 class PolicyEngine:
+    def __init__(self) -> None:
+        # (policy config, settings generation, allowed_paths, allowed-roots trie or None)
+        self._roots: tuple[Any, int, tuple[str, ...], dict[str, Any] | None] | None = None
+
     def check_tool_allowed(self, tool_name: str) -> None:
         """
         Check if a tool is allowed to run.
@@ -22,32 +36,58 @@ class PolicyEngine:
                 f"Tool '{tool_name}' is destructive and allow_destructive is False."
             )
 
+    def _allowed_roots(self) -> dict[str, Any] | None:
+        """
+        Trie of the resolved allowed_paths, keyed by path component. Roots
+        are resolved once and rebuilt only when configuration changes,
+        including in-place edits of the allowed_paths list.
+        """
+        policy = settings.policy
+        generation = config_generation()
+        allowed_paths = tuple(policy.allowed_paths)
+        cached = self._roots
+        if cached is not None and cached[0] is policy and cached[1] == generation and cached[2] == allowed_paths:
+            return cached[3]
+
+        trie: dict[str, Any] | None = None
+        if allowed_paths:
+            trie = {}
+            for allowed in allowed_paths:
+                node = trie
+                for part in _parts(Path(allowed).expanduser().resolve()):
+                    node = node.setdefault(part, {})
+                node[_ALLOWED] = True
+        self._roots = (policy, generation, allowed_paths, trie)
+        return trie
+
     def check_path_allowed(self, path: str | Path) -> None:
         """
         Check if a file path is allowed to be accessed.
         If allowed_paths is set, the path must be within one of them.
+
+        The path is resolved on every check, since symlinks along it may
+        change between checks; only the allowed roots are cached.
         """
-        allowed_paths = settings.policy.allowed_paths
-        if not allowed_paths:
+        trie = self._allowed_roots()
+        if trie is None:
             return
 
-        # Resolve path to be absolute
-        target_path = Path(path).expanduser().resolve()
-
+        # Walk the resolved path down the trie: O(depth) whatever the number of roots
+        node = trie
         is_allowed = False
-        for allowed in allowed_paths:
-            allowed_path = Path(allowed).expanduser().resolve()
-            # Check if target_path is relative to allowed_path
-            try:
-                target_path.relative_to(allowed_path)
+        for part in _parts(Path(path).expanduser().resolve()):
+            child: dict[str, Any] | None = node.get(part)
+            if child is None:
+                break
+            node = child
+            if _ALLOWED in node:
                 is_allowed = True
                 break
-            except ValueError:
-                continue
 
         if not is_allowed:
             raise PermissionError(
                 f"Path '{path}' is not in the allowed_paths list."
             )
 
+
 policy_engine = PolicyEngine()
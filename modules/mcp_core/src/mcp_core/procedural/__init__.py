@@ -0,0 +1,3 @@
+from .noise import fbm, perlin, perlin_grid
+
+__all__ = ["fbm", "perlin", "perlin_grid"]
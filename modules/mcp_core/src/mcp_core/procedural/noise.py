@@ -0,0 +1,186 @@
+"""
+Seeded, vectorised gradient noise.
+
+Noise is a pure function of global coordinates and seed, so any rectangle of
+a field can be evaluated independently and neighbouring rectangles agree at
+their shared borders. Regular grids are evaluated separably: per-column and
+per-row terms are computed once in 1D and only combined in 2D, which keeps
+the cost to a handful of full-size array passes per octave.
+
+With a ``period`` the lattice wraps every ``period`` cells, which makes the
+noise tile seamlessly (used for textures).
+"""
+import numpy as np
+
+# Unit gradients at 8 evenly spaced angles, selected by lattice hash
+_ANGLES = np.arange(8) * (np.pi / 4)
+_GRAD_X = np.cos(_ANGLES).astype(np.float32)
+_GRAD_Y = np.sin(_ANGLES).astype(np.float32)
+
+# Offset between the coordinates of the two warp fields
+_WARP_OFFSET = 5.2
+
+
+def _hash(ix: np.ndarray, iy: np.ndarray, seed: int) -> np.ndarray:
+    """Hash integer lattice coordinates to uint32 (broadcasting)."""
+    with np.errstate(over="ignore"):
+        h = (ix.astype(np.uint32) * np.uint32(0x8DA6B343)) ^ (iy.astype(np.uint32) * np.uint32(0xD8163841))
+        h ^= np.uint32(seed * 0x9E3779B1 & 0xFFFFFFFF)
+        h ^= h >> np.uint32(15)
+        h *= np.uint32(0x2C1B3C6D)
+        h ^= h >> np.uint32(12)
+        h *= np.uint32(0x297A2D39)
+        h ^= h >> np.uint32(15)
+    return h
+
+
+def _fade(t: np.ndarray) -> np.ndarray:
+    faded: np.ndarray = t * t * t * (t * (t * 6 - 15) + 10)
+    return faded
+
+
+def _lattice(lx: np.ndarray, ly: np.ndarray, period: int | None) -> tuple[np.ndarray, np.ndarray]:
+    if period:
+        return lx % period, ly % period
+    return lx, ly
+
+
+def perlin(x: np.ndarray, y: np.ndarray, seed: int = 0, period: int | None = None) -> np.ndarray:
+    """Evaluate 2D gradient noise at arbitrary (broadcastable) coordinates."""
+    x, y = np.broadcast_arrays(np.asarray(x, dtype=np.float64), np.asarray(y, dtype=np.float64))
+    x0 = np.floor(x)
+    y0 = np.floor(y)
+    fx = (x - x0).astype(np.float32)
+    fy = (y - y0).astype(np.float32)
+    ix = x0.astype(np.int64)
+    iy = y0.astype(np.int64)
+    u = _fade(fx)
+    v = _fade(fy)
+
+    # Hash the lattice bounding box once and gather from it, which is much
+    # cheaper than hashing four corners per sample
+    min_x, min_y = ix.min(), iy.min()
+    lx = np.arange(min_x, ix.max() + 2)
+    ly = np.arange(min_y, iy.max() + 2)
+    hx, hy = _lattice(lx, ly, period)
+    g = (_hash(hx[None, :], hy[:, None], seed) & np.uint32(7)).astype(np.uint8).ravel()
+    idx = (iy - min_y) * len(lx) + (ix - min_x)
+
+    def corner(offset: int, dx: int, dy: int) -> np.ndarray:
+        c = g[idx + offset]
+        dot: np.ndarray = _GRAD_X[c] * (fx - dx) + _GRAD_Y[c] * (fy - dy)
+        return dot
+
+    n00 = corner(0, 0, 0)
+    n10 = corner(1, 1, 0)
+    n01 = corner(len(lx), 0, 1)
+    n11 = corner(len(lx) + 1, 1, 1)
+    top = n00 + u * (n10 - n00)
+    bottom = n01 + u * (n11 - n01)
+    noise: np.ndarray = top + v * (bottom - top)
+    return noise
+
+
+def _axis(coords: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """Split 1D coordinates into lattice cells, offsets and fade weights."""
+    c0 = np.floor(coords)
+    f = (coords - c0).astype(np.float32)
+    i = c0.astype(np.int64)
+    return i, f, _fade(f), i - i[0]
+
+
+def perlin_grid(xs: np.ndarray, ys: np.ndarray, seed: int = 0, period: int | None = None) -> np.ndarray:
+    """
+    Evaluate gradient noise on the grid of xs (columns) by ys (rows).
+    Equivalent to perlin(xs[None, :], ys[:, None], seed), but separable.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    ix, fx, u, cx = _axis(xs)
+    iy, fy, v, cy = _axis(ys)
+
+    # Gradients for every lattice point the grid touches
+    lx = np.arange(ix[0], ix[-1] + 2)
+    ly = np.arange(iy[0], iy[-1] + 2)
+    hx, hy = _lattice(lx, ly, period)
+    g = _hash(hx[None, :], hy[:, None], seed) & np.uint32(7)
+    gx = _GRAD_X[g]
+    gy = _GRAD_Y[g]
+
+    # Blend the two corners along x for every lattice row (lattice rows x columns):
+    # bx holds the gx * dx terms, by the gy weights to be scaled by dy later
+    gx0, gx1 = gx[:, cx], gx[:, cx + 1]
+    gy0, gy1 = gy[:, cx], gy[:, cx + 1]
+    bx = gx0 * fx + u * (gx1 * (fx - 1) - gx0 * fx)
+    by = gy0 + u * (gy1 - gy0)
+
+    fy = fy[:, None]
+    top = bx[cy] + by[cy] * fy
+    bottom = bx[cy + 1] + by[cy + 1] * (fy - 1)
+    noise: np.ndarray = top + v[:, None] * (bottom - top)
+    return noise
+
+
+def fbm(
+    xs: np.ndarray,
+    ys: np.ndarray,
+    seed: int = 0,
+    octaves: int = 6,
+    frequency: float = 1.0,
+    lacunarity: float = 2.0,
+    gain: float = 0.5,
+    ridged: bool = False,
+    warp: float = 0.0,
+    tile: bool = False,
+) -> np.ndarray:
+    """
+    Fractal noise over the grid of xs by ys, normalized to about [-1, 1].
+
+    ``ridged`` folds each octave into sharp crests, weighting finer octaves
+    by the coarser ones. ``warp`` displaces the coordinates by two low
+    frequency noise fields (domain warping) before sampling. ``tile`` makes
+    the field periodic over [0, 1) in x and y, which requires integer
+    ``frequency`` and ``lacunarity``.
+    """
+    xs = np.asarray(xs, dtype=np.float64)
+    ys = np.asarray(ys, dtype=np.float64)
+    if tile and (frequency != int(frequency) or lacunarity != int(lacunarity)):
+        raise ValueError("Tiling noise needs integer frequency and lacunarity")
+
+    def period(freq: float) -> int | None:
+        return int(freq) if tile else None
+
+    if warp:
+        # Integer offset keeps the second warp field periodic when tiling
+        offset = round(_WARP_OFFSET) if tile else _WARP_OFFSET
+        wx = warp * perlin_grid(xs * frequency, ys * frequency, seed + 101, period(frequency))
+        wy = warp * perlin_grid(xs * frequency + offset, ys * frequency + offset, seed + 202, period(frequency))
+        px = xs[None, :] + wx / frequency
+        py = ys[:, None] + wy / frequency
+
+        def sample(freq: float, octave_seed: int) -> np.ndarray:
+            return perlin(px * freq, py * freq, octave_seed, period(freq))
+    else:
+        def sample(freq: float, octave_seed: int) -> np.ndarray:
+            return perlin_grid(xs * freq, ys * freq, octave_seed, period(freq))
+
+    total = np.zeros((len(ys), len(xs)), dtype=np.float32)
+    weight = np.ones_like(total) if ridged else None
+    amplitude = 1.0
+    norm = 0.0
+    freq = frequency
+    for octave in range(octaves):
+        n = sample(freq, seed + octave)
+        # weight is only allocated for ridged noise
+        if weight is not None:
+            n = 1.0 - np.abs(n * 1.4142135)
+            n *= n
+            n *= weight
+            np.clip(n * 2.0, 0.0, 1.0, out=weight)
+            n = n * 2.0 - 1.0
+        total += amplitude * n
+        norm += amplitude
+        amplitude *= gain
+        freq *= lacunarity
+    total /= norm
+    return total
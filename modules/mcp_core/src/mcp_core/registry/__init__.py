@@ -1,3 +1,3 @@
-from .registry import ToolEntry, ToolRegistry, registry
+from .registry import COST_CLASSES, LazyHandler, ToolEntry, ToolMetadata, ToolRegistry, registry
 
-__all__ = ["ToolEntry", "ToolRegistry", "registry"]
+__all__ = ["COST_CLASSES", "LazyHandler", "ToolEntry", "ToolMetadata", "ToolRegistry", "registry"]
@@ -1,7 +1,115 @@
+import importlib
+import os
 from collections.abc import Callable
 from typing import Any, NamedTuple
 
-from pydantic import BaseModel
+from pydantic import BaseModel, TypeAdapter
+
+
+class LazyHandler:
+    """
+    Handler descriptor referencing an implementation as "package.module:function".
+    The module is imported on first call, so registering a tool does not pull
+    in its dependencies (AI providers, HTTP clients) until it is invoked.
+    """
+
+    def __init__(self, target: str):
+        module_name, _, attr = target.partition(":")
+        if not module_name or not attr:
+            raise ValueError(f"Invalid handler reference '{target}', expected 'module:function'.")
+        self.target = target
+        self.module_name = module_name
+        self.attr = attr
+        self._resolved: Callable[[Any], Any] | None = None
+
+    def resolve(self) -> Callable[[Any], Any]:
+        if self._resolved is None:
+            module = importlib.import_module(self.module_name)
+            self._resolved = getattr(module, self.attr)
+        return self._resolved
+
+    def __call__(self, input: Any) -> Any:
+        return self.resolve()(input)
+
+    def __repr__(self) -> str:
+        return f"LazyHandler({self.target!r})"
+
+
+# Relative cost of a call, cheapest first
+COST_CLASSES = ("cheap", "moderate", "expensive")
+
+
+class ToolMetadata(NamedTuple):
+    """
+    What the executor, schedulers, caches and policy engine need to know
+    about a tool, declared once at registration.
+
+    ``read_only`` tools never change state. ``deterministic`` tools return
+    the same result for the same inputs and configuration, so their results
+    may be cached. ``target`` names the external application the tool drives
+    (e.g. "blender"). ``cost`` is one of COST_CLASSES. ``path_fields`` name
+    the input fields holding filesystem paths (a path or a list of paths)
+    checked against the allowed paths. Calls in the same
+    ``concurrency_group`` (the target, unless set) share one concurrency
+    limit.
+    """
+
+    read_only: bool = False
+    deterministic: bool = False
+    target: str | None = None
+    cost: str = "moderate"
+    path_fields: tuple[str, ...] = ()
+    concurrency_group: str | None = None
+
+    @property
+    def group(self) -> str | None:
+        """Key of the concurrency limit calls to this tool count against."""
+        return self.concurrency_group or self.target
+
+    @property
+    def mutating(self) -> bool:
+        """Whether calls change the state of the tool's target application."""
+        return not self.read_only and self.target is not None
+
+    def is_destructive(self, input: BaseModel) -> bool:
+        """Whether this call mutates its target, i.e. the tool mutates and it is not a dry run."""
+        return self.mutating and not getattr(input, "dry_run", False)
+
+    def paths(self, input: BaseModel) -> list[str]:
+        """The filesystem paths this call's input refers to."""
+        paths: list[str] = []
+        for field in self.path_fields:
+            value = getattr(input, field, None)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                paths.extend(str(v) for v in value if v)
+            else:
+                paths.append(str(value))
+        return paths
+
+    def with_absolute_paths(self, input: BaseModel) -> BaseModel:
+        """
+        A copy of input with its path fields made absolute against the current
+        directory, so the paths stay valid in a process with another cwd.
+        """
+
+        def absolute(value: Any) -> Any:
+            return type(value)(os.path.abspath(os.path.expanduser(value))) if value else value
+
+        update: dict[str, Any] = {}
+        for field in self.path_fields:
+            value = getattr(input, field, None)
+            if not value:
+                continue
+            if isinstance(value, (list, tuple)):
+                update[field] = type(value)(absolute(v) for v in value)
+            else:
+                update[field] = absolute(value)
+        return input.model_copy(update=update) if update else input
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), "path_fields": list(self.path_fields)}
 
 
 class ToolEntry(NamedTuple):
@@ -9,37 +117,133 @@ class ToolEntry(NamedTuple):
     description: str
     input_model: type[BaseModel]
     handler: Callable[[Any], Any]
+    metadata: ToolMetadata = ToolMetadata()
+
+    @property
+    def deterministic(self) -> bool:
+        return self.metadata.deterministic
+
+    @property
+    def target(self) -> str | None:
+        return self.metadata.target
+
+    @property
+    def read_only(self) -> bool:
+        return self.metadata.read_only
+
 
 class ToolRegistry:
     def __init__(self) -> None:
         self._tools: dict[str, ToolEntry] = {}
+        # Derived per-tool state, kept until the tool set changes
+        self._validators: dict[str, TypeAdapter[Any]] = {}
+        self._schemas: dict[str, dict[str, Any]] = {}
+        # mcp.list_commands result payload, {"tools": catalog}
+        self._catalog: dict[str, list[dict[str, Any]]] | None = None
 
     def register(
         self,
         name: str,
         description: str,
         input_model: type[BaseModel],
-        handler: Callable[[Any], Any],
+        handler: Callable[[Any], Any] | str,
+        deterministic: bool = False,
+        target: str | None = None,
+        read_only: bool = False,
+        cost: str = "moderate",
+        path_fields: tuple[str, ...] = (),
+        concurrency_group: str | None = None,
     ) -> None:
+        """
+        Register a tool. The handler may be a callable or a lazy
+        "module:function" reference that is imported on first use.
+        The remaining arguments are the tool's ToolMetadata.
+        """
         if name in self._tools:
             raise ValueError(f"Tool '{name}' is already registered.")
+        if cost not in COST_CLASSES:
+            raise ValueError(f"Invalid cost class '{cost}' for tool '{name}', expected one of {COST_CLASSES}.")
+        unknown = [f for f in path_fields if f not in input_model.model_fields]
+        if unknown:
+            raise ValueError(f"Tool '{name}' declares unknown path fields: {', '.join(unknown)}")
+
+        if isinstance(handler, str):
+            handler = LazyHandler(handler)
 
         self._tools[name] = ToolEntry(
             name=name,
             description=description,
             input_model=input_model,
             handler=handler,
+            metadata=ToolMetadata(
+                read_only=read_only,
+                deterministic=deterministic,
+                target=target,
+                cost=cost,
+                path_fields=tuple(path_fields),
+                concurrency_group=concurrency_group,
+            ),
         )
+        self._validators[name] = TypeAdapter(input_model)
+        self._catalog = None
 
     def get_tool(self, name: str) -> ToolEntry | None:
         return self._tools.get(name)
 
+    def validate_input(self, name: str, data: Any) -> BaseModel:
+        """Validate raw input for a registered tool with its prebuilt validator."""
+        model: BaseModel = self._validators[name].validate_python(data)
+        return model
+
+    def input_schema(self, name: str) -> dict[str, Any] | None:
+        """
+        The tool's input JSON schema, generated on first request and then
+        reused. The returned dict is shared and must not be modified.
+        """
+        schema = self._schemas.get(name)
+        if schema is None:
+            tool = self._tools.get(name)
+            if tool is None:
+                return None
+            schema = self._schemas[name] = tool.input_model.model_json_schema()
+        return schema
+
+    def catalog(self) -> list[dict[str, Any]]:
+        """
+        Name, description, metadata and input schema of every tool, sorted
+        by name. Rebuilt only after register or clear; the returned list is
+        shared and must not be modified.
+        """
+        return self.list_commands_payload()["tools"]
+
+    def list_commands_payload(self) -> dict[str, list[dict[str, Any]]]:
+        """
+        The complete mcp.list_commands result, ``{"tools": catalog()}``,
+        built once per tool set. The returned dict is shared and must not
+        be modified.
+        """
+        payload = self._catalog
+        if payload is None:
+            payload = self._catalog = {"tools": [
+                {
+                    "name": t.name,
+                    "description": t.description,
+                    "metadata": t.metadata.as_dict(),
+                    "input_schema": self.input_schema(t.name),
+                }
+                for t in self.list_tools()
+            ]}
+        return payload
+
     def list_tools(self) -> list[ToolEntry]:
         return sorted(self._tools.values(), key=lambda t: t.name)
 
     def clear(self) -> None:
         """Clear all registered tools. Useful for testing."""
         self._tools.clear()
+        self._validators.clear()
+        self._schemas.clear()
+        self._catalog = None
 
 # Global registry instance
 registry = ToolRegistry()
@@ -1,3 +1,19 @@
 from .artifact_manager import ArtifactManager, artifact_manager
+from .build_cache import BuildCache, build_cache
+from .manifest_writer import ManifestWriter, manifest_writer
+from .result_cache import ResultCache, result_cache
+from .retention import RetentionEngine, RetentionPolicy, retention
 
-__all__ = ["ArtifactManager", "artifact_manager"]
+__all__ = [
+    "ArtifactManager",
+    "artifact_manager",
+    "BuildCache",
+    "build_cache",
+    "ManifestWriter",
+    "manifest_writer",
+    "ResultCache",
+    "result_cache",
+    "RetentionEngine",
+    "RetentionPolicy",
+    "retention",
+]
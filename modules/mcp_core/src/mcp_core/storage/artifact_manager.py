@@ -1,14 +1,54 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from collections.abc import Iterable
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from mcp_protocol import Artifact, RunManifest
 
 from ..config.settings import settings
+from .manifest_writer import manifest_writer
+
+if TYPE_CHECKING:
+    import httpx
+
+_CHUNK_SIZE = 1024 * 1024
+
+_http_client: "httpx.Client | None" = None
+_http_lock = threading.Lock()
+
+
+def http_client() -> "httpx.Client":
+    """Shared HTTP client, so downloads reuse pooled connections."""
+    global _http_client
+    with _http_lock:
+        if _http_client is None:
+            # Imported lazily: short CLI commands must not load HTTP clients
+            import httpx
+
+
+            _http_client = httpx.Client(timeout=60.0, follow_redirects=True)
+        return _http_client
+
+
+def _sanitize(filename: str) -> str:
+    return "".join(c for c in filename if c.isalnum() or c in "._-")
 
 
 class ArtifactManager:
     def __init__(self, root_path: Path | None = None):
-        self.root = root_path or settings.artifacts.root
-        self.write_manifests = settings.artifacts.write_manifests
+        self._root = root_path
+
+    @property
+    def root(self) -> Path:
+        return self._root or settings.artifacts.root
+
+    @property
+    def write_manifests(self) -> bool:
+        return settings.artifacts.write_manifests
 
     def ensure_run_dir(self, run_id: str) -> Path:
         """Ensure the directory for a specific run exists."""
@@ -20,11 +60,27 @@ class ArtifactManager:
         """
         Store an artifact's content to disk if it has content, and update its URI.
         Returns the updated artifact (with URI set if stored).
+
+        Text is written as UTF-8. Binary content and files handed over with
+        ``metadata["transfer"]`` ("move" or "link") go to the content-addressed
+        blob store without being copied through memory (see store_stream and
+        store_file). The artifact type is kept in ``metadata["media_type"]``.
         """
+        metadata = dict(artifact.metadata or {})
+        transfer = metadata.pop("transfer", None)
+        if transfer in ("move", "link") and artifact.uri:
+            source = Path(artifact.uri.removeprefix("file://"))
+            metadata["media_type"] = artifact.type
+            return self.store_file(
+                run_id, source, metadata.get("filename", source.name), artifact.type, metadata,
+                move=transfer == "move",
+            )
+
         if not artifact.content:
             return artifact
 
         run_dir = self.ensure_run_dir(run_id)
+        metadata["media_type"] = artifact.type
 
         # Determine filename. Use a sanitized name from metadata or default.
         filename = "artifact"
@@ -35,34 +91,174 @@ class ArtifactManager:
             filename = Path(artifact.uri).name
 
         # Simple sanitization
-        filename = "".join(c for c in filename if c.isalnum() or c in "._-")
+        filename = _sanitize(filename)
 
         # Avoid collisions? For now, simplistic overwrite or append timestamp could work.
         # Let's trust the tool provided a unique name or accept overwrite.
 
-        file_path = run_dir / filename
+        if isinstance(artifact.content, bytes):
+            view = memoryview(artifact.content)
+            chunks = (view[i:i + _CHUNK_SIZE] for i in range(0, len(view), _CHUNK_SIZE))
+            return self.store_stream(run_id, chunks, filename, artifact.type, metadata)
 
-        # Write content
-        # Assuming content is text for now as per Artifact model (str | None)
-        # If we handle binary, we might need to change model or encode as base64
+        file_path = run_dir / filename
         file_path.write_text(artifact.content, encoding="utf-8")
 
         # Update artifact to reference the file URI
-        return artifact.model_copy(update={"uri": str(file_path), "content": None})
+        return artifact.model_copy(update={"uri": str(file_path), "content": None, "metadata": metadata})
+
+    @property
+    def blob_root(self) -> Path:
+        """Content-addressed store shared by all runs (``blobs/<sha[:2]>/<sha>``)."""
+        return self.root / "blobs"
+
+    def store_stream(
+        self,
+        run_id: str,
+        chunks: Iterable[bytes | memoryview],
+        filename: str,
+        artifact_type: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> Artifact:
+        """
+        Write chunks to a temporary file while hashing them, commit the file
+        into the blob store (keeping the existing blob if the content is
+        already stored) and link it into the run directory as filename.
+        Memory use is bounded by the chunk size.
+        """
+        self.blob_root.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_name = tempfile.mkstemp(dir=self.blob_root, prefix=".tmp-")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                for chunk in chunks:
+                    f.write(chunk)
+                    digest.update(chunk)
+                    size += len(chunk)
+            sha = digest.hexdigest()
+            blob = self.blob_path(sha)
+            if blob.exists():
+                os.unlink(tmp_name)
+            else:
+                blob.parent.mkdir(exist_ok=True)
+                os.replace(tmp_name, blob)
+        except BaseException:
+            if os.path.exists(tmp_name):
+                os.unlink(tmp_name)
+            raise
+
+        return self.link_blob(run_id, sha, filename, artifact_type, metadata)
+
+    def store_file(
+        self,
+        run_id: str,
+        source: Path,
+        filename: str,
+        artifact_type: str,
+        metadata: dict[str, Any] | None = None,
+        move: bool = False,
+    ) -> Artifact:
+        """
+        Take over an existing file: hash it, then move it (move=True) or
+        hard-link it into the blob store, copying only where neither is
+        possible, and link it into the run directory. A linked source shares
+        its storage with the artifact, so it must not be modified in place.
+        """
+        digest = hashlib.sha256()
+        with open(source, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        sha = digest.hexdigest()
+        blob = self.blob_path(sha)
+        blob.parent.mkdir(parents=True, exist_ok=True)
+
+        if blob.exists():
+            if move:
+                source.unlink()
+        else:
+            tmp_blob = blob.with_name(f".tmp-{sha}.{threading.get_ident()}")
+            try:
+                if move:
+                    os.replace(source, blob)
+                else:
+                    os.link(source, blob)
+            except OSError:
+                # Different filesystem: copy, then commit atomically
+                shutil.copyfile(source, tmp_blob)
+                os.replace(tmp_blob, blob)
+                if move:
+                    source.unlink()
+
+        return self.link_blob(run_id, sha, filename, artifact_type, metadata)
+
+    def blob_path(self, sha: str) -> Path:
+        return self.blob_root / sha[:2] / sha
+
+    def link_blob(
+        self,
+        run_id: str,
+        sha: str,
+        filename: str,
+        artifact_type: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> Artifact:
+        """Link a stored blob into the run directory as filename."""
+        blob = self.blob_path(sha)
+        file_path = self.ensure_run_dir(run_id) / _sanitize(filename)
+        tmp_link = file_path.with_name(f".{file_path.name}.{threading.get_ident()}.tmp")
+        try:
+            os.link(blob, tmp_link)
+        except OSError:
+            # Hard links unsupported (e.g. across filesystems)
+            shutil.copyfile(blob, tmp_link)
+        os.replace(tmp_link, file_path)
+
+        return Artifact(
+            type=artifact_type,
+            uri=str(file_path),
+            metadata={**(metadata or {}), "filename": file_path.name, "sha256": sha, "size": blob.stat().st_size},
+        )
+
+    def download(
+        self,
+        run_id: str,
+        url: str,
+        filename: str,
+        artifact_type: str,
+        metadata: dict[str, Any] | None = None,
+    ) -> Artifact:
+        """Stream a URL into the artifact store (see store_stream)."""
+        with http_client().stream("GET", url) as response:
+            response.raise_for_status()
+            return self.store_stream(
+                run_id, response.iter_bytes(_CHUNK_SIZE), filename, artifact_type, metadata
+            )
 
     def write_run_manifest(self, manifest: RunManifest) -> Path | None:
-        """Write the run manifest to the run directory."""
+        """
+        Write the run manifest to the run directory. With
+        ``artifacts.write_behind`` the write is queued to a background thread
+        and the returned path appears shortly after (see flush).
+        """
         if not self.write_manifests:
             return None
 
-        run_dir = self.ensure_run_dir(manifest.run_id)
-        manifest_path = run_dir / "run_manifest.json"
+        manifest_path = self.get_run_dir(manifest.run_id) / "run_manifest.json"
+        manifest_json = manifest.model_dump_json()
 
-        manifest_json = manifest.model_dump_json(indent=2)
-        manifest_path.write_text(manifest_json, encoding="utf-8")
+        if settings.artifacts.write_behind:
+            manifest_writer.submit(manifest_path, manifest_json)
+        else:
+            manifest_path.parent.mkdir(parents=True, exist_ok=True)
+            manifest_path.write_text(manifest_json, encoding="utf-8")
 
         return manifest_path
 
+    def flush(self) -> None:
+        """Wait until queued manifests have been written."""
+        manifest_writer.flush()
+
     def get_run_dir(self, run_id: str) -> Path:
         return self.root / run_id
 
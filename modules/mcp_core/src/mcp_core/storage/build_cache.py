@@ -0,0 +1,93 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any
+
+from ..config.settings import settings
+from .result_cache import canonical_json
+
+_CHUNK_SIZE = 1024 * 1024
+
+
+class BuildCache:
+    """
+    Records the outputs of incremental build steps (exports, imports) keyed by
+    a fingerprint of their inputs, so a step whose inputs are unchanged can be
+    skipped on the next run.
+
+    Records are small JSON files under ``<root>/builds/<step>``. File hashes
+    are memoized per (path, size, mtime) so unchanged files are not re-read.
+    """
+
+    def __init__(self, root: Path | None = None):
+        self._root = root
+        self._lock = threading.Lock()
+        self._hashes: dict[str, tuple[int, int, str]] = {}
+
+    @property
+    def root(self) -> Path:
+        return (self._root or settings.cache.root) / "builds"
+
+    @property
+    def enabled(self) -> bool:
+        return settings.cache.incremental_builds
+
+    @staticmethod
+    def fingerprint(**parts: Any) -> str:
+        """Hash the given inputs (as canonical JSON) into a step fingerprint."""
+        return hashlib.sha256(canonical_json(parts).encode("utf-8")).hexdigest()
+
+    def file_hash(self, path: str | Path) -> str | None:
+        """Return the SHA-256 of a file's contents, or None if it does not exist."""
+        path = str(path)
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            cached = self._hashes.get(path)
+        if cached and cached[:2] == (stat.st_size, stat.st_mtime_ns):
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_SIZE):
+                digest.update(chunk)
+        value = digest.hexdigest()
+        with self._lock:
+            self._hashes[path] = (stat.st_size, stat.st_mtime_ns, value)
+        return value
+
+    def _path(self, step: str, key: str) -> Path:
+        return self.root / step / f"{key}.json"
+
+    def get(self, step: str, key: str) -> dict[str, Any] | None:
+        """Return the record stored for a step fingerprint, or None."""
+        try:
+            record = json.loads(self._path(step, key).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return record if isinstance(record, dict) else None
+
+    def put(self, step: str, key: str, record: dict[str, Any]) -> None:
+        """Store the record for a step fingerprint."""
+        path = self._path(step, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp_path.write_text(canonical_json(record), encoding="utf-8")
+        os.replace(tmp_path, path)
+
+    def clear(self) -> None:
+        """Remove all build records."""
+        if self.root.exists():
+            for path in self.root.glob("*/*.json"):
+                path.unlink(missing_ok=True)
+        with self._lock:
+            self._hashes.clear()
+
+
+# Global build cache
+build_cache = BuildCache()
@@ -0,0 +1,113 @@
+"""
+Write-behind persistence for run manifests.
+
+Manifests are handed to a background thread through a bounded queue, so a
+tool call does not wait for ``mkdir``, the write or ``fsync`` (the largest
+share of per-call latency on network filesystems). The thread drains the
+queue in batches, writes each file to a temporary name, fsyncs the whole
+batch and then renames the files into place. A full queue blocks
+submitters instead of dropping manifests, and pending manifests are
+flushed at interpreter exit.
+"""
+import atexit
+import os
+import queue
+import threading
+from pathlib import Path
+
+from ..observability import get_logger
+
+logger = get_logger(__name__)
+
+_STOP = object()
+
+
+class ManifestWriter:
+    def __init__(self, max_pending: int = 1024, batch_size: int = 64):
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(maxsize=max_pending)
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._pid: int | None = None
+
+    def _ensure_thread(self) -> None:
+        with self._lock:
+            # A forked child (e.g. the detached daemon) does not inherit the thread
+            if self._thread is not None and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self._pid is None:
+                atexit.register(self.close)
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="mcp-manifest-writer", daemon=True)
+            self._thread.start()
+
+    def submit(self, path: Path, data: str) -> None:
+        """Queue data to be written to path; blocks while the queue is full."""
+        self._ensure_thread()
+        self._queue.put((path, data))
+
+    def flush(self) -> None:
+        """Block until every submitted manifest has been written."""
+        if self._thread is not None and self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        """Flush pending manifests and stop the writer thread."""
+        thread = self._thread
+        if thread is None or not thread.is_alive() or self._pid != os.getpid():
+            return
+        self._queue.put(_STOP)
+        thread.join()
+        self._thread = None
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            batch = [item]
+            while item is not _STOP and len(batch) < self.batch_size:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                batch.append(item)
+            stop = batch[-1] is _STOP
+            entries = [entry for entry in batch if entry is not _STOP]
+            try:
+                self._write_batch(entries)
+            except Exception as e:
+                logger.error(f"Failed to write run manifests: {e}")
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    @staticmethod
+    def _write_batch(entries: list[tuple[Path, str]]) -> None:
+        written = []
+        for path, data in entries:
+            f = None
+            try:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                tmp_path = path.with_name(f".{path.name}.tmp")
+                f = open(tmp_path, "w", encoding="utf-8")
+                f.write(data)
+                written.append((f, tmp_path, path))
+            except OSError as e:
+                if f is not None:
+                    f.close()
+                logger.error(f"Failed to write run manifest {path}: {e}")
+        # One fsync pass for the whole batch, then publish
+        for f, tmp_path, path in written:
+            try:
+                f.flush()
+                os.fsync(f.fileno())
+                f.close()
+                os.replace(tmp_path, path)
+            except OSError as e:
+                f.close()
+                logger.error(f"Failed to write run manifest {path}: {e}")
+
+
+# Global manifest writer
+manifest_writer = ManifestWriter()
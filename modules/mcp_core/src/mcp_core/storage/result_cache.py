@@ -0,0 +1,163 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any
+
+from mcp_protocol import ToolResult
+
+from ..config.settings import settings
+
+
+def canonical_json(data: Any) -> str:
+    """Serialize data to a stable JSON string (sorted keys, no whitespace)."""
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class ResultCache:
+    """
+    Disk-backed cache of tool results for deterministic, side-effect-free calls.
+
+    Entries are stored as JSON files under ``<root>/results`` and evicted in
+    least-recently-used order once ``max_entries`` or ``max_bytes`` is exceeded.
+    Artifacts are not copied: cached results reference the files already
+    persisted in the artifact store, and an entry whose artifacts have since
+    disappeared is treated as a miss.
+    """
+
+    def __init__(
+        self,
+        root: Path | None = None,
+        max_entries: int | None = None,
+        max_bytes: int | None = None,
+    ):
+        self._root = root
+        self._max_entries = max_entries
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # key -> size in bytes, ordered from least to most recently used
+        self._index: OrderedDict[str, int] | None = None
+        self._total_bytes = 0
+
+    @property
+    def root(self) -> Path:
+        return (self._root or settings.cache.root) / "results"
+
+    @property
+    def max_entries(self) -> int:
+        return self._max_entries if self._max_entries is not None else settings.cache.max_entries
+
+    @property
+    def max_bytes(self) -> int:
+        return self._max_bytes if self._max_bytes is not None else settings.cache.max_bytes
+
+    @staticmethod
+    def make_key(
+        tool_name: str,
+        inputs: dict[str, Any],
+        config_hash: str | None = None,
+        tool_version: str | None = None,
+        file_hashes: dict[str, str | None] | None = None,
+    ) -> str:
+        """
+        Build a cache key from the tool name, canonical inputs, config and
+        version, and the content hashes of files the inputs refer to.
+        """
+        parts: dict[str, Any] = {
+            "tool": tool_name,
+            "inputs": inputs,
+            "config_hash": config_hash,
+            "tool_version": tool_version,
+        }
+        if file_hashes:
+            parts["files"] = file_hashes
+        material = canonical_json(parts)
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> OrderedDict[str, int]:
+        if self._index is None:
+            entries: list[tuple[float, str, int]] = []
+            if self.root.exists():
+                for path in self.root.glob("*/*.json"):
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def _drop(self, key: str) -> None:
+        index = self._load_index()
+        size = index.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        self._path(key).unlink(missing_ok=True)
+
+    def get(self, key: str) -> ToolResult | None:
+        """Return the cached result for key, or None on a miss."""
+        with self._lock:
+            index = self._load_index()
+            path = self._path(key)
+            try:
+                result = ToolResult.model_validate_json(path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                index.pop(key, None)
+                return None
+            except ValueError:
+                self._drop(key)
+                return None
+
+            for art in result.artifacts:
+                if art.uri and not Path(art.uri.removeprefix("file://")).exists():
+                    self._drop(key)
+                    return None
+
+            if key in index:
+                index.move_to_end(key)
+            os.utime(path)
+            return result
+
+    def put(self, key: str, result: ToolResult) -> None:
+        """Store a result under key and evict old entries if limits are exceeded."""
+        data = result.model_dump_json()
+        with self._lock:
+            index = self._load_index()
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(data, encoding="utf-8")
+            os.replace(tmp_path, path)
+
+            size = len(data.encode("utf-8"))
+            self._total_bytes += size - index.get(key, 0)
+            index[key] = size
+            index.move_to_end(key)
+            self._evict()
+
+    def _evict(self) -> None:
+        index = self._load_index()
+        while index and (len(index) > self.max_entries or self._total_bytes > self.max_bytes):
+            oldest = next(iter(index))
+            self._drop(oldest)
+
+    def clear(self) -> None:
+        """Remove all cached results."""
+        with self._lock:
+            for key in list(self._load_index()):
+                self._drop(key)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+
+# Global result cache
+result_cache = ResultCache()
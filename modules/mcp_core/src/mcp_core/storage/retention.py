@@ -0,0 +1,457 @@
+"""
+Retention and garbage collection for the artifact store.
+
+Runs are judged by their manifest (tool, status, end time). The most recent
+``keep_last_per_tool`` runs of each tool are always kept. Other runs are
+deleted once older than ``max_age_days`` (``failure_max_age_days`` for
+failed runs), then oldest first, successes before failures, while the store
+exceeds ``max_total_bytes``.
+
+Runs that hold nothing but their manifest are compacted after
+``compact_after_days``: the manifest is appended to a gzip segment under
+``packs/`` (one per month, one gzip member per pass) and the directory is
+removed. Segments are deleted as a whole once every manifest in them has
+expired.
+
+Blobs are reference counted by their hard-link count: a blob linked only
+from the blob store, and not referenced by the image cache, is deleted.
+
+Collection works in small steps against an optional deadline, so it can run
+incrementally in a background thread after tool calls (see ``schedule``).
+The deadline also bounds the scan of the store. The sizes of finished runs
+are remembered and also make up the store's total, so a pass that runs out
+of time during the scan leaves the next pass less to walk; nothing is
+deleted until a scan completes.
+"""
+import gzip
+import json
+import os
+import shutil
+import threading
+import time
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from datetime import UTC, datetime
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from ..config.settings import settings
+from ..observability import get_logger
+from .artifact_manager import ArtifactManager, artifact_manager
+
+logger = get_logger(__name__)
+
+MANIFEST_NAME = "run_manifest.json"
+# Top-level directories of the artifact root that are not runs
+RESERVED_DIRS = frozenset({"blobs", "image_cache", "packs"})
+# Runs without a manifest younger than this may still be executing
+INCOMPLETE_GRACE_SECONDS = 24 * 3600
+# Blobs linked or written more recently than this may be mid-store
+BLOB_GRACE_SECONDS = 3600
+# Wall-clock budget of one background pass
+BACKGROUND_TIME_BUDGET = 2.0
+
+_DAY = 86400.0
+
+
+class RetentionPolicy(NamedTuple):
+    max_age_days: float | None = None
+    failure_max_age_days: float | None = None
+    max_total_bytes: int | None = None
+    keep_last_per_tool: int = 5
+    compact_after_days: float | None = 7.0
+
+    @classmethod
+    def from_settings(cls) -> "RetentionPolicy":
+        config = settings.artifacts.retention
+        return cls(
+            config.max_age_days,
+            config.failure_max_age_days,
+            config.max_total_bytes,
+            config.keep_last_per_tool,
+            config.compact_after_days,
+        )
+
+    def max_age(self, failed: bool) -> float | None:
+        """Maximum age in seconds for a run, or None if unlimited."""
+        days = self.failure_max_age_days if failed and self.failure_max_age_days is not None else self.max_age_days
+        return days * _DAY if days is not None else None
+
+
+class RunInfo(NamedTuple):
+    run_id: str
+    path: Path
+    tool: str
+    failed: bool
+    finished: float
+    # Bytes freed by deleting the run; files shared through the blob store
+    # count a proportional share
+    size: int
+    manifest_only: bool
+    manifest: dict[str, Any] | None
+
+
+def _never() -> bool:
+    return False
+
+
+def _run_size(path: Path, out_of_time: Callable[[], bool] = _never) -> tuple[int, bool] | None:
+    """The run's size and whether it holds only its manifest; None when out of time."""
+    size = 0
+    manifest_only = True
+    for file in path.rglob("*"):
+        if out_of_time():
+            return None
+        try:
+            stat = file.stat()
+        except OSError:
+            continue
+        if not file.is_file():
+            continue
+        if file.name != MANIFEST_NAME or file.parent != path:
+            manifest_only = False
+        # One link is the blob store's own
+        size += stat.st_size if stat.st_nlink == 1 else stat.st_size // max(stat.st_nlink - 1, 1)
+    return size, manifest_only
+
+
+def _finished(manifest: dict[str, Any], fallback: float) -> float:
+    try:
+        end = datetime.fromisoformat(manifest["end_time"])
+    except (KeyError, TypeError, ValueError):
+        return fallback
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=UTC)
+    return end.timestamp()
+
+
+class RetentionEngine:
+    def __init__(self, manager: ArtifactManager | None = None):
+        self._manager = manager or artifact_manager
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._last_scheduled = float("-inf")
+        # Run directory -> (manifest mtime, size, manifest_only) of finished runs
+        self._run_sizes: dict[Path, tuple[int, int, bool]] = {}
+
+    @property
+    def root(self) -> Path:
+        return self._manager.root
+
+    @property
+    def packs_root(self) -> Path:
+        return self.root / "packs"
+
+    def scan_runs(self, now: float | None = None, out_of_time: Callable[[], bool] = _never) -> list[RunInfo]:
+        """
+        Return the finished runs under the artifact root, oldest first. Once
+        out_of_time returns True the scan stops and only the runs scanned so
+        far are returned.
+        """
+        now = time.time() if now is None else now
+        runs: list[RunInfo] = []
+        if not self.root.exists():
+            return runs
+        seen: set[Path] = set()
+        for path in self.root.iterdir():
+            if out_of_time():
+                return runs
+            if path.name in RESERVED_DIRS or not path.is_dir():
+                continue
+            manifest_path = path / MANIFEST_NAME
+            manifest_mtime = 0
+            try:
+                manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+                manifest_mtime = manifest_path.stat().st_mtime_ns
+                finished = _finished(manifest, manifest_mtime / 1e9)
+            except (OSError, ValueError):
+                manifest = None
+                try:
+                    finished = path.stat().st_mtime
+                except OSError:
+                    continue
+                if now - finished < INCOMPLETE_GRACE_SECONDS:
+                    continue
+            seen.add(path)
+            # A run's files are final once its manifest is written
+            cached = self._run_sizes.get(path)
+            if manifest is not None and cached is not None and cached[0] == manifest_mtime:
+                size, manifest_only = cached[1:]
+            else:
+                scanned = _run_size(path, out_of_time)
+                if scanned is None:
+                    return runs
+                size, manifest_only = scanned
+                if manifest is not None:
+                    self._run_sizes[path] = (manifest_mtime, size, manifest_only)
+            runs.append(RunInfo(
+                run_id=path.name,
+                path=path,
+                tool=(manifest or {}).get("tool_name", ""),
+                failed=(manifest or {}).get("status") == "error",
+                finished=finished,
+                size=size,
+                manifest_only=manifest_only and manifest is not None,
+                manifest=manifest,
+            ))
+        runs.sort(key=lambda r: (r.finished, r.run_id))
+        # Forget runs that have since been deleted
+        self._run_sizes = {path: entry for path, entry in self._run_sizes.items() if path in seen}
+        return runs
+
+    def total_bytes(self, runs: list[RunInfo], out_of_time: Callable[[], bool] = _never) -> int:
+        """
+        Bytes used under the artifact root. Finished runs count their scanned
+        (remembered) sizes, so only the rest of the store is walked: blobs,
+        caches, packs and runs still being written. A blob linked from runs is
+        already counted through their shares, so the blob store adds only its
+        unlinked blobs. The count stops early (and is partial) once out_of_time
+        returns True.
+        """
+        total = sum(run.size for run in runs)
+        if not self.root.exists():
+            return total
+        scanned = {run.path for run in runs}
+        blob_root = self._manager.blob_root
+        for path in self.root.iterdir():
+            if out_of_time():
+                return total
+            if path in scanned:
+                continue
+            if path == blob_root:
+                total += self._unlinked_blob_bytes(out_of_time)
+            elif path.is_dir():
+                walked = _run_size(path, out_of_time)
+                if walked is None:
+                    return total
+                total += walked[0]
+            else:
+                try:
+                    total += path.stat().st_size
+                except OSError:
+                    continue
+        return total
+
+    def _unlinked_blob_bytes(self, out_of_time: Callable[[], bool]) -> int:
+        total = 0
+        for blob in self._manager.blob_root.rglob("*"):
+            if out_of_time():
+                return total
+            try:
+                stat = blob.stat()
+            except OSError:
+                continue
+            if stat.st_nlink == 1 and blob.is_file():
+                total += stat.st_size
+        return total
+
+    @staticmethod
+    def _protected(runs: list[RunInfo], keep_last: int) -> set[str]:
+        """The newest keep_last runs of each tool (runs sorted oldest first)."""
+        if keep_last <= 0:
+            return set()
+        by_tool: dict[str, list[RunInfo]] = defaultdict(list)
+        for run in runs:
+            by_tool[run.tool].append(run)
+        return {run.run_id for tool_runs in by_tool.values() for run in tool_runs[-keep_last:]}
+
+    def plan(self, runs: list[RunInfo], policy: RetentionPolicy, now: float, total: int = 0) -> list[RunInfo]:
+        """Select the runs to delete under policy (runs sorted oldest first)."""
+        protected = self._protected(runs, policy.keep_last_per_tool)
+        doomed = []
+        remaining = []
+        for run in runs:
+            if run.run_id in protected:
+                continue
+            max_age = policy.max_age(run.failed)
+            if max_age is not None and now - run.finished > max_age:
+                doomed.append(run)
+            else:
+                remaining.append(run)
+
+        if policy.max_total_bytes is not None:
+            excess = total - sum(r.size for r in doomed) - policy.max_total_bytes
+            # Oldest successes go first; failures are kept longest
+            for run in sorted(remaining, key=lambda r: (r.failed, r.finished)):
+                if excess <= 0:
+                    break
+                doomed.append(run)
+                excess -= run.size
+        return doomed
+
+    def collect(
+        self,
+        policy: RetentionPolicy | None = None,
+        dry_run: bool = False,
+        time_budget: float | None = None,
+        now: float | None = None,
+    ) -> dict[str, Any]:
+        """
+        Apply the retention policy (settings by default). With time_budget,
+        stop after roughly that many seconds; ``complete`` in the report is
+        False if work was left for a later pass.
+        """
+        policy = policy or RetentionPolicy.from_settings()
+        now = time.time() if now is None else now
+        deadline = time.monotonic() + time_budget if time_budget is not None else None
+        report: dict[str, Any] = {
+            "dry_run": dry_run,
+            "runs_deleted": [],
+            "manifests_compacted": 0,
+            "segments_deleted": 0,
+            "blobs_deleted": 0,
+            "bytes_freed": 0,
+            "complete": True,
+        }
+
+        def out_of_time() -> bool:
+            if deadline is not None and time.monotonic() > deadline:
+                report["complete"] = False
+                return True
+            return False
+
+        # Deciding on a partial scan could delete runs the policy would keep
+        runs = self.scan_runs(now, out_of_time)
+        total = self.total_bytes(runs, out_of_time) if policy.max_total_bytes is not None else 0
+        if not report["complete"]:
+            return report
+        doomed = self.plan(runs, policy, now, total)
+        for run in doomed:
+            if out_of_time():
+                return report
+            if not dry_run:
+                shutil.rmtree(run.path, ignore_errors=True)
+            report["runs_deleted"].append(run.run_id)
+            report["bytes_freed"] += run.size
+
+        if policy.compact_after_days is not None:
+            deleted = set(report["runs_deleted"])
+            kept = [r for r in runs if r.run_id not in deleted]
+            protected = self._protected(kept, policy.keep_last_per_tool)
+            candidates = [
+                r for r in kept
+                if r.manifest_only and r.run_id not in protected
+                and now - r.finished > policy.compact_after_days * _DAY
+            ]
+            self._compact(candidates, dry_run, report, out_of_time)
+            if not report["complete"]:
+                return report
+            self._expire_segments(policy, now, dry_run, report)
+
+        self._sweep_blobs(dry_run, report, out_of_time, now)
+        return report
+
+    def _compact(
+        self, runs: list[RunInfo], dry_run: bool, report: dict[str, Any], out_of_time: Callable[[], bool]
+    ) -> None:
+        by_segment: dict[str, list[RunInfo]] = defaultdict(list)
+        for run in runs:
+            by_segment[datetime.fromtimestamp(run.finished, UTC).strftime("%Y-%m")].append(run)
+        for month, segment_runs in sorted(by_segment.items()):
+            if out_of_time():
+                return
+            if not dry_run:
+                self.packs_root.mkdir(parents=True, exist_ok=True)
+                lines = "".join(json.dumps(r.manifest, separators=(",", ":")) + "\n" for r in segment_runs)
+                # Each pass appends one gzip member; readers see the concatenation
+                with open(self.packs_root / f"manifests-{month}.jsonl.gz", "ab") as f:
+                    f.write(gzip.compress(lines.encode("utf-8")))
+                    f.flush()
+                    os.fsync(f.fileno())
+                for run in segment_runs:
+                    shutil.rmtree(run.path, ignore_errors=True)
+            report["manifests_compacted"] += len(segment_runs)
+
+    def _expire_segments(self, policy: RetentionPolicy, now: float, dry_run: bool, report: dict[str, Any]) -> None:
+        success_age, failure_age = policy.max_age(False), policy.max_age(True)
+        if success_age is None or failure_age is None or not self.packs_root.exists():
+            return
+        for segment in self.packs_root.glob("manifests-*.jsonl.gz"):
+            try:
+                month = datetime.strptime(segment.name[len("manifests-"):-len(".jsonl.gz")], "%Y-%m")
+            except ValueError:
+                continue
+            # The segment's newest manifest is at most the end of its month
+            end = month.replace(tzinfo=UTC, year=month.year + month.month // 12, month=month.month % 12 + 1)
+            if now - end.timestamp() > max(success_age, failure_age):
+                report["bytes_freed"] += segment.stat().st_size
+                report["segments_deleted"] += 1
+                if not dry_run:
+                    segment.unlink()
+
+    def _cached_blobs(self) -> set[str]:
+        refs: set[str] = set()
+        for record in (self.root / "image_cache").glob("*/*.json"):
+            try:
+                refs.update(b["sha256"] for b in json.loads(record.read_text(encoding="utf-8"))["blobs"])
+            except (OSError, ValueError, KeyError, TypeError):
+                continue
+        return refs
+
+    def _sweep_blobs(
+        self, dry_run: bool, report: dict[str, Any], out_of_time: Callable[[], bool], now: float
+    ) -> None:
+        blob_root = self._manager.blob_root
+        if not blob_root.exists():
+            return
+        cached = self._cached_blobs()
+        for blob in [*blob_root.glob(".tmp-*"), *blob_root.glob("*/*")]:
+            if out_of_time():
+                return
+            try:
+                stat = blob.stat()
+            except OSError:
+                continue
+            if blob.name in cached or stat.st_nlink > 1 or not blob.is_file():
+                continue
+            # Interrupted writes leave temporaries; let in-flight ones finish
+            grace = INCOMPLETE_GRACE_SECONDS if blob.name.startswith(".tmp-") else BLOB_GRACE_SECONDS
+            if now - stat.st_ctime < grace:
+                continue
+            report["blobs_deleted"] += 1
+            report["bytes_freed"] += stat.st_size
+            if not dry_run:
+                blob.unlink(missing_ok=True)
+
+    def packed_manifests(self) -> Iterator[dict[str, Any]]:
+        """Yield the manifests stored in pack segments, oldest segment first."""
+        if not self.packs_root.exists():
+            return
+        for segment in sorted(self.packs_root.glob("manifests-*.jsonl.gz")):
+            with gzip.open(segment, "rt", encoding="utf-8") as f:
+                for line in f:
+                    if line.strip():
+                        yield json.loads(line)
+
+    def schedule(self) -> bool:
+        """
+        Start a background collection pass if enabled, none is running and
+        the configured interval has elapsed. Returns True if one was started.
+        """
+        config = settings.artifacts.retention
+        if not config.background:
+            return False
+        with self._lock:
+            now = time.monotonic()
+            running = self._thread is not None and self._thread.is_alive()
+            if running or now - self._last_scheduled < config.background_interval_seconds:
+                return False
+            self._last_scheduled = now
+            self._thread = threading.Thread(target=self._background_pass, name="mcp-artifact-gc", daemon=True)
+            self._thread.start()
+        return True
+
+    def _background_pass(self) -> None:
+        try:
+            report = self.collect(time_budget=BACKGROUND_TIME_BUDGET)
+            if report["runs_deleted"] or report["manifests_compacted"] or report["blobs_deleted"]:
+                logger.info(
+                    f"Artifact GC: deleted {len(report['runs_deleted'])} runs, compacted "
+                    f"{report['manifests_compacted']} manifests, freed {report['bytes_freed']} bytes"
+                )
+        except Exception as e:
+            logger.warning(f"Artifact GC failed: {e}")
+
+
+# Global retention engine
+retention = RetentionEngine()
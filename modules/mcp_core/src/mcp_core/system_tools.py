@@ -18,22 +18,11 @@ from .registry import ToolRegistry, registry
 
 def list_commands_handler(input: ListCommandsInput) -> ToolResult | ToolError:
     ctx = get_current_context()
-    tools = registry.list_tools()
-    result = {
-        "tools": [
-            {
-                "name": t.name,
-                "description": t.description,
-                "input_schema": t.input_model.model_json_schema(),
-            }
-            for t in tools
-        ]
-    }
     return ToolResult(
         tool="mcp.list_commands",
         request_id=ctx.request_id or "",
         run_id=ctx.run_id or "",
-        result=result
+        result=registry.list_commands_payload()
     )
 
 def help_handler(input: HelpInput) -> ToolResult | ToolError:
@@ -53,7 +42,8 @@ def help_handler(input: HelpInput) -> ToolResult | ToolError:
     result = {
         "name": tool.name,
         "description": tool.description,
-        "input_schema": tool.input_model.model_json_schema(),
+        "metadata": tool.metadata.as_dict(),
+        "input_schema": registry.input_schema(tool.name),
     }
     return ToolResult(
         tool="mcp.help",
@@ -143,28 +133,36 @@ def register_system_tools(registry: ToolRegistry = registry):
         description="List all available tools and their schemas.",
         input_model=ListCommandsInput,
         handler=list_commands_handler,
+        read_only=True,
+        cost="cheap",
     )
     registry.register(
         name="mcp.help",
         description="Get detailed help for a specific tool.",
         input_model=HelpInput,
         handler=help_handler,
+        read_only=True,
+        cost="cheap",
     )
     registry.register(
         name="mcp.config_get",
         description="Get a configuration value.",
         input_model=ConfigGetInput,
         handler=config_get_handler,
+        read_only=True,
+        cost="cheap",
     )
     registry.register(
         name="mcp.config_set",
         description="Set a configuration value (not implemented).",
         input_model=ConfigSetInput,
         handler=config_set_handler,
+        cost="cheap",
     )
     registry.register(
         name="mcp.reset_config",
         description="Reset configuration to defaults (not implemented).",
         input_model=ResetConfigInput,
         handler=reset_config_handler,
+        cost="cheap",
     )
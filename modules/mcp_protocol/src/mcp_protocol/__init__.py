@@ -11,10 +11,12 @@ from .models import (
     GenerateTextureInput,
     HelpInput,
     ImportAssetInput,
+    ImportAssetsInput,
     ListCommandsInput,
     OptimizeLevelInput,
     PopulateLevelInput,
     ProfilePerformanceInput,
+    QueryAssetsInput,
     ResetConfigInput,
     RunManifest,
     ToolError,
@@ -36,6 +38,8 @@ __all__ = [
     "GenerateTextureInput",
     "ExportAssetInput",
     "ImportAssetInput",
+    "ImportAssetsInput",
+    "QueryAssetsInput",
     "GenerateTerrainInput",
     "PopulateLevelInput",
     "GenerateBlueprintInput",
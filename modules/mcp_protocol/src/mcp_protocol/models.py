@@ -1,12 +1,16 @@
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class Artifact(BaseModel):
+    # Binary content is URL-safe base64 in JSON and written to disk as raw bytes
+    model_config = ConfigDict(ser_json_bytes="base64")
+
     type: str
     uri: str | None = None
-    content: str | None = None
+    content: str | bytes | None = None
+    # "transfer": "move" | "link" asks the artifact manager to take over the file at uri
     metadata: dict[str, Any] | None = None
 
 class ToolResult(BaseModel):
@@ -69,6 +73,12 @@ class AddObjectInput(BaseModel):
 class GenerateTextureInput(BaseModel):
     object_name: str
     texture_type: str
+    # Synthesize the texture procedurally instead of using AI or a flat colour
+    pattern: Literal["noise", "marble", "wood", "checker", "bricks"] | None = None
+    seed: int | None = None
+    # e.g. "2K" or "1024"; defaults to blender.asset_processing.texture_resolution
+    resolution: str | None = None
+    normal_map: bool = False
     dry_run: bool = False
 
 class ExportAssetInput(BaseModel):
@@ -86,11 +96,29 @@ class ImportAssetInput(BaseModel):
     dry_run: bool = False
     overwrite: bool = False
 
+class ImportAssetsInput(BaseModel):
+    manifest_paths: list[str] = Field(default_factory=list)
+    # Glob matched against manifest files, e.g. "./exports/**/*.manifest.json"
+    manifest_glob: str | None = None
+    dry_run: bool = False
+    overwrite: bool = False
+
+class QueryAssetsInput(BaseModel):
+    # Object path prefix, e.g. "/Game/Props/"
+    prefix: str | None = None
+    class_name: str | None = None
+    # Asset Registry tag, as "key" or "key=value"
+    tag: str | None = None
+    limit: int = Field(default=1000, ge=1)
+    refresh: bool = False
+
 class GenerateTerrainInput(BaseModel):
     width: int
     height: int
     detail_level: Literal["low", "medium", "high"]
     seed: int | None = None
+    components_per_tile: int = Field(default=8, ge=1)
+    write_heightmap: bool = False
     dry_run: bool = False
 
 class PopulateLevelInput(BaseModel):
@@ -98,6 +126,12 @@ class PopulateLevelInput(BaseModel):
     density: int
     seed: int | None = None
     budget_max_instances: int | None = None
+    method: Literal["jittered_grid", "poisson"] = "jittered_grid"
+    bounds: tuple[float, float, float, float] | None = None
+    min_spacing: float | None = None
+    heightmap_path: str | None = None
+    height_range: tuple[float, float] | None = None
+    max_slope_deg: float | None = None
     dry_run: bool = False
 
 class GenerateBlueprintInput(BaseModel):
@@ -106,11 +140,14 @@ class GenerateBlueprintInput(BaseModel):
 
 class ProfilePerformanceInput(BaseModel):
     level_name: str
+    frames: int = Field(default=300, ge=1)
+    hitch_threshold_ms: float | None = None
     dry_run: bool = False
 
 class OptimizeLevelInput(BaseModel):
     dry_run: bool = False
     budgets: dict[str, Any] | None = None
+    inventory: list[dict[str, Any]] | None = None
 
 class DebugBlueprintInput(BaseModel):
     blueprint_name: str
@@ -0,0 +1,141 @@
+"""
+Wire formats for the UE5 and Blender transports.
+
+Payloads are JSON unless both ends agree on something better. Each side
+advertises the encodings and compressions it can handle (UE5 on ``/health``,
+Blender in its ``ping`` reply); a payload is then sent as msgpack when both
+have it and compressed (zstd, else gzip) once it is large enough to be worth
+it. JSON is always the fallback, so older servers keep working.
+
+msgpack and zstandard are optional (the ``wire`` extra); gzip is always
+available.
+"""
+import gzip
+import json
+from typing import Any, NamedTuple
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional extra
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional extra
+    zstandard = None
+
+# Preference order, best first
+ENCODINGS = ("msgpack", "json")
+COMPRESSIONS = ("zstd", "gzip")
+
+CONTENT_TYPES = {"json": "application/json", "msgpack": "application/msgpack"}
+
+# Payloads smaller than this are not compressed (and do not trigger a handshake)
+MIN_COMPRESS_BYTES = 16 * 1024
+
+# Stdio frames: "#<encoding> <compression|identity> <length>\n" followed by the payload
+FRAME_MARKER = b"#"
+IDENTITY = "identity"
+
+
+class WireFormat(NamedTuple):
+    encoding: str = "json"
+    compression: str | None = None
+
+
+JSON = WireFormat()
+
+
+def capabilities() -> dict[str, list[str]]:
+    """Encodings and compressions available in this process."""
+    return {
+        "encodings": [e for e in ENCODINGS if e == "json" or (e == "msgpack" and msgpack is not None)],
+        "compression": [c for c in COMPRESSIONS if c == "gzip" or (c == "zstd" and zstandard is not None)],
+    }
+
+
+def negotiate(remote: Any) -> WireFormat:
+    """Pick the best format both this process and `remote` capabilities support."""
+    if not isinstance(remote, dict):
+        return JSON
+    local = capabilities()
+    encoding = next((e for e in local["encodings"] if e in remote.get("encodings", [])), "json")
+    compression = next((c for c in local["compression"] if c in remote.get("compression", [])), None)
+    return WireFormat(encoding, compression)
+
+
+def encoding_for(content_type: Any) -> str:
+    """Map a Content-Type header to an encoding name (JSON when unknown)."""
+    media_type = str(content_type or "").split(";")[0].strip().lower()
+    return next((name for name, value in CONTENT_TYPES.items() if value == media_type), "json")
+
+
+def encode(obj: Any, encoding: str = "json") -> bytes:
+    if encoding == "msgpack":
+        packed: bytes = msgpack.packb(obj, use_bin_type=True)
+        return packed
+    if encoding == "json":
+        return json.dumps(obj).encode("utf-8")
+    raise ValueError(f"Unsupported wire encoding: {encoding}")
+
+
+def decode(data: bytes, encoding: str = "json") -> Any:
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack payload received but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False)
+    if encoding == "json":
+        return json.loads(data)
+    raise ValueError(f"Unsupported wire encoding: {encoding}")
+
+
+def compress(data: bytes, compression: str | None) -> bytes:
+    if not compression or compression == IDENTITY:
+        return data
+    if compression == "gzip":
+        return gzip.compress(data, compresslevel=5)
+    if compression == "zstd":
+        compressed: bytes = zstandard.ZstdCompressor(level=3).compress(data)
+        return compressed
+    raise ValueError(f"Unsupported wire compression: {compression}")
+
+
+def decompress(data: bytes, compression: str | None) -> bytes:
+    if not compression or compression == IDENTITY:
+        return data
+    if compression == "gzip":
+        return gzip.decompress(data)
+    if compression == "zstd":
+        if zstandard is None:
+            raise ValueError("zstd payload received but zstandard is not installed")
+        decompressed: bytes = zstandard.ZstdDecompressor().decompress(data)
+        return decompressed
+    raise ValueError(f"Unsupported wire compression: {compression}")
+
+
+def dumps(obj: Any, fmt: WireFormat = JSON) -> tuple[bytes, WireFormat]:
+    """
+    Encode obj in fmt, compressing only when the encoded payload reaches
+    MIN_COMPRESS_BYTES. Returns the bytes and the format actually used.
+    """
+    data = encode(obj, fmt.encoding)
+    if fmt.compression and len(data) >= MIN_COMPRESS_BYTES:
+        return compress(data, fmt.compression), fmt
+    return data, WireFormat(fmt.encoding)
+
+
+def loads(data: bytes, fmt: WireFormat = JSON) -> Any:
+    return decode(decompress(data, fmt.compression), fmt.encoding)
+
+
+def frame_header(fmt: WireFormat, length: int) -> bytes:
+    return FRAME_MARKER + f"{fmt.encoding} {fmt.compression or IDENTITY} {length}\n".encode("ascii")
+
+
+def parse_frame_header(line: bytes) -> tuple[WireFormat, int]:
+    """Parse a stdio frame header line into its format and payload length."""
+    try:
+        encoding, compression, length = line[len(FRAME_MARKER):].decode("ascii").split()
+        return WireFormat(encoding, None if compression == IDENTITY else compression), int(length)
+    except ValueError as e:
+        raise ValueError(f"Malformed frame header: {line[:64]!r}") from e
@@ -1,6 +1,12 @@
+import gzip
+import hashlib
 import json
+import mmap
+import os
 import sys
 import traceback
+from array import array
+from multiprocessing import shared_memory
 
 # Ensure we can import bpy
 try:
@@ -14,6 +20,132 @@ except ImportError:
     sys.stderr.write("Error: This script must be run from within Blender.\n")
     sys.exit(1)
 
+# Optional wire formats, used when installed in Blender's Python
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Wire frames mirror mcp_protocol.wire:
+# "#<encoding> <compression|identity> <length>\n" followed by the payload
+FRAME_MARKER = b"#"
+# Framed responses smaller than this are not compressed
+WIRE_MIN_COMPRESS_BYTES = 16 * 1024
+
+def wire_capabilities():
+    """Encodings and compressions this server accepts, best first."""
+    return {
+        "encodings": (["msgpack"] if msgpack is not None else []) + ["json"],
+        "compression": (["zstd"] if zstandard is not None else []) + ["gzip"],
+    }
+
+def read_message(stream):
+    """
+    Read one request: a JSON line or a frame. Returns (request, format),
+    where format is None for JSON lines, or (None, None) at end of input.
+    """
+    line = stream.readline()
+    if not line:
+        return None, None
+    if not line.startswith(FRAME_MARKER):
+        return json.loads(line), None
+
+    encoding, compression, length = line[1:].decode("ascii").split()
+    payload = stream.read(int(length))
+    if compression == "gzip":
+        payload = gzip.decompress(payload)
+    elif compression == "zstd" and zstandard is not None:
+        payload = zstandard.ZstdDecompressor().decompress(payload)
+    elif compression != "identity":
+        raise ValueError(f"Unsupported frame compression: {compression}")
+    if encoding == "msgpack" and msgpack is not None:
+        return msgpack.unpackb(payload, raw=False), (encoding, compression)
+    if encoding == "json":
+        return json.loads(payload), (encoding, compression)
+    raise ValueError(f"Unsupported frame encoding: {encoding}")
+
+def write_message(stream, message, fmt=None):
+    """Write a response as a JSON line, or as a frame in the request's format."""
+    if fmt is None:
+        stream.write(json.dumps(message).encode("utf-8") + b"\n")
+    else:
+        encoding, compression = fmt
+        payload = msgpack.packb(message, use_bin_type=True) if encoding == "msgpack" else json.dumps(message).encode("utf-8")
+        if len(payload) < WIRE_MIN_COMPRESS_BYTES:
+            compression = "identity"
+        elif compression == "gzip":
+            payload = gzip.compress(payload, compresslevel=5)
+        elif compression == "zstd":
+            payload = zstandard.ZstdCompressor(level=3).compress(payload)
+        stream.write(FRAME_MARKER + f"{encoding} {compression} {len(payload)}\n".encode("ascii") + payload)
+    stream.flush()
+
+# Bulk buffers arrive in shared memory (see mcp_target_blender.transport.shm):
+# {"$buffer": {"name" or "path", "offset", "nbytes", "format", "count"}}
+BUFFER_KEY = "$buffer"
+
+def _attach_shared_memory(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        # Before Python 3.13 attaching registers the block with the resource
+        # tracker, which would unlink the host's block when Blender exits
+        block = shared_memory.SharedMemory(name=name)
+        if os.name != "nt":
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(block._name, "shared_memory")
+        return block
+
+class AttachedBuffers:
+    """
+    Shared blocks mapped for one request. resolve() replaces buffer
+    references with typed memoryviews that foreach_set reads directly;
+    they stay valid until close().
+    """
+
+    def __init__(self):
+        self._blocks = {}
+        self._views = []
+
+    def view(self, ref):
+        key = ref.get("name") or ref["path"]
+        if key not in self._blocks:
+            if "name" in ref:
+                self._blocks[key] = _attach_shared_memory(ref["name"])
+            else:
+                with open(ref["path"], "rb") as f:
+                    self._blocks[key] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        block = self._blocks[key]
+        base = block.buf if isinstance(block, shared_memory.SharedMemory) else memoryview(block)
+        view = base[ref["offset"]:ref["offset"] + ref["nbytes"]].cast(ref["format"])
+        self._views.extend((view, base))
+        return view
+
+    def resolve(self, value):
+        if isinstance(value, dict):
+            if BUFFER_KEY in value and len(value) == 1:
+                return self.view(value[BUFFER_KEY])
+            return {k: self.resolve(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.resolve(v) for v in value]
+        return value
+
+    def close(self):
+        for view in self._views:
+            view.release()
+        self._views = []
+        for block in self._blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                log("Shared buffer still referenced after the command; leaving it mapped")
+        self._blocks = {}
+
 def log(message):
     """Log to stderr so it doesn't interfere with stdout JSON."""
     sys.stderr.write(f"[BlenderServer] {message}\n")
@@ -125,6 +257,44 @@ def handle_generate_texture(params):
     # Clear existing nodes connected to Base Color if any, or just add new ones
     # For simplicity, we just add.
 
+    pixels = params.get("pixels")
+    if pixels is not None:
+        # RGBA floats, row by row from the bottom, as Image.pixels stores them
+        width, height = params["width"], params["height"]
+        image = bpy.data.images.new(f"{object_name}_{texture_type}", width, height, alpha=True)
+        image.pixels.foreach_set(pixels)
+        image.pack()
+
+        tex_image_node = nodes.new('ShaderNodeTexImage')
+        tex_image_node.location = (-300, 0)
+        tex_image_node.image = image
+        if bsdf:
+            links.new(tex_image_node.outputs['Color'], bsdf.inputs['Base Color'])
+
+        result = {
+            "message": f"Applied {width}x{height} generated texture to '{object_name}'",
+            "image_name": image.name,
+        }
+
+        normal_pixels = params.get("normal_pixels")
+        if normal_pixels is not None:
+            normal_image = bpy.data.images.new(f"{object_name}_{texture_type}_normal", width, height, alpha=True)
+            normal_image.colorspace_settings.name = "Non-Color"
+            normal_image.pixels.foreach_set(normal_pixels)
+            normal_image.pack()
+
+            normal_tex_node = nodes.new('ShaderNodeTexImage')
+            normal_tex_node.location = (-600, -300)
+            normal_tex_node.image = normal_image
+            normal_map_node = nodes.new('ShaderNodeNormalMap')
+            normal_map_node.location = (-300, -300)
+            links.new(normal_tex_node.outputs['Color'], normal_map_node.inputs['Color'])
+            if bsdf:
+                links.new(normal_map_node.outputs['Normal'], bsdf.inputs['Normal'])
+            result["normal_image_name"] = normal_image.name
+
+        return result
+
     texture_path = params.get("texture_path")
     if texture_path:
         log(f"Loading texture from {texture_path}")
@@ -199,25 +369,72 @@ def handle_export_asset(params):
         "format": fmt
     }
 
+def _hash_object(digest, obj):
+    """Feed an object's exportable state into digest."""
+    digest.update(f"{obj.name}|{obj.type}|".encode())
+    digest.update(array("d", (v for row in obj.matrix_world for v in row)).tobytes())
+    for mod in obj.modifiers:
+        digest.update(f"mod:{mod.name}:{mod.type}|".encode())
+    for slot in obj.material_slots:
+        digest.update(f"mat:{slot.material.name if slot.material else ''}|".encode())
+
+    if obj.type == "MESH":
+        mesh = obj.data
+        coords = array("f", [0.0]) * (len(mesh.vertices) * 3)
+        mesh.vertices.foreach_get("co", coords)
+        digest.update(coords.tobytes())
+        loops = array("i", [0]) * len(mesh.loops)
+        mesh.loops.foreach_get("vertex_index", loops)
+        digest.update(loops.tobytes())
+        for layer in mesh.uv_layers:
+            uvs = array("f", [0.0]) * (len(layer.data) * 2)
+            layer.data.foreach_get("uv", uvs)
+            digest.update(uvs.tobytes())
+
+def handle_object_fingerprint(params):
+    """
+    Fingerprint the state that export_asset would write: the named object,
+    or every object in the scene when no (known) object is given.
+    """
+    object_name = params.get("object_name")
+    obj = bpy.data.objects.get(object_name) if object_name else None
+    objects = [obj] if obj else sorted(bpy.context.scene.objects, key=lambda o: o.name)
+
+    digest = hashlib.sha256()
+    for o in objects:
+        _hash_object(digest, o)
+
+    return {
+        "fingerprint": digest.hexdigest(),
+        "source_file": bpy.data.filepath or None,
+        "objects": len(objects),
+    }
+
 def main():
     log("Server started. Waiting for commands on stdin...")
 
+    # Frames are binary, so read and write the underlying byte streams
+    stdin = sys.stdin.buffer
+    stdout = sys.stdout.buffer
+
     while True:
         try:
-            line = sys.stdin.readline()
-            if not line:
+            request, fmt = read_message(stdin)
+            if request is None:
                 break
 
-            request = json.loads(line)
             command = request.get("command")
-            params = request.get("params", {})
             req_id = request.get("id")
+            attached = AttachedBuffers()
 
             response = {"id": req_id, "status": "ok", "data": None}
 
             try:
+                params = attached.resolve(request.get("params", {}))
                 if command == "ping":
                     response["data"] = "pong"
+                    if "wire" in params:
+                        response["wire"] = wire_capabilities()
                 elif command == "generate_scene":
                     response["data"] = handle_generate_scene(params)
                 elif command == "add_object":
@@ -226,6 +443,8 @@ def main():
                     response["data"] = handle_generate_texture(params)
                 elif command == "export_asset":
                     response["data"] = handle_export_asset(params)
+                elif command == "object_fingerprint":
+                    response["data"] = handle_object_fingerprint(params)
                 else:
                     raise ValueError(f"Unknown command: {command}")
             except Exception as e:
@@ -233,13 +452,14 @@ def main():
                 traceback.print_exc(file=sys.stderr)
                 response["status"] = "error"
                 response["error"] = str(e)
+            finally:
+                attached.close()
 
-            # Write response
-            sys.stdout.write(json.dumps(response) + "\n")
-            sys.stdout.flush()
+            # Write response in the request's format
+            write_message(stdout, response, fmt)
 
-        except json.JSONDecodeError:
-            log("Invalid JSON received")
+        except (ValueError, OSError, EOFError) as e:
+            log(f"Invalid request received: {e}")
         except Exception as e:
             log(f"Server loop error: {e}")
             break
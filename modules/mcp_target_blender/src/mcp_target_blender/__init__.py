@@ -6,13 +6,6 @@ from mcp_protocol.models import (
     GenerateTextureInput,
 )
 
-from .tools import (
-    add_object,
-    export_asset,
-    generate_scene,
-    generate_texture,
-)
-
 __all__ = ["__version__", "register_blender_tools"]
 
 __version__ = "1.0.0"
@@ -28,23 +21,30 @@ def register_blender_tools(registry: ToolRegistry) -> None:
         name="mcp.generate_scene",
         description="Generate a Blender scene based on a description.",
         input_model=GenerateSceneInput,
-        handler=generate_scene,
+        handler="mcp_target_blender.tools:generate_scene",
+        target="blender",
+        cost="expensive",
     )
     registry.register(
         name="mcp.add_object",
         description="Add an object to the current Blender scene.",
         input_model=AddObjectInput,
-        handler=add_object,
+        handler="mcp_target_blender.tools:add_object",
+        target="blender",
     )
     registry.register(
         name="mcp.generate_texture",
         description="Generate a texture for an object.",
         input_model=GenerateTextureInput,
-        handler=generate_texture,
+        handler="mcp_target_blender.tools:generate_texture",
+        target="blender",
+        cost="expensive",
     )
     registry.register(
         name="mcp.export_asset",
         description="Export an asset from Blender.",
         input_model=ExportAssetInput,
-        handler=export_asset,
+        handler="mcp_target_blender.tools:export_asset",
+        target="blender",
+        path_fields=("filepath",),
     )
@@ -0,0 +1,279 @@
+"""
+Procedural texture synthesis for generate_texture.
+
+Patterns are built from seeded, tiling noise (see mcp_core.procedural) as
+whole-image numpy operations and come out as RGBA arrays that Blender
+writes into an image with a single ``pixels.foreach_set``. Every pattern
+tiles seamlessly over the texture. Generated textures are cached by
+(pattern, seed, resolution), in memory and, with the result cache enabled,
+on disk up to ``cache.texture_max_bytes``.
+"""
+import os
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+
+import numpy as np
+from mcp_core.config.settings import settings
+from mcp_core.procedural import fbm
+
+# Named resolutions accepted in settings (blender.asset_processing.texture_resolution)
+RESOLUTIONS = {"1K": 1024, "2K": 2048, "4K": 4096, "8K": 8192}
+
+# Normal map slope per unit of height change across the whole texture
+NORMAL_STRENGTH = 0.1
+
+
+def resolution(value: str | int) -> int:
+    """Parse a texture resolution such as "4K" or "2048" into pixels per side."""
+    text = str(value).strip().upper()
+    if text in RESOLUTIONS:
+        return RESOLUTIONS[text]
+    try:
+        size = int(text)
+    except ValueError:
+        raise ValueError(f"Invalid texture resolution: {value!r}") from None
+    if size < 1:
+        raise ValueError(f"Invalid texture resolution: {value!r}")
+    return size
+
+
+def _grid(size: int) -> tuple[np.ndarray, np.ndarray]:
+    """Texture-space coordinates in [0, 1) of the pixel columns and rows."""
+    coords = np.arange(size, dtype=np.float64) / size
+    return coords, coords
+
+
+def _noise(size: int, seed: int, frequency: int = 4, octaves: int = 6) -> np.ndarray:
+    xs, ys = _grid(size)
+    return fbm(xs, ys, seed, octaves=octaves, frequency=frequency, tile=True)
+
+
+def _height_noise(size: int, seed: int) -> np.ndarray:
+    return _noise(size, seed) * 0.5 + 0.5
+
+
+def _height_marble(size: int, seed: int) -> np.ndarray:
+    xs, _ = _grid(size)
+    veins = np.sin(2 * np.pi * (3 * xs[None, :] + 1.5 * _noise(size, seed, frequency=2)))
+    return 1.0 - np.abs(veins) ** 0.5
+
+
+def _height_wood(size: int, seed: int) -> np.ndarray:
+    _, ys = _grid(size)
+    rings = 12 * ys[:, None] + 0.6 * _noise(size, seed, frequency=2, octaves=3)
+    grain = 0.1 * _noise(size, seed + 1, frequency=16, octaves=2)
+    return (rings - np.floor(rings)) ** 2 * 0.9 + grain + 0.05
+
+
+def _height_checker(size: int, seed: int) -> np.ndarray:
+    xs, ys = _grid(size)
+    cells = np.floor(xs * 8).astype(np.int64)[None, :] + np.floor(ys * 8).astype(np.int64)[:, None]
+    checker: np.ndarray = (cells % 2).astype(np.float32) * 0.9 + 0.05 * _height_noise(size, seed)
+    return checker
+
+
+def _height_bricks(size: int, seed: int, rows: int = 8, columns: int = 4, mortar: float = 0.06) -> np.ndarray:
+    xs, ys = _grid(size)
+    v = ys * rows
+    row = np.floor(v).astype(np.int64)
+    # Odd rows are offset by half a brick
+    u = xs[None, :] * columns + 0.5 * (row % 2)[:, None]
+    fu = u - np.floor(u)
+    fv = (v - row)[:, None]
+    in_brick = (fu > mortar * 0.5) & (fu < 1 - mortar * 0.5) & (fv > mortar) & (fv < 1 - mortar)
+    return np.where(in_brick, 0.8, 0.1) + 0.15 * _height_noise(size, seed)
+
+
+# Height field and (low, high) colour ramp per pattern
+PATTERNS: dict[str, tuple[Callable[[int, int], np.ndarray], tuple[tuple[float, ...], tuple[float, ...]]]] = {
+    "noise": (_height_noise, ((0.15, 0.15, 0.15), (0.85, 0.85, 0.85))),
+    "marble": (_height_marble, ((0.3, 0.3, 0.35), (0.95, 0.94, 0.9))),
+    "wood": (_height_wood, ((0.55, 0.35, 0.18), (0.3, 0.17, 0.08))),
+    "checker": (_height_checker, ((0.1, 0.1, 0.1), (0.9, 0.9, 0.9))),
+    "bricks": (_height_bricks, ((0.6, 0.58, 0.55), (0.58, 0.24, 0.15))),
+}
+
+
+def height(pattern: str, size: int, seed: int = 0) -> np.ndarray:
+    """Return the pattern's height field (size x size float32 in [0, 1])."""
+    if pattern not in PATTERNS:
+        raise ValueError(f"Unknown texture pattern: {pattern}")
+    h = PATTERNS[pattern][0](size, seed)
+    clipped: np.ndarray = np.clip(h, 0.0, 1.0).astype(np.float32)
+    return clipped
+
+
+def colorize(pattern: str, h: np.ndarray) -> np.ndarray:
+    """Map a height field through the pattern's colour ramp to uint8 RGBA."""
+    low, high = (np.asarray(c, dtype=np.float32) for c in PATTERNS[pattern][1])
+    # 256-entry RGBA lookup table instead of per-pixel float blending
+    ramp = np.linspace(0.0, 1.0, 256, dtype=np.float32)[:, None]
+    lut = np.full((256, 4), 255, dtype=np.uint8)
+    lut[:, :3] = np.rint((low + ramp * (high - low)) * 255)
+    rgba: np.ndarray = lut[np.rint(h * 255).astype(np.uint8)]
+    return rgba
+
+
+def normal_map(h: np.ndarray, strength: float = NORMAL_STRENGTH) -> np.ndarray:
+    """
+    Tangent-space normal map (uint8 RGBA, OpenGL convention) from a height
+    field. Differences wrap around the edges, so tiling heights give tiling
+    normals.
+    """
+    size = h.shape[1]
+    # Central differences in height per texture width
+    dx = (np.roll(h, -1, axis=1) - np.roll(h, 1, axis=1)) * (size * 0.5 * strength)
+    dy = (np.roll(h, -1, axis=0) - np.roll(h, 1, axis=0)) * (h.shape[0] * 0.5 * strength)
+    inv = 1.0 / np.sqrt(dx * dx + dy * dy + 1.0)
+    rgba = np.empty(h.shape + (4,), dtype=np.uint8)
+    rgba[..., 0] = np.rint((0.5 - 0.5 * dx * inv) * 255)
+    rgba[..., 1] = np.rint((0.5 - 0.5 * dy * inv) * 255)
+    rgba[..., 2] = np.rint((0.5 + 0.5 * inv) * 255)
+    rgba[..., 3] = 255
+    return rgba
+
+
+def to_pixels(rgba: np.ndarray) -> np.ndarray:
+    """Convert uint8 RGBA to the flat float32 layout of Blender's Image.pixels."""
+    pixels = rgba.reshape(-1).astype(np.float32)
+    pixels *= 1.0 / 255.0
+    return pixels
+
+
+class TextureCache:
+    """
+    Generated textures keyed by (pattern, seed, resolution), kept in memory
+    up to max_bytes and, when the result cache is enabled, as .npy files
+    under ``<cache root>/textures`` up to disk_max_bytes. Both tiers evict
+    least recently used first.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 256 * 1024 * 1024,
+        root: Path | None = None,
+        disk_max_bytes: int | None = None,
+    ):
+        self.max_bytes = max_bytes
+        self._root = root
+        self._disk_max_bytes = disk_max_bytes
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[tuple[str, int, int], np.ndarray] = OrderedDict()
+        self._bytes = 0
+        # File name -> size in bytes, ordered from least to most recently used
+        self._disk_index: OrderedDict[str, int] | None = None
+        self._disk_bytes = 0
+
+    @property
+    def root(self) -> Path:
+        return (self._root or settings.cache.root) / "textures"
+
+    @property
+    def disk_max_bytes(self) -> int:
+        return self._disk_max_bytes if self._disk_max_bytes is not None else settings.cache.texture_max_bytes
+
+    def _path(self, key: tuple[str, int, int]) -> Path:
+        return self.root / f"{key[0]}_{key[1]}_{key[2]}.npy"
+
+    def get(self, key: tuple[str, int, int]) -> np.ndarray | None:
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if settings.cache.enabled:
+            path = self._path(key)
+            try:
+                value: np.ndarray = np.load(path)
+            except FileNotFoundError:
+                return None
+            with self._lock:
+                index = self._load_disk_index()
+                if path.name in index:
+                    index.move_to_end(path.name)
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+            self._remember(key, value)
+            return value
+        return None
+
+    def put(self, key: tuple[str, int, int], value: np.ndarray) -> None:
+        self._remember(key, value)
+        if settings.cache.enabled:
+            path = self._path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp.npy")
+            np.save(tmp, value)
+            tmp.replace(path)
+            size = path.stat().st_size
+            with self._lock:
+                index = self._load_disk_index()
+                self._disk_bytes += size - index.get(path.name, 0)
+                index[path.name] = size
+                index.move_to_end(path.name)
+                # The texture just written stays even when it alone exceeds the budget
+                while len(index) > 1 and self._disk_bytes > self.disk_max_bytes:
+                    name, evicted = index.popitem(last=False)
+                    self._disk_bytes -= evicted
+                    (self.root / name).unlink(missing_ok=True)
+
+    def _load_disk_index(self) -> OrderedDict[str, int]:
+        if self._disk_index is None:
+            entries: list[tuple[float, str, int]] = []
+            if self.root.exists():
+                for path in self.root.glob("*.npy"):
+                    if path.name.endswith(".tmp.npy"):
+                        continue
+                    try:
+                        stat = path.stat()
+                    except OSError:
+                        continue
+                    entries.append((stat.st_mtime, path.name, stat.st_size))
+            entries.sort()
+            self._disk_index = OrderedDict((name, size) for _, name, size in entries)
+            self._disk_bytes = sum(self._disk_index.values())
+        return self._disk_index
+
+    def _remember(self, key: tuple[str, int, int], value: np.ndarray) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._bytes -= self._entries.pop(key).nbytes
+            if value.nbytes > self.max_bytes:
+                return
+            self._entries[key] = value
+            self._bytes += value.nbytes
+            while self._bytes > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.nbytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+texture_cache = TextureCache()
+
+
+def texture(pattern: str, seed: int, size: int, normal: bool = False) -> tuple[np.ndarray, np.ndarray | None]:
+    """
+    Return the pattern's colour texture and, with normal=True, its normal
+    map, as uint8 RGBA. Misses are generated from one shared height field
+    and cached.
+    """
+    color_key = (pattern, seed, size)
+    normal_key = (f"{pattern}_normal", seed, size)
+    color = texture_cache.get(color_key)
+    normals = texture_cache.get(normal_key) if normal else None
+    if color is None or (normal and normals is None):
+        h = height(pattern, size, seed)
+        if color is None:
+            color = colorize(pattern, h)
+            texture_cache.put(color_key, color)
+        if normal and normals is None:
+            normals = normal_map(h)
+            texture_cache.put(normal_key, normals)
+    return color, normals
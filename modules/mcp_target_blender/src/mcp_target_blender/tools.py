@@ -1,12 +1,14 @@
 import asyncio
 import json
+import threading
 from datetime import datetime
+from typing import Any
 
-import httpx
-from mcp_core.ai import PromptTemplate, create_ai_client
+from mcp_core.ai import PromptTemplate, create_ai_client, generate_image_artifacts
 from mcp_core.ai.models import ImageGenerationRequest
 from mcp_core.config.settings import settings
 from mcp_core.observability.context import get_current_context
+from mcp_core.storage import build_cache
 from mcp_protocol.models import (
     AddObjectInput,
     Artifact,
@@ -21,15 +23,19 @@ from mcp_protocol.models import (
 
 from .transport import StdioTransport
 
-# Global transport instance
-_transport: StdioTransport | None = None
+# One Blender session per target concurrency slot, so requests holding
+# different slots (batch.target_concurrency["blender"] > 1) run in parallel
+_transports: dict[int, StdioTransport] = {}
+_transports_lock = threading.Lock()
 
 def get_transport() -> StdioTransport:
-    global _transport
-    if _transport is None:
-        # TODO: Get blender path from config
-        _transport = StdioTransport()
-    return _transport
+    """The Blender session of the concurrency slot the current request holds."""
+    slot = get_current_context().target_slot
+    with _transports_lock:
+        if slot not in _transports:
+            # TODO: Get blender path from config
+            _transports[slot] = StdioTransport()
+        return _transports[slot]
 
 
 SCENE_GENERATION_PROMPT = PromptTemplate(
@@ -153,10 +159,72 @@ def add_object(input: AddObjectInput) -> ToolResult | ToolError:
         result=result_data
     )
 
+def _procedural_texture(input: GenerateTextureInput, pattern: str) -> ToolResult | ToolError:
+    """
+    Synthesize a tiling pattern locally and write its pixels into a Blender
+    image in one foreach_set (the pixels travel through shared memory).
+    """
+    ctx = get_current_context()
+
+    def error(code: str, message: str) -> ToolError:
+        return ToolError(
+            tool="generate_texture",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(code=code, message=message),
+        )
+
+    try:
+        from . import textures
+    except ImportError:
+        return error(
+            "DEPENDENCY_MISSING", "Procedural textures require numpy (pip install 'ue5-mcp[procedural]')."
+        )
+
+    try:
+        size = textures.resolution(input.resolution or settings.blender.asset_processing.texture_resolution)
+    except ValueError as e:
+        return error("VALIDATION_ERROR", str(e))
+    seed = input.seed if input.seed is not None else settings.blender.scene_generation.default_seed
+
+    if input.dry_run:
+        result_data = {
+            "message": f"Would generate {size}x{size} '{pattern}' texture for '{input.object_name}'",
+            "pattern": pattern,
+            "seed": seed,
+            "resolution": size,
+        }
+    else:
+        color, normals = textures.texture(pattern, seed, size, normal=input.normal_map)
+        payload = {
+            **input.model_dump(),
+            "seed": seed,
+            "width": size,
+            "height": size,
+            "pixels": textures.to_pixels(color),
+        }
+        if normals is not None:
+            payload["normal_pixels"] = textures.to_pixels(normals)
+        try:
+            result_data = get_transport().send_command("generate_texture", payload).get("data", {})
+        except Exception as e:
+            return error("EXECUTION_ERROR", str(e))
+        result_data.update(pattern=pattern, seed=seed, resolution=size)
+
+    return ToolResult(
+        tool="generate_texture",
+        request_id=ctx.request_id or "",
+        run_id=ctx.run_id or "",
+        result=result_data
+    )
+
 def generate_texture(input: GenerateTextureInput) -> ToolResult | ToolError:
     """
     Generate a texture for an object.
     """
+    if input.pattern:
+        return _procedural_texture(input, input.pattern)
+
     ctx = get_current_context()
 
     if not input.dry_run:
@@ -174,39 +242,18 @@ def generate_texture(input: GenerateTextureInput) -> ToolResult | ToolError:
                         size="1024x1024"
                     )
 
-                    # Need to wrap in asyncio.run since we are in sync context
-                    response = asyncio.run(ai_client.provider.generate_image(req))
-
-                    if response.urls:
-                        image_url = response.urls[0]
-
-                        # Download the image
-                        async def download_image():
-                            async with httpx.AsyncClient() as client:
-                                resp = await client.get(image_url)
-                                resp.raise_for_status()
-                                return resp.content
-
-                        image_data = asyncio.run(download_image())
-
-                        # Save to artifacts
-                        filename = f"texture_{ctx.run_id}_{datetime.now().strftime('%H%M%S')}.png"
-
-                        # Ensure artifacts dir exists
-                        artifacts_dir = settings.artifacts.root
-                        artifacts_dir.mkdir(parents=True, exist_ok=True)
-
-                        texture_path = str(artifacts_dir / filename)
-                        with open(texture_path, "wb") as f:
-                            f.write(image_data)
-
-                        # Create artifact object
-                        generated_artifacts.append(Artifact(
-                            type="image/png",
-                            uri=f"file://{texture_path}",
-                            content="",
-                            metadata={"source": "ai_generation", "prompt": input.texture_type}
-                        ))
+                    # Served from the image cache when the prompt repeats; new images
+                    # are streamed into the run directory
+                    artifacts = generate_image_artifacts(
+                        ai_client,
+                        req,
+                        ctx.run_id or "local",
+                        f"texture_{input.object_name}_{input.texture_type}.png",
+                        metadata={"source": "ai_generation", "prompt": input.texture_type},
+                    )
+                    if artifacts:
+                        texture_path = artifacts[0].uri
+                        generated_artifacts.extend(artifacts)
 
                 except Exception as e:
                      print(f"AI texture generation failed: {e}")
@@ -250,17 +297,62 @@ def generate_texture(input: GenerateTextureInput) -> ToolResult | ToolError:
         result=result_data
     )
 
+def _export_fingerprint(transport: StdioTransport, input: ExportAssetInput) -> str:
+    """Fingerprint everything that determines the exported file's contents."""
+    state = transport.send_command("object_fingerprint", {"object_name": input.object_name}).get("data", {})
+    source_file = state.get("source_file")
+    return build_cache.fingerprint(
+        object_state=state.get("fingerprint"),
+        source_hash=build_cache.file_hash(source_file) if source_file else None,
+        params=input.model_dump(mode="json", exclude={"dry_run", "overwrite"}),
+    )
+
+
+def _run_export(input: ExportAssetInput, run_id: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Export via Blender, reusing the previous export when incremental builds
+    are enabled and the fingerprinted inputs and output file are unchanged.
+    Returns the result data and provenance entries for the export manifest.
+    """
+    transport = get_transport()
+    if not build_cache.enabled:
+        response = transport.send_command("export_asset", input.model_dump())
+        return response.get("data", {}), {}
+
+    fingerprint = _export_fingerprint(transport, input)
+    record = build_cache.get("export", fingerprint)
+    if record and build_cache.file_hash(input.filepath) == record.get("export_hash"):
+        provenance = {
+            "fingerprint": fingerprint,
+            "export_hash": record["export_hash"],
+            "reused": True,
+            "source_run_id": record.get("run_id"),
+        }
+        return {**record.get("result", {}), "reused": True}, provenance
+
+    response = transport.send_command("export_asset", input.model_dump())
+    result_data = response.get("data", {})
+    export_hash = build_cache.file_hash(input.filepath)
+    if export_hash:
+        build_cache.put("export", fingerprint, {
+            "export_path": input.filepath,
+            "export_hash": export_hash,
+            "run_id": run_id,
+            "result": result_data,
+        })
+    return result_data, {"fingerprint": fingerprint, "export_hash": export_hash, "reused": False}
+
+
 def export_asset(input: ExportAssetInput) -> ToolResult | ToolError:
     """
     Export an asset from Blender.
     """
     ctx = get_current_context()
 
+    build_provenance: dict[str, Any] = {}
     if not input.dry_run:
         try:
-            transport = get_transport()
-            response = transport.send_command("export_asset", input.model_dump())
-            result_data = response.get("data", {})
+            result_data, build_provenance = _run_export(input, ctx.run_id or "")
         except Exception as e:
             return ToolError(
                 tool="export_asset",
@@ -282,7 +374,8 @@ def export_asset(input: ExportAssetInput) -> ToolResult | ToolError:
         provenance={
             "tool": "mcp.export_asset",
             "run_id": ctx.run_id or "",
-            "timestamp": datetime.utcnow().isoformat()
+            "timestamp": datetime.utcnow().isoformat(),
+            **build_provenance,
         }
     )
 
@@ -0,0 +1,135 @@
+"""
+Shared-memory side channel for bulk buffers sent to Blender.
+
+Buffers in command params (anything exposing the buffer protocol:
+``array.array``, ``memoryview``, ``bytes``, numpy arrays) are copied once into
+a shared memory block and replaced in the command by a reference:
+
+    {"$buffer": {"name": str, "offset": int, "nbytes": int, "format": str, "count": int}}
+
+blender_server maps the block and passes a typed memoryview straight to
+``foreach_set``, so neither side encodes the data element by element. Where
+shared memory is unavailable the block is a memory-mapped temporary file,
+referenced by ``path`` instead of ``name``.
+"""
+from __future__ import annotations
+
+import array
+import mmap
+import os
+import sys
+import tempfile
+from collections.abc import Callable
+from multiprocessing import shared_memory
+from typing import Any, Literal, TypeGuard, get_args
+
+BUFFER_KEY = "$buffer"
+
+# Buffers start on this byte boundary within the block
+_ALIGN = 16
+
+# Native single-item formats memoryview.cast accepts on both sides
+_Format = Literal["b", "B", "h", "H", "i", "I", "l", "L", "q", "Q", "f", "d", "?"]
+
+
+def _is_format(fmt: str) -> TypeGuard[_Format]:
+    return fmt in get_args(_Format)
+
+
+def _as_view(value: Any) -> memoryview[Any] | None:
+    """Return a contiguous memoryview for buffer-like values, else None."""
+    # numpy arrays are recognised without importing numpy
+    if not isinstance(value, (bytes, bytearray, memoryview, array.array)) and not hasattr(
+        value, "__array_interface__"
+    ):
+        return None
+    view = memoryview(value)
+    # Only native single-item formats can be cast back on the Blender side
+    fmt = view.format.lstrip("@=" + ("<" if sys.byteorder == "little" else ""))
+    if not _is_format(fmt):
+        raise ValueError(f"Unsupported buffer format: {view.format!r}")
+    if not view.c_contiguous:
+        return memoryview(view.tobytes()).cast(fmt)
+    return view.cast("B").cast(fmt)
+
+
+class SharedBuffers:
+    """One command's shared block; `close` releases it once Blender has replied."""
+
+    def __init__(self, views: list[memoryview[Any]]):
+        offsets = []
+        size = 0
+        for view in views:
+            size = -(-size // _ALIGN) * _ALIGN
+            offsets.append(size)
+            size += view.nbytes
+
+        self._shm: shared_memory.SharedMemory | None = None
+        self._mmap: mmap.mmap | None = None
+        self._path: str | None = None
+        try:
+            self._shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+            shm_block = self._shm.buf
+            if shm_block is None:
+                raise OSError("Shared memory block is not mapped")
+            block = shm_block
+            location = {"name": self._shm.name}
+        except OSError:
+            fd, self._path = tempfile.mkstemp(prefix="mcp_buffers_")
+            with os.fdopen(fd, "r+b") as f:
+                f.truncate(max(size, 1))
+                self._mmap = mmap.mmap(f.fileno(), max(size, 1))
+            block = memoryview(self._mmap)
+            location = {"path": self._path}
+
+        self.refs = []
+        for view, offset in zip(views, offsets, strict=True):
+            block[offset:offset + view.nbytes] = view.cast("B")
+            self.refs.append({BUFFER_KEY: {
+                **location,
+                "offset": offset,
+                "nbytes": view.nbytes,
+                "format": view.format,
+                "count": view.nbytes // view.itemsize,
+            }})
+        if self._mmap is not None:
+            block.release()
+
+    def close(self) -> None:
+        if self._shm is not None:
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._path is not None:
+            os.unlink(self._path)
+            self._path = None
+
+
+def _walk(value: Any, visit: Callable[[memoryview[Any]], Any]) -> Any:
+    """Rebuild value with every buffer replaced by visit(view), in traversal order."""
+    view = _as_view(value)
+    if view is not None:
+        return visit(view)
+    if isinstance(value, dict):
+        return {k: _walk(v, visit) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_walk(v, visit) for v in value]
+    return value
+
+
+def share(params: Any) -> tuple[Any, SharedBuffers | None]:
+    """
+    Move every buffer in params into one shared block. Returns params with
+    the buffers replaced by references, and the block (None when params hold
+    no buffers) for the caller to close after the command completes.
+    """
+    views: list[memoryview[Any]] = []
+    _walk(params, views.append)
+    if not views:
+        return params, None
+    buffers = SharedBuffers(views)
+    refs = iter(buffers.refs)
+    return _walk(params, lambda _: next(refs)), buffers
@@ -2,8 +2,12 @@ import json
 import os
 import subprocess
 import sys
-from typing import Any, cast
+import threading
+from typing import IO, Any, cast
 
+from mcp_protocol import wire
+
+from . import shm
 from .base import BlenderTransport
 
 
@@ -11,10 +15,21 @@ class StdioTransport(BlenderTransport):
     """
     Transport implementation using standard I/O (subprocess).
     Launches Blender in background mode and communicates via stdin/stdout.
+
+    Messages are newline-delimited JSON. The first time a request is large
+    enough to compress, the wire format is negotiated with a ``ping``
+    handshake; from then on large messages are sent as length-prefixed
+    frames in that format (see mcp_protocol.wire). Buffers in params
+    (arrays, memoryviews, bytes) bypass the pipe entirely: they are placed in
+    shared memory and referenced by name (see shm).
     """
     def __init__(self, blender_path: str = "blender"):
         self.blender_path = blender_path
         self._process: subprocess.Popen | None = None
+        # One request/response exchange at a time over the shared pipes
+        self._lock = threading.Lock()
+        # Negotiated frame format; None until the handshake has run
+        self.wire_format: wire.WireFormat | None = None
 
     def connect(self) -> None:
         """
@@ -49,9 +64,8 @@ class StdioTransport(BlenderTransport):
                 stdin=subprocess.PIPE,
                 stdout=subprocess.PIPE,
                 stderr=sys.stderr, # Forward stderr for logging
-                text=True,
-                bufsize=1
             )
+            self.wire_format = None
         except FileNotFoundError:
             raise RuntimeError(f"Blender executable not found at '{self.blender_path}'. Please ensure Blender is installed and in PATH, or configure the path.")
 
@@ -71,12 +85,16 @@ class StdioTransport(BlenderTransport):
         """
         Send a JSON command to Blender's stdin and read response from stdout.
         """
+        with self._lock:
+            return self._send_command(command, params)
+
+    def _send_command(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
         if not self._process:
             self.connect()
 
-        if not self._process or not self._process.stdin or not self._process.stdout:
-             raise RuntimeError("Blender process not connected")
+        stdin, _ = self._pipes()
 
+        params, buffers = shm.share(params)
         request = {
             "command": command,
             "params": params,
@@ -84,20 +102,61 @@ class StdioTransport(BlenderTransport):
         }
 
         try:
-            self._process.stdin.write(json.dumps(request) + "\n")
-            self._process.stdin.flush()
-
-            response_line = self._process.stdout.readline()
-            if not response_line:
-                raise RuntimeError("Blender process closed connection unexpectedly")
-
-            response = json.loads(response_line)
-
-            if response.get("status") == "error":
-                raise RuntimeError(f"Blender error: {response.get('error')}")
-
-            return cast(dict[str, Any], response)
+            line = json.dumps(request).encode("utf-8")
+            if len(line) >= wire.MIN_COMPRESS_BYTES:
+                if self.wire_format is None:
+                    self.wire_format = self._negotiate()
+                if self.wire_format != wire.JSON:
+                    self._write_frame(request, self.wire_format)
+                    return self._read_response()
+            stdin.write(line + b"\n")
+            stdin.flush()
+            return self._read_response()
 
         except BrokenPipeError:
             self._process = None
             raise RuntimeError("Blender process pipe broken")
+        finally:
+            # Blender has finished with the buffers once it has replied
+            if buffers is not None:
+                buffers.close()
+
+    def _pipes(self) -> tuple[IO[bytes], IO[bytes]]:
+        """The running process's stdin and stdout."""
+        if not self._process or not self._process.stdin or not self._process.stdout:
+            raise RuntimeError("Blender process not connected")
+        return self._process.stdin, self._process.stdout
+
+    def _negotiate(self) -> wire.WireFormat:
+        """Exchange wire capabilities; servers that predate the handshake stay on JSON."""
+        stdin, _ = self._pipes()
+        request = {"command": "ping", "params": {"wire": wire.capabilities()}, "id": 0}
+        stdin.write(json.dumps(request).encode("utf-8") + b"\n")
+        stdin.flush()
+        return wire.negotiate(self._read_response().get("wire"))
+
+    def _write_frame(self, message: dict[str, Any], fmt: wire.WireFormat) -> None:
+        stdin, _ = self._pipes()
+        payload, used = wire.dumps(message, fmt)
+        stdin.write(wire.frame_header(used, len(payload)) + payload)
+        stdin.flush()
+
+    def _read_response(self) -> dict[str, Any]:
+        _, stdout = self._pipes()
+        line = stdout.readline()
+        if not line:
+            raise RuntimeError("Blender process closed connection unexpectedly")
+
+        if line.startswith(wire.FRAME_MARKER):
+            fmt, length = wire.parse_frame_header(line)
+            payload = stdout.read(length)
+            if len(payload) < length:
+                raise RuntimeError("Blender process closed connection unexpectedly")
+            response = wire.loads(payload, fmt)
+        else:
+            response = json.loads(line)
+
+        if response.get("status") == "error":
+            raise RuntimeError(f"Blender error: {response.get('error')}")
+
+        return cast(dict[str, Any], response)
@@ -14,9 +14,23 @@ Requirements:
     - Python 3.9+ (bundled with UE5)
 """
 
+from __future__ import annotations
+
+import base64
+import bisect
+import csv
+import glob
+import gzip
 import json
 import os
+import struct
+import sys
+import tempfile
 import threading
+import time
+import zlib
+from array import array
+from collections import defaultdict, deque
 from http.server import BaseHTTPRequestHandler, HTTPServer
 from typing import Any
 
@@ -28,6 +42,17 @@ except ImportError:
     IN_UNREAL = False
     print("Warning: Not running inside Unreal Engine. Some features will be unavailable.")
 
+# Optional wire formats, used when installed in the editor's Python
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 
 # Configuration
 HOST = os.environ.get("MCP_SERVER_HOST", "localhost")
@@ -59,7 +84,257 @@ def log_error(message: str) -> None:
         print(f"[MCP ERROR] {message}")
 
 
+# Wire Formats
+# Mirrors mcp_protocol.wire: JSON and gzip always, msgpack and zstd when installed
+
+WIRE_CONTENT_TYPES = {"json": "application/json", "msgpack": "application/msgpack"}
+# Responses smaller than this are not compressed
+WIRE_MIN_COMPRESS_BYTES = 16 * 1024
+
+
+def wire_capabilities() -> dict[str, list[str]]:
+    """Encodings and compressions this server accepts, best first."""
+    return {
+        "encodings": (["msgpack"] if msgpack is not None else []) + ["json"],
+        "compression": (["zstd"] if zstandard is not None else []) + ["gzip"],
+    }
+
+
+def _wire_encoding(content_type: str | None) -> str:
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    for name, value in WIRE_CONTENT_TYPES.items():
+        if value == media_type:
+            return name
+    return "json"
+
+
+def wire_decode(body: bytes, content_type: str | None, content_encoding: str | None) -> Any:
+    """Decode a request body according to its Content-Type and Content-Encoding."""
+    compression = (content_encoding or "identity").strip().lower()
+    if compression == "gzip":
+        body = gzip.decompress(body)
+    elif compression == "zstd" and zstandard is not None:
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif compression != "identity":
+        raise ValueError(f"Unsupported Content-Encoding: {compression}")
+
+    encoding = _wire_encoding(content_type)
+    if encoding == "msgpack":
+        if msgpack is None:
+            raise ValueError("msgpack request received but msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    return json.loads(body)
+
+
+def wire_encode(data: Any, accept: str | None, accept_encoding: str | None) -> tuple[bytes, dict[str, str]]:
+    """Encode a response in the best format the client accepts; returns body and headers."""
+    accepted = {part.split(";")[0].strip().lower() for part in (accept or "").split(",")}
+    if msgpack is not None and WIRE_CONTENT_TYPES["msgpack"] in accepted:
+        body, headers = msgpack.packb(data, use_bin_type=True), {"Content-Type": WIRE_CONTENT_TYPES["msgpack"]}
+    else:
+        body, headers = json.dumps(data).encode("utf-8"), {"Content-Type": WIRE_CONTENT_TYPES["json"]}
+
+    if len(body) >= WIRE_MIN_COMPRESS_BYTES:
+        codings = {part.split(";")[0].strip().lower() for part in (accept_encoding or "").split(",")}
+        if zstandard is not None and "zstd" in codings:
+            body, headers["Content-Encoding"] = zstandard.ZstdCompressor(level=3).compress(body), "zstd"
+        elif "gzip" in codings:
+            body, headers["Content-Encoding"] = gzip.compress(body, compresslevel=5), "gzip"
+    return body, headers
+
+
+# Asset Index
+
+# Asset Registry tags kept in the index for tag queries
+INDEXED_TAGS = ("ParentClass", "NativeParentClass", "BlueprintType")
+
+
+def _asset_entry(asset_data: Any) -> dict[str, Any]:
+    """Convert an AssetData into an index entry."""
+    package = str(asset_data.package_name)
+    name = str(asset_data.asset_name)
+    # UE 5.1+ identifies classes by path; older versions by name
+    class_path = getattr(asset_data, "asset_class_path", None)
+    class_name = str(class_path.asset_name) if class_path is not None else str(asset_data.asset_class)
+    tags = {}
+    for tag in INDEXED_TAGS:
+        value = asset_data.get_tag_value(tag)
+        if value:
+            tags[tag] = str(value)
+    return {"path": f"{package}.{name}", "name": name, "class": class_name, "tags": tags}
+
+
+class AssetIndex:
+    """
+    In-memory snapshot of the Asset Registry indexed by path, name and class.
+
+    Built once on first use, then kept current from registry events (where
+    the editor exposes them) and from this server's own imports, so commands
+    do not rescan the registry.
+    """
+
+    def __init__(self, root: str = "/Game"):
+        self.root = root
+        self._lock = threading.RLock()
+        self._built = False
+        self._assets: dict[str, dict[str, Any]] = {}
+        self._paths: list[str] = []  # sorted, for prefix queries
+        self._by_class: dict[str, set[str]] = defaultdict(set)
+        self._by_name: dict[str, set[str]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._assets)
+
+    @property
+    def built(self) -> bool:
+        return self._built
+
+    def build(self, entries: list[dict[str, Any]]) -> None:
+        with self._lock:
+            self._assets = {entry["path"]: entry for entry in entries}
+            self._paths = sorted(self._assets)
+            self._by_class = defaultdict(set)
+            self._by_name = defaultdict(set)
+            for entry in entries:
+                self._by_class[entry["class"]].add(entry["path"])
+                self._by_name[entry["name"]].add(entry["path"])
+            self._built = True
+
+    def ensure_built(self, refresh: bool = False) -> None:
+        """Scan the Asset Registry if the index has not been built yet (or on refresh)."""
+        if self._built and not refresh:
+            return
+        registry = unreal.AssetRegistryHelpers.get_asset_registry()
+        first_build = not self._built
+        started = time.monotonic()
+        self.build([_asset_entry(a) for a in registry.get_assets_by_path(self.root, recursive=True)])
+        log(f"Indexed {len(self)} assets in {time.monotonic() - started:.2f}s")
+        if first_build and not self.attach(registry):
+            log("Asset Registry events unavailable; pass refresh to query_assets to rescan")
+
+    def add(self, entry: dict[str, Any]) -> None:
+        with self._lock:
+            if entry["path"] in self._assets:
+                self.remove(entry["path"])
+            self._assets[entry["path"]] = entry
+            bisect.insort(self._paths, entry["path"])
+            self._by_class[entry["class"]].add(entry["path"])
+            self._by_name[entry["name"]].add(entry["path"])
+
+    def remove(self, path: str) -> None:
+        with self._lock:
+            entry = self._assets.pop(path, None)
+            if entry is None:
+                return
+            i = bisect.bisect_left(self._paths, path)
+            if i < len(self._paths) and self._paths[i] == path:
+                del self._paths[i]
+            self._by_class[entry["class"]].discard(path)
+            self._by_name[entry["name"]].discard(path)
+
+    def rename(self, old_path: str, entry: dict[str, Any]) -> None:
+        with self._lock:
+            self.remove(old_path)
+            self.add(entry)
+
+    def find(self, name: str, class_name: str | None = None) -> list[str]:
+        """Return the paths of assets with the given name (and class)."""
+        with self._lock:
+            paths = self._by_name.get(name, set())
+            if class_name:
+                paths = paths & self._by_class.get(class_name, set())
+            return sorted(paths)
+
+    def query(
+        self,
+        prefix: str | None = None,
+        class_name: str | None = None,
+        tag: str | None = None,
+        limit: int | None = None,
+    ) -> tuple[list[dict[str, Any]], int]:
+        """
+        Return (matches, total) for assets under a path prefix, of a class,
+        and with a tag (``key`` or ``key=value``). At most `limit` are returned.
+        """
+        tag_key, _, tag_value = (tag or "").partition("=")
+        with self._lock:
+            if prefix:
+                start = bisect.bisect_left(self._paths, prefix)
+                end = bisect.bisect_left(self._paths, prefix + "\U0010ffff")
+                paths = self._paths[start:end]
+            else:
+                paths = self._paths
+            if class_name:
+                in_class = self._by_class.get(class_name, set())
+                paths = [p for p in paths if p in in_class]
+            matches = []
+            for path in paths:
+                entry = self._assets[path]
+                if tag_key and (tag_key not in entry["tags"] or (tag_value and entry["tags"][tag_key] != tag_value)):
+                    continue
+                matches.append(entry)
+        return (matches[:limit] if limit is not None else matches), len(matches)
+
+    def attach(self, registry: Any) -> bool:
+        """Follow asset added/removed/renamed events where the editor exposes them."""
+        delegates = [getattr(registry, name, None) for name in ("on_asset_added", "on_asset_removed", "on_asset_renamed")]
+        if not all(delegates):
+            return False
+        added, removed, renamed = delegates
+        added.add_callable(lambda asset_data: self.add(_asset_entry(asset_data)))
+        removed.add_callable(lambda asset_data: self.remove(_asset_entry(asset_data)["path"]))
+        renamed.add_callable(lambda asset_data, old_path: self.rename(str(old_path), _asset_entry(asset_data)))
+        return True
+
+    def add_paths(self, paths: list[str]) -> None:
+        """Index assets created by this server (e.g. imports)."""
+        for path in paths:
+            asset_data = unreal.EditorAssetLibrary.find_asset_data(path)
+            if asset_data and asset_data.is_valid():
+                self.add(_asset_entry(asset_data))
+
+
+ASSET_INDEX = AssetIndex()
+
+
 # Command Handlers
+
+def _project_file() -> str | None:
+    """Path of the open project's .uproject, identifying it to the host's build cache."""
+    if not IN_UNREAL:
+        return None
+    return str(unreal.Paths.convert_relative_path_to_full(unreal.Paths.get_project_file_path()))
+
+
+def handle_asset_status(params: dict[str, Any]) -> dict[str, Any]:
+    """Report the open project and which of the given asset paths no longer exist."""
+    paths = params.get("paths", [])
+    missing = []
+    if IN_UNREAL:
+        missing = [path for path in paths if not unreal.EditorAssetLibrary.does_asset_exist(path)]
+    return {"project": _project_file(), "missing": missing}
+
+
+# Default and maximum number of assets returned by query_assets
+QUERY_ASSETS_DEFAULT_LIMIT = 1000
+
+
+def handle_query_assets(params: dict[str, Any]) -> dict[str, Any]:
+    """Query the asset index by path prefix, class and tag."""
+    if not IN_UNREAL:
+        return {"assets": [], "count": 0, "truncated": False}
+
+    ASSET_INDEX.ensure_built(refresh=params.get("refresh", False))
+    limit = params.get("limit") or QUERY_ASSETS_DEFAULT_LIMIT
+    assets, total = ASSET_INDEX.query(
+        prefix=params.get("prefix"),
+        class_name=params.get("class_name"),
+        tag=params.get("tag"),
+        limit=limit,
+    )
+    return {"assets": assets, "count": total, "truncated": total > len(assets)}
+
+
 def handle_import_asset(params: dict[str, Any]) -> dict[str, Any]:
     """Import asset from export manifest."""
     manifest_path = params.get("manifest_path", "")
@@ -90,7 +365,9 @@ def handle_import_asset(params: dict[str, Any]) -> dict[str, Any]:
 
             return {
                 "message": f"Imported asset from '{manifest_path}'",
-                "asset_path": dest_path
+                "asset_path": dest_path,
+                "imported": [str(p) for p in task.get_editor_property("imported_object_paths")],
+                "project": _project_file(),
             }
         else:
             raise FileNotFoundError(f"Manifest not found: {manifest_path}")
@@ -98,14 +375,185 @@ def handle_import_asset(params: dict[str, Any]) -> dict[str, Any]:
         return {"message": f"Imported asset from '{manifest_path}' (simulated)"}
 
 
+def _build_import_task(manifest_path: str, overwrite: bool) -> Any:
+    """Create an AssetImportTask from an export manifest."""
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    task = unreal.AssetImportTask()
+    task.filename = manifest.get("export_path", "")
+    task.destination_path = manifest.get("destination", "/Game/Imports/")
+    task.replace_existing = overwrite
+    task.automated = True
+    return task
+
+
+def handle_import_assets(params: dict[str, Any]) -> dict[str, Any]:
+    """
+    Import many export manifests with a single import_asset_tasks call,
+    so a whole kit is ingested in one editor transaction.
+    """
+    manifest_paths = params.get("manifest_paths", [])
+    overwrite = params.get("overwrite", False)
+
+    log(f"Importing {len(manifest_paths)} assets")
+
+    results: list[dict[str, Any]] = []
+    if not IN_UNREAL:
+        for manifest_path in manifest_paths:
+            results.append({"manifest_path": manifest_path, "status": "ok", "imported": []})
+        return {
+            "message": f"Imported {len(manifest_paths)} assets (simulated)",
+            "imported_count": len(results),
+            "failed_count": 0,
+            "results": results,
+            "project": None,
+        }
+
+    # Build every task up front; manifests that cannot be read fail individually
+    tasks = []
+    for manifest_path in manifest_paths:
+        try:
+            task = _build_import_task(manifest_path, overwrite)
+        except (OSError, ValueError) as e:
+            results.append({"manifest_path": manifest_path, "status": "error", "error": str(e)})
+            continue
+        tasks.append((manifest_path, task))
+        results.append({"manifest_path": manifest_path, "status": "pending"})
+
+    if tasks:
+        asset_tools = unreal.AssetToolsHelpers.get_asset_tools()
+        asset_tools.import_asset_tasks([task for _, task in tasks])
+
+    task_by_path = dict(tasks)
+    for entry in results:
+        task = task_by_path.get(entry["manifest_path"])
+        if task is None or entry["status"] != "pending":
+            continue
+        imported = [str(p) for p in task.get_editor_property("imported_object_paths")]
+        if imported:
+            entry.update(status="ok", imported=imported, asset_path=task.destination_path)
+            if ASSET_INDEX.built:
+                ASSET_INDEX.add_paths(imported)
+        else:
+            entry.update(status="error", error=f"Nothing imported from '{task.filename}'")
+
+    failed = sum(1 for entry in results if entry["status"] == "error")
+    return {
+        "message": f"Imported {len(results) - failed} of {len(results)} assets",
+        "imported_count": len(results) - failed,
+        "failed_count": failed,
+        "results": results,
+        "project": _project_file(),
+    }
+
+
+TERRAIN_LABEL = "MCP_GeneratedTerrain"
+# Largest heightmap composited into a single render target; larger terrains
+# are left for Landscape mode's tiled import
+MAX_HEIGHTMAP_IMPORT_SIZE = 8192
+
+
+def _png_chunk(kind: bytes, data: bytes) -> bytes:
+    return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+
+def _write_height_png(r16_path: str, size: list[int], png_path: str) -> None:
+    """
+    Re-encode a .r16 tile as an 8-bit RGBA PNG carrying the height's high
+    byte in R and low byte in G, the packing the render-target heightmap
+    import decodes back to 16 bits.
+    """
+    width, height = size
+    with open(r16_path, "rb") as f:
+        raw = f.read()
+    samples = width * height
+    if len(raw) != 2 * samples:
+        raise ValueError(f"Heightmap tile '{r16_path}' does not hold {width}x{height} samples")
+
+    # .r16 is little-endian: odd bytes are the high bytes
+    pixels = bytearray(4 * samples)
+    pixels[0::4] = raw[1::2]
+    pixels[1::4] = raw[0::2]
+    pixels[3::4] = b"\xff" * samples
+    stride = 4 * width
+    # Filter type 0 (none) in front of every scanline
+    scanlines = b"".join(b"\x00" + pixels[row * stride:(row + 1) * stride] for row in range(height))
+
+    with open(png_path, "wb") as f:
+        f.write(b"\x89PNG\r\n\x1a\n")
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 6, 0, 0, 0)))
+        f.write(_png_chunk(b"IDAT", zlib.compress(bytes(scanlines), 6)))
+        f.write(_png_chunk(b"IEND", b""))
+
+
+def _import_heightmap(world: Any, landscape: Any, tiles: list[dict[str, Any]], resolution: list[int]) -> bool:
+    """
+    Composite the tiles into one render target at their origins and write it
+    into the landscape's heights. Returns False when the landscape has no
+    components yet, which editor scripting cannot create.
+    """
+    if not landscape.get_components_by_class(unreal.LandscapeComponent):
+        return False
+
+    rendering = unreal.RenderingLibrary
+    target = rendering.create_render_target2d(
+        world, resolution[0], resolution[1],
+        unreal.TextureRenderTargetFormat.RTF_RGBA8, unreal.LinearColor(0, 0, 0, 1), False
+    )
+    canvas, _, context = rendering.begin_draw_canvas_to_render_target(world, target)
+    # The PNGs only feed the texture import; keep them out of the run's artifacts
+    scratch = tempfile.TemporaryDirectory(prefix="mcp_heightmap_")
+    try:
+        for tile in tiles:
+            png_path = os.path.join(scratch.name, os.path.splitext(os.path.basename(tile["path"]))[0] + ".png")
+            _write_height_png(tile["path"], tile["size"], png_path)
+            texture = rendering.import_file_as_texture2d(world, png_path)
+            if texture is None:
+                raise RuntimeError(f"Could not load heightmap tile '{png_path}'")
+            # Heights are data, not colour: no sRGB curve, no filtering between samples
+            texture.set_editor_property("srgb", False)
+            texture.set_editor_property("filter", unreal.TextureFilter.TF_NEAREST)
+            canvas.draw_texture(
+                texture,
+                unreal.Vector2D(*tile["origin"]),
+                unreal.Vector2D(*tile["size"]),
+                unreal.Vector2D(0, 0),
+                unreal.Vector2D(1, 1),
+                blend_mode=unreal.BlendMode.BLEND_OPAQUE,
+            )
+    finally:
+        rendering.end_draw_canvas_to_render_target(world, context)
+        scratch.cleanup()
+
+    return bool(landscape.landscape_import_heightmap_from_render_target(target, True))
+
+
 def handle_generate_terrain(params: dict[str, Any]) -> dict[str, Any]:
-    """Generate terrain using PCG or Landscape tools."""
+    """
+    Write heightmap tiles synthesized by the host into the generated Landscape.
+
+    Tiles are little-endian uint16 .r16 files named ``<name>_x<X>_y<Y>.r16``,
+    each covering whole components. They are composited into a render target
+    and imported into the ``MCP_GeneratedTerrain`` landscape. A new landscape
+    has no components until it is created through Landscape mode, and
+    heightmaps larger than MAX_HEIGHTMAP_IMPORT_SIZE do not fit one render
+    target; in both cases the tiles are left for Landscape mode's tiled import
+    and a warning says so.
+    """
     width = params.get("width", 1000)
     height = params.get("height", 1000)
     detail_level = params.get("detail_level", "medium")
     seed = params.get("seed")
+    tiles = params.get("tiles", [])
+    layout = params.get("layout", {})
+    resolution = params.get("resolution", [0, 0])
+
+    log(f"Generating terrain: {width}x{height}, detail={detail_level}, seed={seed}, tiles={len(tiles)}")
 
-    log(f"Generating terrain: {width}x{height}, detail={detail_level}, seed={seed}")
+    missing = [tile["path"] for tile in tiles if not os.path.exists(tile["path"])]
+    if missing:
+        raise FileNotFoundError(f"Heightmap tiles not found: {', '.join(missing)}")
 
     if IN_UNREAL:
         # Get the editor world
@@ -115,37 +563,112 @@ def handle_generate_terrain(params: dict[str, Any]) -> dict[str, Any]:
         if not world:
             raise RuntimeError("No editor world available")
 
-        # Create landscape (simplified - real implementation would be more complex)
-        # This is a placeholder for actual landscape generation
-        landscape_path = "/Game/Maps/GeneratedTerrain"
-
-        # In a real implementation, you would:
-        # 1. Create a new Landscape actor
-        # 2. Set up heightmap data
-        # 3. Apply materials
-        # 4. Configure PCG if using procedural generation
+        # Regenerating writes into the landscape from the previous run
+        landscape = next(
+            (
+                actor for actor in unreal.GameplayStatics.get_all_actors_of_class(world, unreal.Landscape)
+                if actor.get_actor_label() == TERRAIN_LABEL
+            ),
+            None,
+        )
+        if landscape is None:
+            actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+            landscape = actor_subsystem.spawn_actor_from_class(unreal.Landscape, unreal.Vector(0, 0, 0))
+            landscape.set_actor_label(TERRAIN_LABEL)
+            # Match the component grid the tiles were generated for
+            quads = layout.get("quads_per_section", 63)
+            sections = layout.get("sections_per_component", 1)
+            landscape.set_editor_property("subsection_size_quads", quads)
+            landscape.set_editor_property("num_subsections", sections)
+            landscape.set_editor_property("component_size_quads", quads * sections)
+
+        imported = False
+        warnings = []
+        if tiles and max(resolution) > MAX_HEIGHTMAP_IMPORT_SIZE:
+            warnings.append(
+                f"Heightmap is {resolution[0]}x{resolution[1]}, larger than the "
+                f"{MAX_HEIGHTMAP_IMPORT_SIZE}x{MAX_HEIGHTMAP_IMPORT_SIZE} supported for direct import; "
+                "import the heightmap tiles with Landscape mode's tiled import"
+            )
+        elif tiles:
+            imported = _import_heightmap(world, landscape, tiles, resolution)
+            if not imported:
+                warnings.append(
+                    f"Landscape '{TERRAIN_LABEL}' has no components to write heights into; "
+                    "import the heightmap tiles with Landscape mode's tiled import"
+                )
 
         return {
             "message": f"Generated {width}x{height} terrain ({detail_level})",
-            "terrain_path": landscape_path,
+            "terrain_path": landscape.get_path_name(),
+            "heightmap_tiles": [tile["path"] for tile in tiles],
+            "heightmap_imported": imported,
+            "warnings": warnings,
             "seed": seed
         }
     else:
         return {
             "message": f"Generated {width}x{height} terrain ({detail_level})",
             "terrain_path": "/Game/Maps/GeneratedTerrain",
+            "heightmap_tiles": [tile["path"] for tile in tiles],
+            "heightmap_imported": False,
+            "warnings": [],
             "seed": seed
         }
 
 
+# Columns of each transform row sent by the host: x, y, z, yaw, scale
+TRANSFORM_STRIDE = 5
+
+
+def _decode_transforms(payload: dict[str, Any]) -> array:
+    """Decode base64 little-endian float32 transform rows."""
+    values = array("f")
+    values.frombytes(base64.b64decode(payload.get("data", "")))
+    if sys.byteorder != "little":
+        values.byteswap()
+    if len(values) % TRANSFORM_STRIDE:
+        raise ValueError("Transform payload is not a whole number of rows")
+    return values
+
+
+def _load_static_mesh(asset_type: str) -> Any:
+    """Resolve asset_type as an asset path, or as a static mesh name in the asset index."""
+    if asset_type.startswith("/") and unreal.EditorAssetLibrary.does_asset_exist(asset_type):
+        return unreal.EditorAssetLibrary.load_asset(asset_type)
+    ASSET_INDEX.ensure_built()
+    paths = ASSET_INDEX.find(asset_type, "StaticMesh")
+    if not paths:
+        raise ValueError(f"Static mesh not found: {asset_type}")
+    return unreal.EditorAssetLibrary.load_asset(paths[0])
+
+
+def _spawn_instance_component(label: str) -> tuple[Any, Any]:
+    """Spawn an empty actor holding a Hierarchical Instanced Static Mesh component."""
+    actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    actor = actor_subsystem.spawn_actor_from_class(unreal.Actor, unreal.Vector(0, 0, 0))
+    actor.set_actor_label(label)
+
+    subobjects = unreal.get_engine_subsystem(unreal.SubobjectDataSubsystem)
+    root = subobjects.k2_gather_subobject_data_for_instance(actor)[0]
+    handle, _ = subobjects.add_new_subobject(unreal.AddNewSubobjectParams(
+        parent_handle=root,
+        new_class=unreal.HierarchicalInstancedStaticMeshComponent,
+    ))
+    data = unreal.SubobjectDataBlueprintFunctionLibrary.get_data(handle)
+    return actor, unreal.SubobjectDataBlueprintFunctionLibrary.get_object(data)
+
+
 def handle_populate_level(params: dict[str, Any]) -> dict[str, Any]:
-    """Populate level with assets using PCG or manual placement."""
+    """
+    Write host-generated instance transforms into a Hierarchical Instanced
+    Static Mesh component with a single bulk add, instead of one actor each.
+    """
     asset_type = params.get("asset_type", "")
-    density = params.get("density", 10)
-    seed = params.get("seed")
-    budget_max = params.get("budget_max_instances")
+    values = _decode_transforms(params.get("transforms", {}))
+    count = len(values) // TRANSFORM_STRIDE
 
-    log(f"Populating level with {density} instances of '{asset_type}'")
+    log(f"Populating level with {count} instances of '{asset_type}'")
 
     if IN_UNREAL:
         editor_subsystem = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem)
@@ -154,21 +677,29 @@ def handle_populate_level(params: dict[str, Any]) -> dict[str, Any]:
         if not world:
             raise RuntimeError("No editor world available")
 
-        # Real implementation would use PCG or manual actor spawning
-        # This is a placeholder
-        actual_count = min(density, budget_max) if budget_max else density
+        mesh = _load_static_mesh(asset_type)
+        actor, component = _spawn_instance_component(f"MCP_{asset_type.rsplit('/', 1)[-1]}_Instances")
+        component.set_static_mesh(mesh)
+
+        transforms = []
+        for i in range(0, len(values), TRANSFORM_STRIDE):
+            x, y, z, yaw, scale = values[i:i + TRANSFORM_STRIDE]
+            transforms.append(unreal.Transform(
+                location=unreal.Vector(x, y, z),
+                rotation=unreal.Rotator(roll=0.0, pitch=0.0, yaw=yaw),
+                scale=unreal.Vector(scale, scale, scale),
+            ))
+        component.add_instances(transforms, False, True)
 
         return {
-            "message": f"Populated level with {actual_count} instances of '{asset_type}'",
-            "count": actual_count,
-            "seed": seed
+            "message": f"Populated level with {count} instances of '{asset_type}'",
+            "count": count,
+            "actor": actor.get_path_name(),
         }
     else:
-        actual_count = min(density, budget_max) if budget_max else density
         return {
-            "message": f"Populated level with {actual_count} instances of '{asset_type}'",
-            "count": actual_count,
-            "seed": seed
+            "message": f"Populated level with {count} instances of '{asset_type}'",
+            "count": count,
         }
 
 
@@ -205,56 +736,250 @@ def handle_generate_blueprint(params: dict[str, Any]) -> dict[str, Any]:
         }
 
 
+# CSV profiler columns sampled per frame, keyed by the names reported to the host
+PROFILE_COLUMNS = {
+    "frame_ms": "FrameTime",
+    "game_ms": "GameThreadTime",
+    "render_ms": "RenderThreadTime",
+    "gpu_ms": "GPUTime",
+    "draw_calls": "RHI/DrawCalls",
+    "primitives": "RHI/PrimitivesDrawn",
+    "memory_mb": "PhysicalUsedMB",
+}
+
+# Seconds allowed per captured frame (plus slack) before a capture times out
+PROFILE_SECONDS_PER_FRAME = 0.25
+PROFILE_POLL_INTERVAL = 0.2
+
+
+class FrameSampler:
+    """Keeps the most recent `capacity` frame samples in a ring buffer."""
+
+    def __init__(self, capacity: int):
+        self._samples: deque = deque(maxlen=capacity)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def add(self, sample: dict[str, float]) -> None:
+        self._samples.append(sample)
+
+    def series(self) -> dict[str, list[float]]:
+        """Return one list per metric, in frame order; metrics missing from any frame are dropped."""
+        if not self._samples:
+            return {}
+        keys = set.intersection(*(set(sample) for sample in self._samples))
+        return {key: [sample[key] for sample in self._samples] for key in PROFILE_COLUMNS if key in keys}
+
+
+def read_csv_profile(path: str, sampler: FrameSampler) -> FrameSampler:
+    """Feed the frames of a CSV profiler capture into the sampler."""
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            sample = {}
+            for key, column in PROFILE_COLUMNS.items():
+                try:
+                    sample[key] = float(row.get(column) or "")
+                except ValueError:
+                    continue
+            # Trailing metadata rows carry no frame time
+            if "frame_ms" in sample:
+                sampler.add(sample)
+    return sampler
+
+
+def _capture_csv_profile(frames: int) -> str:
+    """Run the CSV profiler for `frames` frames and return the written capture."""
+    csv_dir = os.path.join(unreal.Paths.profiling_dir(), "CSV")
+    before = set(glob.glob(os.path.join(csv_dir, "*.csv")))
+
+    world = unreal.get_editor_subsystem(unreal.UnrealEditorSubsystem).get_editor_world()
+    unreal.SystemLibrary.execute_console_command(world, f"csvprofile frames={frames}")
+
+    deadline = time.monotonic() + 10.0 + frames * PROFILE_SECONDS_PER_FRAME
+    while time.monotonic() < deadline:
+        time.sleep(PROFILE_POLL_INTERVAL)
+        new = set(glob.glob(os.path.join(csv_dir, "*.csv"))) - before
+        if new:
+            path = max(new, key=os.path.getmtime)
+            # Wait for the profiler to finish writing
+            size = os.path.getsize(path)
+            time.sleep(PROFILE_POLL_INTERVAL)
+            if os.path.getsize(path) == size:
+                return path
+    raise TimeoutError(f"CSV profile capture of {frames} frames did not complete")
+
+
 def handle_profile_performance(params: dict[str, Any]) -> dict[str, Any]:
-    """Profile level performance."""
+    """
+    Sample frame, game, render and GPU thread times, draw calls and memory
+    for a window of frames with the CSV profiler. Returns the raw per-frame
+    series; the host computes percentiles and hitches.
+    """
     level_name = params.get("level_name", "")
+    frames = int(params.get("frames", 300))
 
-    log(f"Profiling performance for level: {level_name}")
+    log(f"Profiling performance for level: {level_name} ({frames} frames)")
 
+    sampler = FrameSampler(frames)
     if IN_UNREAL:
-        # Real implementation would use UE5's profiling tools
-        # This is a placeholder returning simulated metrics
-
-        return {
-            "message": f"Profiled level '{level_name}'",
-            "fps_avg": 60.0,
-            "frame_time_ms": 16.67,
-            "draw_calls": 1500,
-            "triangles": 2500000,
-            "memory_mb": 1024.5
-        }
-    else:
-        return {
-            "message": f"Profiled level '{level_name}'",
-            "fps_avg": 60.0,
-            "frame_time_ms": 16.67,
-            "draw_calls": 1500,
-            "triangles": 2500000,
-            "memory_mb": 1024.5
+        read_csv_profile(_capture_csv_profile(frames), sampler)
+
+    return {
+        "message": f"Profiled level '{level_name}'",
+        "frames": len(sampler),
+        "series": sampler.series(),
+    }
+
+
+def _mesh_stats(mesh: Any, cache: dict[str, dict[str, Any]]) -> dict[str, Any]:
+    path = mesh.get_path_name()
+    if path not in cache:
+        cache[path] = {
+            "mesh": path,
+            "triangles": mesh.get_num_triangles(0),
+            "lods": mesh.get_num_lods(),
+            "bounds_radius": mesh.get_bounds().sphere_radius,
         }
+    return cache[path]
+
+
+def handle_level_inventory(params: dict[str, Any]) -> dict[str, Any]:
+    """List the level's static mesh components with their rendering cost inputs."""
+    if not IN_UNREAL:
+        return {"components": []}
+
+    actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    meshes: dict[str, dict[str, Any]] = {}
+    components = []
+    for actor in actor_subsystem.get_all_level_actors():
+        for component in actor.get_components_by_class(unreal.StaticMeshComponent):
+            mesh = component.get_editor_property("static_mesh")
+            if not mesh:
+                continue
+            instanced = isinstance(component, unreal.InstancedStaticMeshComponent)
+            components.append({
+                **_mesh_stats(mesh, meshes),
+                "actor": actor.get_name(),
+                "component": component.get_name(),
+                "materials": len(component.get_materials()),
+                "instances": component.get_instance_count() if instanced else 1,
+                "instanced": instanced,
+                "cull_distance": component.get_editor_property("ld_max_draw_distance"),
+            })
+    return {"components": components}
+
+
+def _find_component(actors: dict[str, Any], target: str) -> Any:
+    """The static mesh component named by an "Actor.Component" target, or None."""
+    actor_name, _, component_name = target.partition(".")
+    actor = actors.get(actor_name)
+    if not actor:
+        return None
+    return next(
+        (c for c in actor.get_components_by_class(unreal.StaticMeshComponent) if c.get_name() == component_name),
+        None,
+    )
+
+
+def _remove_components(actor: Any, components: list[Any]) -> None:
+    """Delete components from a placed actor, as the Details panel does."""
+    subobjects = unreal.get_engine_subsystem(unreal.SubobjectDataSubsystem)
+    library = unreal.SubobjectDataBlueprintFunctionLibrary
+    handles = subobjects.k2_gather_subobject_data_for_instance(actor)
+    for handle in handles[1:]:
+        if library.get_object(library.get_data(handle)) in components:
+            subobjects.k2_delete_subobject(handles[0], handle, None)
+
+
+def _merge_to_instances(action: dict[str, Any], actors: dict[str, Any]) -> dict[str, Any]:
+    mesh = unreal.EditorAssetLibrary.load_asset(action["params"]["mesh"])
+    # Targets are "Actor.Component" pairs; an actor may contribute several components
+    by_actor: dict[str, list[Any]] = defaultdict(list)
+    for target in dict.fromkeys(action["targets"]):
+        component = _find_component(actors, target)
+        if component is not None:
+            by_actor[target.partition(".")[0]].append(component)
+    components = [component for group in by_actor.values() for component in group]
+    # World transforms keep components offset within their actor in place
+    transforms = [component.get_world_transform() for component in components]
+    merged, instances = _spawn_instance_component(f"MCP_{mesh.get_name()}_Merged")
+    instances.set_static_mesh(mesh)
+    instances.add_instances(transforms, False, True)
+
+    actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+    destroyed = 0
+    for actor_name, group in by_actor.items():
+        actor = actors[actor_name]
+        others = [c for c in actor.get_components_by_class(unreal.PrimitiveComponent) if c not in group]
+        if others:
+            _remove_components(actor, group)
+        else:
+            actor_subsystem.destroy_actor(actor)
+            del actors[actor_name]
+            destroyed += 1
+    return {"merged": len(components), "destroyed_actors": destroyed, "actor": merged.get_path_name()}
+
+
+def _generate_lods(action: dict[str, Any]) -> dict[str, Any]:
+    num_lods = action["params"].get("num_lods", 4)
+    reduction = [
+        unreal.EditorScriptingMeshReductionSettings(percent_triangles=0.5 ** i, screen_size=0.5 ** i)
+        for i in range(num_lods)
+    ]
+    options = unreal.EditorScriptingMeshReductionOptions(
+        auto_compute_lod_screen_size=True, reduction_settings=reduction
+    )
+    mesh_subsystem = unreal.get_editor_subsystem(unreal.StaticMeshEditorSubsystem)
+    for path in action["targets"]:
+        mesh = unreal.EditorAssetLibrary.load_asset(path)
+        mesh_subsystem.set_lods(mesh, options)
+        unreal.EditorAssetLibrary.save_loaded_asset(mesh)
+    return {"meshes": len(action["targets"])}
+
+
+def _set_cull_distances(action: dict[str, Any], actors: dict[str, Any]) -> dict[str, Any]:
+    updated = 0
+    for target, distance in action["params"]["distances"].items():
+        component = _find_component(actors, target)
+        if component is not None:
+            component.set_editor_property("ld_max_draw_distance", distance)
+            updated += 1
+    return {"components": updated}
 
 
 def handle_optimize_level(params: dict[str, Any]) -> dict[str, Any]:
-    """Run optimization pass on level."""
-    _ = params.get("budgets", {})  # Reserved for future use
+    """Apply optimization actions planned by the host."""
+    actions = params.get("actions", [])
 
-    log("Running optimization pass")
+    log(f"Running optimization pass ({len(actions)} actions)")
 
+    applied = []
     if IN_UNREAL:
-        # Real implementation would analyze and optimize the level
-        # This is a placeholder
+        actor_subsystem = unreal.get_editor_subsystem(unreal.EditorActorSubsystem)
+        actors = {actor.get_name(): actor for actor in actor_subsystem.get_all_level_actors()}
+        for action in actions:
+            kind = action.get("kind")
+            try:
+                if kind == "merge_to_instances":
+                    details = _merge_to_instances(action, actors)
+                elif kind == "generate_lods":
+                    details = _generate_lods(action)
+                elif kind == "set_cull_distance":
+                    details = _set_cull_distances(action, actors)
+                else:
+                    # HLOD generation runs through the World Partition builder, not editor scripting
+                    applied.append({"kind": kind, "status": "skipped", "reason": "Build HLODs from the editor"})
+                    continue
+                applied.append({"kind": kind, "status": "ok", **details})
+            except Exception as e:
+                applied.append({"kind": kind, "status": "error", "error": str(e)})
 
-        return {
-            "message": "Optimization pass complete",
-            "optimized_count": 5,
-            "memory_saved_mb": 128.0
-        }
-    else:
-        return {
-            "message": "Optimization pass complete",
-            "optimized_count": 5,
-            "memory_saved_mb": 128.0
-        }
+    return {
+        "message": "Optimization pass complete",
+        "optimized_count": sum(1 for a in applied if a["status"] == "ok"),
+        "applied": applied,
+    }
 
 
 def handle_debug_blueprint(params: dict[str, Any]) -> dict[str, Any]:
@@ -283,10 +1008,14 @@ def handle_debug_blueprint(params: dict[str, Any]) -> dict[str, Any]:
 # Command dispatcher
 COMMAND_HANDLERS = {
     "import_asset": handle_import_asset,
+    "import_assets": handle_import_assets,
+    "asset_status": handle_asset_status,
+    "query_assets": handle_query_assets,
     "generate_terrain": handle_generate_terrain,
     "populate_level": handle_populate_level,
     "generate_blueprint": handle_generate_blueprint,
     "profile_performance": handle_profile_performance,
+    "level_inventory": handle_level_inventory,
     "optimize_level": handle_optimize_level,
     "debug_blueprint": handle_debug_blueprint,
 }
@@ -310,12 +1039,15 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         log(format % args)
 
     def _send_json_response(self, status_code: int, data: dict) -> None:
-        """Send a JSON response."""
+        """Send a response, as JSON unless the client accepts a better wire format."""
+        body, headers = wire_encode(data, self.headers.get("Accept"), self.headers.get("Accept-Encoding"))
         self.send_response(status_code)
-        self.send_header("Content-Type", "application/json")
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
         self.send_header("Access-Control-Allow-Origin", "*")
         self.end_headers()
-        self.wfile.write(json.dumps(data).encode("utf-8"))
+        self.wfile.write(body)
 
     def _check_remote_access(self) -> bool:
         """Check if the request is allowed based on remote access settings."""
@@ -336,7 +1068,7 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         self.send_response(200)
         self.send_header("Access-Control-Allow-Origin", "*")
         self.send_header("Access-Control-Allow-Methods", "GET, POST, OPTIONS")
-        self.send_header("Access-Control-Allow-Headers", "Content-Type")
+        self.send_header("Access-Control-Allow-Headers", "Content-Type, Content-Encoding")
         self.end_headers()
 
     def do_GET(self) -> None:
@@ -352,7 +1084,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
 
             self._send_json_response(200, {
                 "status": "ok",
-                "engine_version": engine_version
+                "engine_version": engine_version,
+                "wire": wire_capabilities(),
             })
         else:
             self._send_json_response(404, {"status": "error", "error": "Not found"})
@@ -366,8 +1099,8 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
         if self.path == "/command":
             try:
                 content_length = int(self.headers.get("Content-Length", 0))
-                body = self.rfile.read(content_length).decode("utf-8")
-                request = json.loads(body)
+                body = self.rfile.read(content_length)
+                request = wire_decode(body, self.headers.get("Content-Type"), self.headers.get("Content-Encoding"))
 
                 command = request.get("command", "")
                 params = request.get("params", {})
@@ -380,11 +1113,11 @@ class MCPRequestHandler(BaseHTTPRequestHandler):
                     "data": result
                 })
 
-            except json.JSONDecodeError as e:
-                log_error(f"Invalid JSON: {e}")
+            except (json.JSONDecodeError, OSError, EOFError) as e:
+                log_error(f"Invalid request body: {e}")
                 self._send_json_response(400, {
                     "status": "error",
-                    "error": f"Invalid JSON: {e}"
+                    "error": f"Invalid request body: {e}"
                 })
             except ValueError as e:
                 log_error(f"Command error: {e}")
@@ -4,19 +4,11 @@ from mcp_protocol.models import (
     GenerateBlueprintInput,
     GenerateTerrainInput,
     ImportAssetInput,
+    ImportAssetsInput,
     OptimizeLevelInput,
     PopulateLevelInput,
     ProfilePerformanceInput,
-)
-
-from .tools import (
-    debug_blueprint,
-    generate_blueprint,
-    generate_terrain,
-    import_asset,
-    optimize_level,
-    populate_level,
-    profile_performance,
+    QueryAssetsInput,
 )
 
 __all__ = ["__version__", "register_ue5_tools"]
@@ -34,41 +26,73 @@ def register_ue5_tools(registry: ToolRegistry) -> None:
         name="mcp.import_asset",
         description="Import an asset from an export manifest into UE5.",
         input_model=ImportAssetInput,
-        handler=import_asset,
+        handler="mcp_target_ue5.tools:import_asset",
+        target="ue5",
+        path_fields=("manifest_path",),
+    )
+    registry.register(
+        name="mcp.import_assets",
+        description="Import many export manifests into UE5 in one import transaction.",
+        input_model=ImportAssetsInput,
+        handler="mcp_target_ue5.tools:import_assets",
+        target="ue5",
+        path_fields=("manifest_paths",),
+    )
+    registry.register(
+        name="mcp.query_assets",
+        description="Query UE5 assets by path prefix, class and tag.",
+        input_model=QueryAssetsInput,
+        handler="mcp_target_ue5.tools:query_assets",
+        target="ue5",
+        read_only=True,
+        cost="cheap",
     )
     registry.register(
         name="mcp.generate_terrain",
         description="Generate procedural terrain in UE5.",
         input_model=GenerateTerrainInput,
-        handler=generate_terrain,
+        handler="mcp_target_ue5.tools:generate_terrain",
+        deterministic=True,
+        target="ue5",
     )
     registry.register(
         name="mcp.populate_level",
         description="Populate a level with assets.",
         input_model=PopulateLevelInput,
-        handler=populate_level,
+        handler="mcp_target_ue5.tools:populate_level",
+        deterministic=True,
+        target="ue5",
+        path_fields=("heightmap_path",),
     )
     registry.register(
         name="mcp.generate_blueprint",
         description="Generate or modify Blueprint logic.",
         input_model=GenerateBlueprintInput,
-        handler=generate_blueprint,
+        handler="mcp_target_ue5.tools:generate_blueprint",
+        target="ue5",
+        cost="expensive",
     )
     registry.register(
         name="mcp.profile_performance",
         description="Profile performance of a level.",
         input_model=ProfilePerformanceInput,
-        handler=profile_performance,
+        handler="mcp_target_ue5.tools:profile_performance",
+        target="ue5",
+        read_only=True,
+        cost="expensive",
     )
     registry.register(
         name="mcp.optimize_level",
         description="Optimize level content based on budgets.",
         input_model=OptimizeLevelInput,
-        handler=optimize_level,
+        handler="mcp_target_ue5.tools:optimize_level",
+        target="ue5",
     )
     registry.register(
         name="mcp.debug_blueprint",
         description="Debug a blueprint.",
         input_model=DebugBlueprintInput,
-        handler=debug_blueprint,
+        handler="mcp_target_ue5.tools:debug_blueprint",
+        target="ue5",
+        read_only=True,
     )
@@ -0,0 +1,197 @@
+"""
+Budget-driven optimization planning for optimize_level.
+
+Plans are computed from a level inventory (as returned by the plugin's
+``level_inventory`` command) and are pure Python, so they can be tested on
+synthetic inventories. Each inventory entry is a mesh component:
+
+    {"actor": str, "component": str, "mesh": str, "triangles": int,
+     "materials": int, "instances": int, "instanced": bool, "lods": int,
+     "cull_distance": float, "bounds_radius": float}
+
+``instances`` is 1 for a plain static mesh component. A cull distance of 0
+means the component is never distance culled.
+"""
+from collections import defaultdict
+from typing import Any, NamedTuple
+
+# Non-instanced components sharing a mesh needed before merging into instances pays off
+MIN_MERGE_GROUP = 4
+# Meshes with at least this many LOD0 triangles and no LODs get generated LODs
+LOD_MIN_TRIANGLES = 5000
+# Estimated share of rendered triangles removed by generated LODs
+LOD_TRIANGLE_SAVING = 0.5
+# Components with bounds under this radius (cm) are candidates for cull distances
+CULL_MAX_RADIUS = 200.0
+# Cull distance (cm) proposed per cm of bounds radius
+CULL_DISTANCE_PER_RADIUS = 50.0
+# Estimated share of a culled component's cost removed at typical view distances
+CULL_SAVING = 0.3
+# Non-instanced components needed before HLODs are proposed
+HLOD_MIN_COMPONENTS = 500
+# Estimated share of non-instanced draw calls removed by HLODs
+HLOD_DRAW_CALL_SAVING = 0.4
+
+# Relative effort per action, in arbitrary units
+EFFORT = {
+    "merge_to_instances": 1.0,
+    "generate_lods": 2.0,
+    "set_cull_distance": 0.5,
+    "build_hlod": 5.0,
+}
+
+METRICS = ("draw_calls", "triangles", "instances")
+
+
+class Action(NamedTuple):
+    kind: str
+    targets: list[str]
+    savings: dict[str, float]
+    effort: float
+    params: dict[str, Any]
+    score: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {**self._asdict(), "savings": {k: round(v, 1) for k, v in self.savings.items()}}
+
+
+def estimate_cost(inventory: list[dict[str, Any]]) -> dict[str, float]:
+    """Worst-case (LOD0, nothing culled) per-frame cost of the inventory."""
+    cost = dict.fromkeys(METRICS, 0.0)
+    for entry in inventory:
+        instances = entry.get("instances", 1)
+        cost["draw_calls"] += entry.get("materials", 1)
+        cost["triangles"] += entry.get("triangles", 0) * instances
+        cost["instances"] += instances
+    return cost
+
+
+def _component_target(entry: dict[str, Any]) -> str:
+    """The "Actor.Component" name actions use to address an inventory entry."""
+    return f"{entry['actor']}.{entry.get('component', '')}"
+
+
+def _merge_actions(inventory: list[dict[str, Any]]) -> list[Action]:
+    groups: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    for entry in inventory:
+        if not entry.get("instanced") and entry.get("mesh"):
+            groups[entry["mesh"]].append(entry)
+    actions = []
+    for mesh, entries in sorted(groups.items()):
+        if len(entries) < MIN_MERGE_GROUP:
+            continue
+        materials = max(e.get("materials", 1) for e in entries)
+        draw_calls = sum(e.get("materials", 1) for e in entries) - materials
+        actions.append(Action(
+            "merge_to_instances",
+            [_component_target(e) for e in entries],
+            {"draw_calls": draw_calls},
+            EFFORT["merge_to_instances"],
+            {"mesh": mesh},
+        ))
+    return actions
+
+
+def _lod_actions(inventory: list[dict[str, Any]]) -> list[Action]:
+    triangles: dict[str, float] = defaultdict(float)
+    for entry in inventory:
+        if entry.get("mesh") and entry.get("lods", 1) <= 1 and entry.get("triangles", 0) >= LOD_MIN_TRIANGLES:
+            triangles[entry["mesh"]] += entry["triangles"] * entry.get("instances", 1)
+    return [
+        Action(
+            "generate_lods",
+            [mesh],
+            {"triangles": total * LOD_TRIANGLE_SAVING},
+            EFFORT["generate_lods"],
+            {"num_lods": 4},
+        )
+        for mesh, total in sorted(triangles.items())
+    ]
+
+
+def _cull_actions(inventory: list[dict[str, Any]]) -> list[Action]:
+    candidates = [
+        e for e in inventory
+        if not e.get("cull_distance") and 0 < e.get("bounds_radius", 0) <= CULL_MAX_RADIUS
+    ]
+    if not candidates:
+        return []
+    cost = estimate_cost(candidates)
+    distances = {
+        _component_target(e): round(e["bounds_radius"] * CULL_DISTANCE_PER_RADIUS, 1)
+        for e in candidates
+    }
+    return [Action(
+        "set_cull_distance",
+        list(distances),
+        {metric: cost[metric] * CULL_SAVING for metric in ("draw_calls", "triangles")},
+        EFFORT["set_cull_distance"],
+        {"distances": distances},
+    )]
+
+
+def _hlod_actions(inventory: list[dict[str, Any]]) -> list[Action]:
+    standalone = [e for e in inventory if not e.get("instanced")]
+    if len(standalone) < HLOD_MIN_COMPONENTS:
+        return []
+    draw_calls = sum(e.get("materials", 1) for e in standalone)
+    return [Action(
+        "build_hlod",
+        [],
+        {"draw_calls": draw_calls * HLOD_DRAW_CALL_SAVING},
+        EFFORT["build_hlod"],
+        {},
+    )]
+
+
+def plan(inventory: list[dict[str, Any]], budgets: dict[str, float]) -> dict[str, Any]:
+    """
+    Propose actions ranked by savings per unit of effort.
+
+    Savings are weighted by how far over budget each metric is, so actions
+    that reduce an exceeded budget rank first. Actions are then selected in
+    rank order until every budget is met (or none are left); the full
+    ranking is returned as ``candidates``.
+    """
+    cost = estimate_cost(inventory)
+    # Pressure is the fraction of the budget a unit of the metric represents,
+    # doubled while the metric is over budget
+    pressure = {}
+    for metric in METRICS:
+        budget = budgets.get(metric)
+        if not budget:
+            pressure[metric] = 0.0
+            continue
+        pressure[metric] = (2.0 if cost[metric] > budget else 1.0) / budget
+
+    candidates = (
+        _merge_actions(inventory) + _lod_actions(inventory) + _cull_actions(inventory) + _hlod_actions(inventory)
+    )
+    ranked = sorted(
+        (
+            a._replace(score=round(sum(pressure[m] * v for m, v in a.savings.items()) / a.effort, 6))
+            for a in candidates
+        ),
+        key=lambda a: (-a.score, a.kind, a.targets),
+    )
+
+    projected = dict(cost)
+    selected = []
+    for action in ranked:
+        over = [m for m in METRICS if budgets.get(m) and projected[m] > budgets[m]]
+        if not over:
+            break
+        if not any(action.savings.get(m) for m in over):
+            continue
+        selected.append(action)
+        for metric, value in action.savings.items():
+            projected[metric] = max(0.0, projected[metric] - value)
+
+    return {
+        "cost": cost,
+        "budgets": budgets,
+        "over_budget": [m for m in METRICS if budgets.get(m) and cost[m] > budgets[m]],
+        "projected": {m: round(v, 1) for m, v in projected.items()},
+        "actions": [a.as_dict() for a in selected],
+        "candidates": [a.as_dict() for a in ranked],
+    }
@@ -0,0 +1,60 @@
+"""
+Aggregation of per-frame profiling series from the UE5 plugin.
+
+Pure Python so summaries can be tested on synthetic series.
+"""
+import math
+import statistics
+from typing import Any
+
+PERCENTILES = (50, 95, 99)
+
+# Frames slower than this multiple of the median frame time count as hitches
+HITCH_MEDIAN_MULTIPLIER = 2.0
+# Frames slower than this multiple of the hitch threshold count as severe
+SEVERE_HITCH_MULTIPLIER = 2.0
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Linearly interpolated percentile (0-100) of already sorted values."""
+    if not sorted_values:
+        raise ValueError("percentile of empty series")
+    rank = (len(sorted_values) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = min(low + 1, len(sorted_values) - 1)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def summarize_metric(values: list[float]) -> dict[str, float]:
+    ordered = sorted(values)
+    summary = {f"p{q}": round(percentile(ordered, q), 3) for q in PERCENTILES}
+    summary["max"] = round(ordered[-1], 3)
+    summary["avg"] = round(statistics.fmean(ordered), 3)
+    return summary
+
+
+def count_hitches(frame_ms: list[float], threshold_ms: float | None = None) -> dict[str, Any]:
+    """
+    Count frames over the hitch threshold (by default twice the median frame
+    time) and severe hitches over twice that.
+    """
+    if threshold_ms is None:
+        threshold_ms = statistics.median(frame_ms) * HITCH_MEDIAN_MULTIPLIER
+    severe_ms = threshold_ms * SEVERE_HITCH_MULTIPLIER
+    return {
+        "threshold_ms": round(threshold_ms, 3),
+        "count": sum(1 for ms in frame_ms if ms > threshold_ms),
+        "severe": sum(1 for ms in frame_ms if ms > severe_ms),
+    }
+
+
+def summarize(series: dict[str, list[float]], hitch_threshold_ms: float | None = None) -> dict[str, Any]:
+    """Summarize per-frame series into percentiles per metric plus hitch counts."""
+    metrics = {name: summarize_metric(values) for name, values in series.items() if values}
+    summary: dict[str, Any] = {"frames": max((len(v) for v in series.values()), default=0), "metrics": metrics}
+    frame_ms = series.get("frame_ms")
+    if frame_ms:
+        summary["fps_avg"] = round(1000.0 / statistics.fmean(frame_ms), 2)
+        summary["frame_time_ms"] = metrics["frame_ms"]["p50"]
+        summary["hitches"] = count_hitches(frame_ms, hitch_threshold_ms)
+    return summary
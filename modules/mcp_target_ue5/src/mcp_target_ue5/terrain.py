@@ -0,0 +1,217 @@
+"""
+Heightmap synthesis for generate_terrain.
+
+Heights are seeded fractal noise (see mcp_core.procedural) quantized to the
+uint16 range UE5 Landscapes import. Noise is a function of global sample
+coordinates, so the heightmap can be produced tile by tile and tiles that
+share a border agree on it exactly. Runs outside Unreal; the plugin only
+receives the tile files.
+"""
+import math
+from collections.abc import Iterator
+from pathlib import Path
+from typing import NamedTuple
+
+import numpy as np
+from mcp_core.procedural import fbm
+
+
+class TerrainParams(NamedTuple):
+    octaves: int
+    # Noise features per 1024 samples at the base octave
+    frequency: float
+    lacunarity: float = 2.0
+    gain: float = 0.5
+    ridged: bool = False
+    warp: float = 0.0
+    # Multiplier mapping noise (about [-1, 1]) onto the uint16 range
+    amplitude: float = 1.5
+
+
+DETAIL_LEVELS: dict[str, TerrainParams] = {
+    "low": TerrainParams(octaves=4, frequency=2.0),
+    "medium": TerrainParams(octaves=6, frequency=3.0),
+    "high": TerrainParams(octaves=8, frequency=4.0, ridged=True, amplitude=1.0),
+}
+
+# Landscape section sizes (quads per section) per detail level
+SECTION_QUADS = {"low": 63, "medium": 127, "high": 255}
+
+
+class LandscapeLayout(NamedTuple):
+    """A Landscape's component grid; vertex resolution is components * quads + 1."""
+
+    quads_per_section: int
+    sections_per_component: int
+    components_x: int
+    components_y: int
+
+    @property
+    def component_quads(self) -> int:
+        return self.quads_per_section * self.sections_per_component
+
+    @property
+    def resolution(self) -> tuple[int, int]:
+        return (
+            self.components_x * self.component_quads + 1,
+            self.components_y * self.component_quads + 1,
+        )
+
+
+def landscape_layout(width: int, height: int, detail_level: str = "medium") -> LandscapeLayout:
+    """Return the smallest component grid covering width x height vertices."""
+    quads = SECTION_QUADS[detail_level]
+    sections = 2 if detail_level == "high" else 1
+    component = quads * sections
+    return LandscapeLayout(
+        quads_per_section=quads,
+        sections_per_component=sections,
+        components_x=max(1, math.ceil((width - 1) / component)),
+        components_y=max(1, math.ceil((height - 1) / component)),
+    )
+
+
+# Rows synthesized per block; keeps the per-octave temporaries cache-sized
+_BLOCK_ROWS = 128
+
+
+def heightmap(
+    width: int,
+    height: int,
+    seed: int = 0,
+    params: TerrainParams = DETAIL_LEVELS["medium"],
+    origin: tuple[int, int] = (0, 0),
+) -> np.ndarray:
+    """Generate the uint16 heights of the width x height samples starting at origin."""
+    scale = params.frequency / 1024.0
+    xs = (origin[0] + np.arange(width)) * scale
+    out = np.empty((height, width), dtype=np.uint16)
+    for row in range(0, height, _BLOCK_ROWS):
+        ys = (origin[1] + np.arange(row, min(row + _BLOCK_ROWS, height))) * scale
+        n = fbm(
+            xs, ys, seed,
+            octaves=params.octaves,
+            lacunarity=params.lacunarity,
+            gain=params.gain,
+            ridged=params.ridged,
+            warp=params.warp,
+        )
+        # Fixed (not per-tile) normalization keeps separately generated tiles consistent
+        n *= params.amplitude * 0.5
+        n += 0.5
+        np.clip(n, 0.0, 1.0, out=n)
+        n *= 65535.0
+        np.rint(n, out=n)
+        out[row:row + len(ys)] = n
+    return out
+
+
+class HeightmapTile(NamedTuple):
+    x: int
+    y: int
+    # Sample offset of the tile's first column and row
+    origin: tuple[int, int]
+    heights: np.ndarray
+
+
+def tile_grid(layout: LandscapeLayout, components_per_tile: int = 8) -> tuple[int, int]:
+    """Return the number of tiles along x and y."""
+    tile_quads = layout.component_quads * components_per_tile
+    width, height = layout.resolution
+    return math.ceil((width - 1) / tile_quads), math.ceil((height - 1) / tile_quads)
+
+
+def tile(
+    layout: LandscapeLayout,
+    x: int,
+    y: int,
+    seed: int = 0,
+    params: TerrainParams = DETAIL_LEVELS["medium"],
+    components_per_tile: int = 8,
+) -> HeightmapTile:
+    """
+    Generate one tile of components_per_tile squared components on demand.
+    Neighbouring tiles share their border row/column of samples, matching how
+    Landscape components share edge vertices.
+    """
+    tile_quads = layout.component_quads * components_per_tile
+    width, height = layout.resolution
+    x0, y0 = x * tile_quads, y * tile_quads
+    if not (0 <= x0 < width - 1 and 0 <= y0 < height - 1):
+        raise ValueError(f"Tile ({x}, {y}) is outside the landscape")
+    w = min(tile_quads, width - 1 - x0) + 1
+    h = min(tile_quads, height - 1 - y0) + 1
+    return HeightmapTile(x, y, (x0, y0), heightmap(w, h, seed, params, origin=(x0, y0)))
+
+
+def iter_tiles(
+    layout: LandscapeLayout,
+    seed: int = 0,
+    params: TerrainParams = DETAIL_LEVELS["medium"],
+    components_per_tile: int = 8,
+) -> Iterator[HeightmapTile]:
+    """Yield every tile in row-major order; only one tile is held in memory at a time."""
+    tiles_x, tiles_y = tile_grid(layout, components_per_tile)
+    for y in range(tiles_y):
+        for x in range(tiles_x):
+            yield tile(layout, x, y, seed, params, components_per_tile)
+
+
+def write_r16(path: str | Path, heights: np.ndarray) -> Path:
+    """Write heights as a little-endian 16-bit RAW (.r16) file for Landscape import."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    np.ascontiguousarray(heights, dtype="<u2").tofile(path)
+    return path
+
+
+def write_tiles(
+    directory: str | Path,
+    layout: LandscapeLayout,
+    seed: int = 0,
+    params: TerrainParams = DETAIL_LEVELS["medium"],
+    components_per_tile: int = 8,
+    name: str = "heightmap",
+) -> list[dict]:
+    """
+    Write every tile to ``<directory>/<name>_x<X>_y<Y>.r16`` (the Landscape
+    tiled-import naming) and return a manifest entry per tile.
+    """
+    tiles = []
+    for t in iter_tiles(layout, seed, params, components_per_tile):
+        path = write_r16(Path(directory) / f"{name}_x{t.x}_y{t.y}.r16", t.heights)
+        tiles.append({
+            "path": str(path),
+            "x": t.x,
+            "y": t.y,
+            "origin": list(t.origin),
+            "size": [t.heights.shape[1], t.heights.shape[0]],
+        })
+    return tiles
+
+
+def write_memmap(
+    path: str | Path,
+    layout: LandscapeLayout,
+    seed: int = 0,
+    params: TerrainParams = DETAIL_LEVELS["medium"],
+    components_per_tile: int = 8,
+) -> Path:
+    """
+    Write the full heightmap to a memory-mapped .npy file tile by tile, so
+    memory use is bounded by one tile however large the landscape is.
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    width, height = layout.resolution
+    out = np.lib.format.open_memmap(path, mode="w+", dtype=np.uint16, shape=(height, width))
+    try:
+        for t in iter_tiles(layout, seed, params, components_per_tile):
+            x0, y0 = t.origin
+            h, w = t.heights.shape
+            out[y0:y0 + h, x0:x0 + w] = t.heights
+            # Write back each tile so dirty pages do not pile up
+            out.flush()
+    finally:
+        del out
+    return path
@@ -1,26 +1,37 @@
 import asyncio
+import glob
 import json
 from typing import Any
 
 from mcp_core.ai import create_ai_client
 from mcp_core.ai.prompts import PromptTemplate
 from mcp_core.config.settings import settings
+from mcp_core.observability import get_logger
 from mcp_core.observability.context import get_current_context
+from mcp_core.policy import policy_engine
+from mcp_core.storage import artifact_manager, build_cache
 from mcp_protocol.models import (
+    Artifact,
     DebugBlueprintInput,
+    ExportManifest,
     GenerateBlueprintInput,
     GenerateTerrainInput,
     ImportAssetInput,
+    ImportAssetsInput,
     OptimizeLevelInput,
     PopulateLevelInput,
     ProfilePerformanceInput,
+    QueryAssetsInput,
     ToolError,
     ToolErrorDetail,
     ToolResult,
 )
 
+from . import optimization, profiling
 from .transport import HttpTransport
 
+logger = get_logger(__name__)
+
 # AI prompt for Blueprint generation
 BLUEPRINT_GENERATION_PROMPT = PromptTemplate(
     name="blueprint_generation",
@@ -76,15 +87,78 @@ def get_transport() -> HttpTransport:
     return _transport
 
 
-def _execute_ue5_command(command: str, params: dict[str, Any]) -> dict[str, Any]:
+def _execute_ue5_command(
+    command: str, params: dict[str, Any], timeout: float | None = None
+) -> dict[str, Any]:
     transport = get_transport()
     # Ensure connected (lightweight check usually)
     # transport.connect()
-    response = transport.send_command(command, params)
+    response = transport.send_command(command, params, timeout=timeout)
     result: dict[str, Any] = response.get("data", {})
     return result
 
 
+def _import_fingerprint(manifest_path: str, overwrite: bool) -> str | None:
+    """
+    Fingerprint an import by the exported file's contents, the manifest's
+    import settings and the UE5 server it goes to. Returns None when the
+    manifest or exported file cannot be read locally, in which case the
+    import always runs.
+    """
+    try:
+        with open(manifest_path, encoding="utf-8") as f:
+            manifest = ExportManifest.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+
+    export_hash = build_cache.file_hash(manifest.export_path)
+    if export_hash is None:
+        return None
+    return build_cache.fingerprint(
+        export_hash=export_hash,
+        manifest=manifest.model_dump(mode="json", exclude={"provenance"}),
+        overwrite=overwrite,
+        server=get_transport().base_url,
+    )
+
+
+def _still_imported(records: dict[str, dict[str, Any]]) -> set[str]:
+    """
+    Keys of the build records whose import can still be skipped: recorded
+    for the project open in the editor, with every imported asset present.
+    Nothing is skipped if the editor cannot be asked.
+    """
+    paths = sorted({p for record in records.values() for p in record.get("result", {}).get("imported", [])})
+    try:
+        status = _execute_ue5_command("asset_status", {"paths": paths})
+    except Exception as e:
+        logger.warning(f"Cannot verify previous imports, importing again: {e}")
+        return set()
+    missing = set(status.get("missing", []))
+    return {
+        key for key, record in records.items()
+        if record.get("project") == status.get("project")
+        and not missing.intersection(record.get("result", {}).get("imported", []))
+    }
+
+
+def _run_import(input: ImportAssetInput, run_id: str) -> dict[str, Any]:
+    """
+    Import via UE5, skipping the import when incremental builds are enabled
+    and the exported file is unchanged since the last successful import.
+    """
+    fingerprint = _import_fingerprint(input.manifest_path, input.overwrite) if build_cache.enabled else None
+    if fingerprint:
+        record = build_cache.get("import", fingerprint)
+        if record and _still_imported({fingerprint: record}):
+            return {**record.get("result", {}), "skipped": True, "source_run_id": record.get("run_id")}
+
+    data = _execute_ue5_command("import_asset", input.model_dump())
+    if fingerprint:
+        build_cache.put("import", fingerprint, {"run_id": run_id, "project": data.get("project"), "result": data})
+    return data
+
+
 def import_asset(input: ImportAssetInput) -> ToolResult | ToolError:
     """
     Import an asset from an export manifest into UE5.
@@ -93,8 +167,7 @@ def import_asset(input: ImportAssetInput) -> ToolResult | ToolError:
 
     if not input.dry_run:
         try:
-            data = _execute_ue5_command("import_asset", input.model_dump())
-            result_data = data
+            result_data = _run_import(input, ctx.run_id or "")
         except Exception as e:
             return ToolError(
                 tool="import_asset",
@@ -116,16 +189,209 @@ def import_asset(input: ImportAssetInput) -> ToolResult | ToolError:
     )
 
 
+# Transport timeout allowance per asset for batched imports
+IMPORT_SECONDS_PER_ASSET = 2.0
+
+
+def _resolve_manifest_paths(input: ImportAssetsInput) -> list[str]:
+    paths = list(input.manifest_paths)
+    if input.manifest_glob:
+        paths.extend(sorted(glob.glob(input.manifest_glob, recursive=True)))
+    # Preserve order, drop duplicates
+    return list(dict.fromkeys(paths))
+
+
+def import_assets(input: ImportAssetsInput) -> ToolResult | ToolError:
+    """
+    Import many export manifests into UE5 in a single import transaction.
+    """
+    ctx = get_current_context()
+    manifest_paths = _resolve_manifest_paths(input)
+    if not manifest_paths:
+        return ToolError(
+            tool="import_assets",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(code="VALIDATION_ERROR", message="No export manifests matched the input."),
+        )
+    # The executor checks the declared manifest_paths; matches of manifest_glob are only known here
+    for path in manifest_paths:
+        try:
+            policy_engine.check_path_allowed(path)
+        except PermissionError as e:
+            return ToolError(
+                tool="import_assets",
+                request_id=ctx.request_id or "",
+                run_id=ctx.run_id or "",
+                error=ToolErrorDetail(code="POLICY_DENIED", message=str(e)),
+            )
+
+    if input.dry_run:
+        return ToolResult(
+            tool="import_assets",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            result={
+                "message": f"Would import {len(manifest_paths)} assets",
+                "manifest_paths": manifest_paths,
+            },
+        )
+
+    # Manifests whose exports are unchanged since their last import are skipped
+    fingerprints: dict[str, str] = {}
+    records: dict[str, dict[str, Any]] = {}
+    if build_cache.enabled:
+        for path in manifest_paths:
+            fingerprint = _import_fingerprint(path, input.overwrite)
+            if fingerprint is None:
+                continue
+            fingerprints[path] = fingerprint
+            record = build_cache.get("import", fingerprint)
+            if record:
+                records[path] = record
+    skipped: list[dict[str, Any]] = []
+    if records:
+        for path in _still_imported(records):
+            skipped.append({**records[path].get("result", {}), "manifest_path": path, "status": "ok", "skipped": True})
+    skipped_paths = {entry["manifest_path"] for entry in skipped}
+    pending = [p for p in manifest_paths if p not in skipped_paths]
+
+    data: dict[str, Any] = {"results": []}
+    if pending:
+        try:
+            data = _execute_ue5_command(
+                "import_assets",
+                {"manifest_paths": pending, "overwrite": input.overwrite},
+                timeout=get_transport().timeout + IMPORT_SECONDS_PER_ASSET * len(pending),
+            )
+        except Exception as e:
+            return ToolError(
+                tool="import_assets",
+                request_id=ctx.request_id or "",
+                run_id=ctx.run_id or "",
+                error=ToolErrorDetail(code="EXECUTION_ERROR", message=str(e))
+            )
+
+    results = data.get("results", [])
+    for entry in results:
+        fingerprint = fingerprints.get(entry.get("manifest_path", ""))
+        if fingerprint and entry.get("status") == "ok":
+            build_cache.put(
+                "import", fingerprint, {"run_id": ctx.run_id or "", "project": data.get("project"), "result": entry}
+            )
+
+    results = skipped + results
+    failed = sum(1 for entry in results if entry.get("status") != "ok")
+    return ToolResult(
+        tool="import_assets",
+        request_id=ctx.request_id or "",
+        run_id=ctx.run_id or "",
+        result={
+            "message": f"Imported {len(results) - failed} of {len(results)} assets",
+            "imported_count": len(results) - failed - len(skipped),
+            "skipped_count": len(skipped),
+            "failed_count": failed,
+            "results": results,
+        },
+        warnings=[f"{e['manifest_path']}: {e.get('error')}" for e in results if e.get("status") != "ok"],
+    )
+
+
+def query_assets(input: QueryAssetsInput) -> ToolResult | ToolError:
+    """
+    Query UE5 assets by path prefix, class and tag.
+
+    Answered from the plugin's in-memory asset index, which is built on the
+    first query and kept current from Asset Registry events.
+    """
+    ctx = get_current_context()
+    try:
+        data = _execute_ue5_command("query_assets", input.model_dump(exclude_none=True))
+    except Exception as e:
+        return ToolError(
+            tool="query_assets",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(code="EXECUTION_ERROR", message=str(e))
+        )
+
+    assets = data.get("assets", [])
+    count = data.get("count", len(assets))
+    warnings = []
+    if data.get("truncated"):
+        warnings.append(f"Returned {len(assets)} of {count} matching assets; raise --limit to see more")
+    return ToolResult(
+        tool="query_assets",
+        request_id=ctx.request_id or "",
+        run_id=ctx.run_id or "",
+        result={"message": f"Found {count} assets", "count": count, "assets": assets},
+        warnings=warnings,
+    )
+
+
 def generate_terrain(input: GenerateTerrainInput) -> ToolResult | ToolError:
     """
     Generate procedural terrain in UE5.
+
+    The heightmap is synthesized locally as uint16 tiles aligned to Landscape
+    components and written to the run directory; UE5 imports the tiles.
     """
     ctx = get_current_context()
 
+    try:
+        from . import terrain
+    except ImportError:
+        return ToolError(
+            tool="generate_terrain",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(
+                code="DEPENDENCY_MISSING",
+                message="Terrain generation requires numpy (pip install 'ue5-mcp[procedural]').",
+            ),
+        )
+
+    seed = input.seed if input.seed is not None else settings.ue5.level_design.default_seed
+    params = terrain.DETAIL_LEVELS[input.detail_level]
+    layout = terrain.landscape_layout(input.width, input.height, input.detail_level)
+    summary = {
+        "seed": seed,
+        "resolution": list(layout.resolution),
+        "layout": layout._asdict(),
+        "tile_grid": list(terrain.tile_grid(layout, input.components_per_tile)),
+    }
+
     if not input.dry_run:
         try:
-            data = _execute_ue5_command("generate_terrain", input.model_dump())
-            result_data = data
+            # Tiles are generated and written one at a time, so memory stays
+            # bounded by the tile size regardless of the terrain size
+            terrain_dir = artifact_manager.ensure_run_dir(ctx.run_id or "local") / "terrain"
+            tiles = terrain.write_tiles(terrain_dir, layout, seed, params, input.components_per_tile)
+            artifacts = [
+                Artifact(
+                    type="application/octet-stream",
+                    uri=f"file://{tile['path']}",
+                    metadata={"type": "heightmap_tile", **{k: tile[k] for k in ("x", "y", "origin", "size")}},
+                )
+                for tile in tiles
+            ]
+            if input.write_heightmap:
+                heightmap_path = terrain.write_memmap(
+                    terrain_dir / "heightmap.npy", layout, seed, params, input.components_per_tile
+                )
+                summary["heightmap_path"] = str(heightmap_path)
+                artifacts.append(Artifact(
+                    type="application/x-npy",
+                    uri=f"file://{heightmap_path}",
+                    metadata={"type": "heightmap", "size": list(layout.resolution)},
+                ))
+
+            data = _execute_ue5_command(
+                "generate_terrain",
+                {**input.model_dump(), **summary, "tiles": tiles},
+            )
+            warnings = list(data.pop("warnings", []))
+            result_data = {**summary, **data, "tiles": len(tiles)}
         except Exception as e:
             return ToolError(
                 tool="generate_terrain",
@@ -136,27 +402,105 @@ def generate_terrain(input: GenerateTerrainInput) -> ToolResult | ToolError:
     else:
         result_data = {
             "message": f"Generated {input.width}x{input.height} terrain ({input.detail_level})",
-            "terrain_path": "/Game/Maps/GeneratedTerrain"
+            "terrain_path": "/Game/Maps/GeneratedTerrain",
+            **summary,
         }
+        artifacts = []
+        warnings = []
 
     return ToolResult(
         tool="generate_terrain",
         request_id=ctx.request_id or "",
         run_id=ctx.run_id or "",
-        result=result_data
+        result=result_data,
+        artifacts=artifacts,
+        warnings=warnings,
     )
 
 
+# Transport timeout allowance per 10k instances written by populate_level
+POPULATE_SECONDS_PER_10K_INSTANCES = 1.0
+
+
+def _placement_bounds(input: PopulateLevelInput) -> tuple[float, float, float, float]:
+    if input.bounds is not None:
+        return input.bounds
+    # default_terrain_size is in meters; UE5 world units are centimeters
+    width, height = settings.ue5.level_design.default_terrain_size
+    return (-width * 50.0, -height * 50.0, width * 50.0, height * 50.0)
+
+
 def populate_level(input: PopulateLevelInput) -> ToolResult | ToolError:
     """
-    Populate a level with assets.
+    Populate a level with instanced assets.
+
+    Transforms are generated locally (seeded and vectorised) and written by
+    the plugin into a Hierarchical Instanced Static Mesh component in one call.
     """
     ctx = get_current_context()
 
+    try:
+        from . import placement
+    except ImportError:
+        return ToolError(
+            tool="populate_level",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(
+                code="DEPENDENCY_MISSING",
+                message="Instance placement requires numpy (pip install 'ue5-mcp[procedural]').",
+            ),
+        )
+
+    warnings = []
+    count = input.density
+    budget = settings.ue5.performance.budgets.max_instances
+    if input.budget_max_instances is not None:
+        budget = min(budget, input.budget_max_instances)
+    if count > budget:
+        warnings.append(f"Requested {count} instances exceeds the budget of {budget}; clamped.")
+        count = budget
+
+    seed = input.seed if input.seed is not None else settings.ue5.level_design.default_seed
+    bounds = _placement_bounds(input)
+    try:
+        height_field = placement.HeightField.load(input.heightmap_path, bounds) if input.heightmap_path else None
+        transforms = placement.generate_transforms(
+            count,
+            bounds,
+            seed=seed,
+            method=input.method,
+            min_spacing=input.min_spacing,
+            height_field=height_field,
+            height_range=input.height_range,
+            max_slope_deg=input.max_slope_deg,
+        )
+    except (OSError, ValueError) as e:
+        return ToolError(
+            tool="populate_level",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(code="VALIDATION_ERROR", message=str(e)),
+        )
+    if len(transforms) < count:
+        warnings.append(f"Placed {len(transforms)} of {count} instances after spacing and terrain filters.")
+
+    summary = {
+        "count": len(transforms),
+        "requested": input.density,
+        "seed": seed,
+        "method": input.method,
+        "bounds": list(bounds),
+    }
+
     if not input.dry_run:
         try:
-            data = _execute_ue5_command("populate_level", input.model_dump())
-            result_data = data
+            data = _execute_ue5_command(
+                "populate_level",
+                {"asset_type": input.asset_type, "transforms": placement.encode_transforms(transforms)},
+                timeout=get_transport().timeout + POPULATE_SECONDS_PER_10K_INSTANCES * len(transforms) / 10000,
+            )
+            result_data = {**summary, **data}
         except Exception as e:
             return ToolError(
                 tool="populate_level",
@@ -166,15 +510,16 @@ def populate_level(input: PopulateLevelInput) -> ToolResult | ToolError:
             )
     else:
         result_data = {
-            "message": f"Populated level with {input.density} instances of '{input.asset_type}'",
-            "count": input.density
+            "message": f"Populated level with {len(transforms)} instances of '{input.asset_type}'",
+            **summary,
         }
 
     return ToolResult(
         tool="populate_level",
         request_id=ctx.request_id or "",
         run_id=ctx.run_id or "",
-        result=result_data
+        result=result_data,
+        warnings=warnings,
     )
 
 
@@ -241,16 +586,27 @@ def generate_blueprint(input: GenerateBlueprintInput) -> ToolResult | ToolError:
     )
 
 
+# Transport timeout allowance per profiled frame
+PROFILE_SECONDS_PER_FRAME = 0.25
+
+
 def profile_performance(input: ProfilePerformanceInput) -> ToolResult | ToolError:
     """
     Profile performance of a level.
+
+    The plugin samples a window of frames; percentiles and hitch counts are
+    computed here and the full per-frame series is stored as an artifact.
     """
     ctx = get_current_context()
+    artifacts = []
 
     if not input.dry_run:
         try:
-            data = _execute_ue5_command("profile_performance", input.model_dump())
-            result_data = data
+            data = _execute_ue5_command(
+                "profile_performance",
+                {"level_name": input.level_name, "frames": input.frames},
+                timeout=get_transport().timeout + PROFILE_SECONDS_PER_FRAME * input.frames,
+            )
         except Exception as e:
             return ToolError(
                 tool="profile_performance",
@@ -258,6 +614,17 @@ def profile_performance(input: ProfilePerformanceInput) -> ToolResult | ToolErro
                 run_id=ctx.run_id or "",
                 error=ToolErrorDetail(code="EXECUTION_ERROR", message=str(e))
             )
+        series = data.get("series", {})
+        result_data = {
+            "message": data.get("message", f"Profiled level '{input.level_name}'"),
+            **profiling.summarize(series, input.hitch_threshold_ms),
+        }
+        if series:
+            artifacts.append(Artifact(
+                type="application/json",
+                content=json.dumps({"level_name": input.level_name, "series": series}),
+                metadata={"type": "profile_series", "filename": "profile_series.json"},
+            ))
     else:
         result_data = {
             "message": f"Profiled level '{input.level_name}'",
@@ -269,38 +636,75 @@ def profile_performance(input: ProfilePerformanceInput) -> ToolResult | ToolErro
         tool="profile_performance",
         request_id=ctx.request_id or "",
         run_id=ctx.run_id or "",
-        result=result_data
+        result=result_data,
+        artifacts=artifacts,
     )
 
 
+# Transport timeout allowance per applied optimization action
+OPTIMIZE_SECONDS_PER_ACTION = 10.0
+
+# Budget keys accepted in OptimizeLevelInput.budgets, mapped to planner metrics
+OPTIMIZATION_BUDGET_KEYS = {
+    "max_draw_calls": "draw_calls",
+    "max_polycount": "triangles",
+    "max_instances": "instances",
+}
+
+
+def _optimization_budgets(overrides: dict[str, Any] | None) -> dict[str, float]:
+    performance = settings.ue5.performance
+    budgets: dict[str, float] = {
+        "draw_calls": performance.budgets.max_draw_calls,
+        "triangles": performance.max_polycount,
+        "instances": performance.budgets.max_instances,
+    }
+    for key, value in (overrides or {}).items():
+        budgets[OPTIMIZATION_BUDGET_KEYS.get(key, key)] = value
+    return budgets
+
+
 def optimize_level(input: OptimizeLevelInput) -> ToolResult | ToolError:
     """
     Optimize level content based on budgets.
+
+    The level inventory is planned against the budgets locally; apply mode
+    sends the selected actions to UE5. Without an ``inventory`` the level's
+    is fetched from UE5, which is read-only and so happens on dry runs too.
     """
     ctx = get_current_context()
-
-    if not input.dry_run:
-        try:
-            data = _execute_ue5_command("optimize_level", input.model_dump())
-            result_data = data
-        except Exception as e:
-            return ToolError(
-                tool="optimize_level",
-                request_id=ctx.request_id or "",
-                run_id=ctx.run_id or "",
-                error=ToolErrorDetail(code="EXECUTION_ERROR", message=str(e))
+    budgets = _optimization_budgets(input.budgets)
+
+    try:
+        inventory = input.inventory
+        if inventory is None:
+            inventory = _execute_ue5_command("level_inventory", {}).get("components", [])
+        plan = optimization.plan(inventory, budgets)
+        if not input.dry_run:
+            data = _execute_ue5_command(
+                "optimize_level",
+                {"actions": plan["actions"]},
+                timeout=get_transport().timeout + OPTIMIZE_SECONDS_PER_ACTION * len(plan["actions"]),
             )
-    else:
-        result_data = {
-            "message": "Optimization pass complete",
-            "optimized_count": 5
-        }
+            result_data = {**plan, **data}
+        else:
+            result_data = {
+                "message": f"Planned {len(plan['actions'])} optimization actions",
+                **plan,
+            }
+    except Exception as e:
+        return ToolError(
+            tool="optimize_level",
+            request_id=ctx.request_id or "",
+            run_id=ctx.run_id or "",
+            error=ToolErrorDetail(code="EXECUTION_ERROR", message=str(e))
+        )
 
     return ToolResult(
         tool="optimize_level",
         request_id=ctx.request_id or "",
         run_id=ctx.run_id or "",
-        result=result_data
+        result=result_data,
     )
 
 
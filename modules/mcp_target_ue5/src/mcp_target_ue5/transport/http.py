@@ -1,6 +1,7 @@
 from typing import Any
 
 import httpx
+from mcp_protocol import wire
 
 from .base import UE5Transport
 
@@ -33,16 +34,23 @@ class CommandError(TransportError):
 class HttpTransport(UE5Transport):
     """
     Transport implementation using HTTP to talk to a UE5 plugin server.
+
+    Requests are JSON until a payload is large enough to compress; the wire
+    format is then negotiated once from the server's ``/health``
+    capabilities (see mcp_protocol.wire). Responses are negotiated per
+    request through the Accept headers.
     """
     def __init__(self, host: str = "localhost", port: int = 8080):
         self.host = host
         self.port = port
         self.base_url = f"http://{host}:{port}"
         self.timeout = 30.0
+        # Negotiated request format; None until the handshake has run
+        self.wire_format: wire.WireFormat | None = None
 
     def connect(self) -> None:
         """
-        Check connectivity to the UE5 server.
+        Check connectivity to the UE5 server and negotiate the wire format.
         """
         try:
             response = httpx.get(f"{self.base_url}/health", timeout=5.0)
@@ -51,6 +59,34 @@ class HttpTransport(UE5Transport):
             raise ConnectionError(f"Failed to connect to UE5 at {self.base_url}: {e}")
         except httpx.HTTPStatusError as e:
             raise ConnectionError(f"UE5 server returned error: {e}")
+        self.wire_format = self._negotiate(response)
+
+    @staticmethod
+    def _negotiate(health: httpx.Response) -> wire.WireFormat:
+        try:
+            body = health.json()
+        except ValueError:
+            return wire.JSON
+        # Servers that predate the handshake advertise nothing: stay on JSON
+        return wire.negotiate(body.get("wire") if isinstance(body, dict) else None)
+
+    def _encode_request(self, payload: dict[str, Any]) -> tuple[bytes, dict[str, str]]:
+        body, fmt = wire.dumps(payload, self.wire_format or wire.JSON)
+        if self.wire_format is None and len(body) >= wire.MIN_COMPRESS_BYTES:
+            try:
+                self.connect()
+            except ConnectionError:
+                self.wire_format = wire.JSON
+            negotiated = self.wire_format or wire.JSON
+            if negotiated != wire.JSON:
+                body, fmt = wire.dumps(payload, negotiated)
+        headers = {
+            "Content-Type": wire.CONTENT_TYPES[fmt.encoding],
+            "Accept": ", ".join(wire.CONTENT_TYPES[e] for e in wire.capabilities()["encodings"]),
+        }
+        if fmt.compression:
+            headers["Content-Encoding"] = fmt.compression
+        return body, headers
 
     def disconnect(self) -> None:
         """
@@ -58,24 +94,34 @@ class HttpTransport(UE5Transport):
         """
         pass
 
-    def send_command(self, command: str, params: dict[str, Any]) -> dict[str, Any]:
+    def send_command(
+        self, command: str, params: dict[str, Any], timeout: float | None = None
+    ) -> dict[str, Any]:
         """
-        Send a JSON command to UE5 via HTTP POST.
+        Send a command to UE5 via HTTP POST.
+        ``timeout`` overrides the default for long-running commands.
         """
+        timeout = timeout or self.timeout
         try:
             payload = {
                 "command": command,
                 "params": params
             }
 
+            content, headers = self._encode_request(payload)
             response = httpx.post(
                 f"{self.base_url}/command",
-                json=payload,
-                timeout=self.timeout
+                content=content,
+                headers=headers,
+                timeout=timeout
             )
             response.raise_for_status()
 
-            result: dict[str, Any] = response.json()
+            # httpx has already undone any Content-Encoding
+            encoding = wire.encoding_for(response.headers.get("Content-Type"))
+            result: dict[str, Any] = (
+                response.json() if encoding == "json" else wire.decode(response.content, encoding)
+            )
 
             if result.get("status") == "error":
                 raise RuntimeError(f"UE5 Error: {result.get('error', 'Unknown error')}")
@@ -83,7 +129,7 @@ class HttpTransport(UE5Transport):
             return result
 
         except httpx.TimeoutException:
-            raise TimeoutError(f"UE5 command '{command}' timed out after {self.timeout}s")
+            raise TimeoutError(f"UE5 command '{command}' timed out after {timeout}s")
         except httpx.RequestError as e:
             raise ConnectionError(f"Network error communicating with UE5: {e}")
         except httpx.HTTPStatusError as e:
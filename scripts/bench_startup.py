@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Startup-time benchmark for the mcp CLI.
+Runs short CLI commands in fresh interpreters and reports wall-clock timings,
+plus which heavy modules each command imported.
+
+Usage:
+    python scripts/bench_startup.py [--runs N] [--max-ms MS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+MODULE_PATHS = [
+    REPO_ROOT / "modules" / "mcp_protocol" / "src",
+    REPO_ROOT / "modules" / "mcp_core" / "src",
+    REPO_ROOT / "modules" / "mcp_cli" / "src",
+    REPO_ROOT / "modules" / "mcp_target_blender" / "src",
+    REPO_ROOT / "modules" / "mcp_target_ue5" / "src",
+]
+HEAVY_MODULES = ["openai", "httpx", "numpy"]
+
+COMMANDS = {
+    "version": ["--version"],
+    "config_get": ["config", "get", "logging.level"],
+    "list_commands": ["list-commands"],
+}
+
+PROBE = """
+import sys
+from mcp.cli import main
+main(sys.argv[1:])
+loaded = [m for m in {heavy!r} if m in sys.modules]
+sys.stderr.write("LOADED:" + ",".join(loaded) + "\\n")
+"""
+
+
+def _env() -> dict[str, str]:
+    env = dict(os.environ)
+    paths = [str(p) for p in MODULE_PATHS]
+    if env.get("PYTHONPATH"):
+        paths.append(env["PYTHONPATH"])
+    env["PYTHONPATH"] = os.pathsep.join(paths)
+    # Keep the benchmark from writing manifests into the user's artifact root
+    env.setdefault("MCP_ARTIFACTS__WRITE_MANIFESTS", "false")
+    return env
+
+
+def run_command(args: list[str], runs: int) -> tuple[list[float], list[str]]:
+    env = _env()
+    timings: list[float] = []
+    loaded: list[str] = []
+    probe = PROBE.format(heavy=HEAVY_MODULES)
+    for _ in range(runs):
+        start = time.perf_counter()
+        proc = subprocess.run(
+            [sys.executable, "-c", probe, *args],
+            env=env,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        timings.append((time.perf_counter() - start) * 1000)
+        for line in proc.stderr.splitlines():
+            if line.startswith("LOADED:"):
+                loaded = [m for m in line[len("LOADED:"):].split(",") if m]
+    return timings, loaded
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark mcp CLI startup time")
+    parser.add_argument("--runs", type=int, default=10, help="Runs per command")
+    parser.add_argument(
+        "--max-ms", type=float, default=None,
+        help="Fail if any command's median exceeds this many milliseconds",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for name, cmd in COMMANDS.items():
+        timings, loaded = run_command(cmd, args.runs)
+        median = statistics.median(timings)
+        print(
+            f"{name:<14} median={median:7.1f}ms  min={min(timings):7.1f}ms  "
+            f"max={max(timings):7.1f}ms  heavy_imports={','.join(loaded) or '-'}"
+        )
+        if args.max_ms is not None and median > args.max_ms:
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
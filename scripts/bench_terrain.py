@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""
+Heightmap synthesis benchmark.
+Generates terrains tile by tile (as generate_terrain does) outside Unreal
+and reports wall-clock timings and throughput per detail level.
+
+Usage:
+    python scripts/bench_terrain.py [--size N] [--levels low,medium,high] [--max-s S]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+sys.path[:0] = [
+    str(REPO_ROOT / "modules" / "mcp_core" / "src"),
+    str(REPO_ROOT / "modules" / "mcp_protocol" / "src"),
+    str(REPO_ROOT / "modules" / "mcp_target_ue5" / "src"),
+]
+
+from mcp_target_ue5.terrain import DETAIL_LEVELS, iter_tiles, landscape_layout  # noqa: E402
+
+
+def run_level(size: int, level: str, seed: int) -> tuple[float, int, int]:
+    layout = landscape_layout(size, size, level)
+    start = time.perf_counter()
+    tiles = 0
+    for _ in iter_tiles(layout, seed, DETAIL_LEVELS[level]):
+        tiles += 1
+    return time.perf_counter() - start, layout.resolution[0], tiles
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark heightmap synthesis")
+    parser.add_argument("--size", type=int, default=8192, help="Heightmap width and height in samples")
+    parser.add_argument("--levels", default="low,medium,high", help="Comma-separated detail levels")
+    parser.add_argument("--seed", type=int, default=0, help="Noise seed")
+    parser.add_argument(
+        "--max-s", type=float, default=None,
+        help="Fail if any level takes longer than this many seconds",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for level in args.levels.split(","):
+        elapsed, resolution, tiles = run_level(args.size, level, args.seed)
+        samples = resolution * resolution
+        print(
+            f"{level:<8} {resolution}x{resolution}  tiles={tiles:<4} "
+            f"time={elapsed:6.2f}s  {samples / elapsed / 1e6:6.1f} Msamples/s"
+        )
+        if args.max_s is not None and elapsed > args.max_s:
+            failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
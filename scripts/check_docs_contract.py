@@ -27,6 +27,9 @@ MCP_PATHS_ALLOWED = {
     "~/.mcp/ue5_mcp_config.json",
     "~/.mcp/artifacts",
     "~/.mcp/artifacts/<run_id>/run_manifest.json",
+    "~/.mcp/cache",
+    "~/.mcp/daemon.sock",
+    "~/.mcp/daemon.log",
 }
 
 
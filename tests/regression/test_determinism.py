@@ -72,3 +72,51 @@ def test_generate_texture_determinism():
 
         blender_server.handle_generate_texture(params)
         mock_seed.assert_called_with(12345)
+
+
+class _FakeCollection(list):
+    """Stand-in for a bpy collection supporting foreach_get."""
+
+    def __init__(self, values, width):
+        super().__init__(values)
+        self.width = width
+
+    def foreach_get(self, attr, out):
+        flat = [v for item in self for v in (item if self.width > 1 else [item])]
+        out[:] = type(out)(out.typecode, flat)
+
+
+def _fake_object(coords):
+    from types import SimpleNamespace
+
+    mesh = SimpleNamespace(
+        vertices=_FakeCollection(coords, 3),
+        loops=_FakeCollection([0, 1, 2], 1),
+        uv_layers=[],
+    )
+    return SimpleNamespace(
+        name="Chair",
+        type="MESH",
+        matrix_world=[[1.0, 0.0, 0.0, 0.0], [0.0, 1.0, 0.0, 0.0], [0.0, 0.0, 1.0, 0.0], [0.0, 0.0, 0.0, 1.0]],
+        modifiers=[],
+        material_slots=[],
+        data=mesh,
+    )
+
+
+def test_object_fingerprint_is_stable_and_tracks_geometry():
+    """Verify object_fingerprint depends only on object state."""
+    bpy = sys.modules["bpy"]
+    bpy.data.filepath = ""
+    coords = [(0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)]
+
+    bpy.data.objects.get.return_value = _fake_object(coords)
+    first = blender_server.handle_object_fingerprint({"object_name": "Chair"})
+    bpy.data.objects.get.return_value = _fake_object(coords)
+    second = blender_server.handle_object_fingerprint({"object_name": "Chair"})
+    bpy.data.objects.get.return_value = _fake_object(coords[:2] + [(0.0, 1.5, 0.0)])
+    moved = blender_server.handle_object_fingerprint({"object_name": "Chair"})
+
+    assert first["fingerprint"] == second["fingerprint"]
+    assert first["fingerprint"] != moved["fingerprint"]
+    assert first["source_file"] is None
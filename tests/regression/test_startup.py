@@ -0,0 +1,69 @@
+"""
+Startup regression checks for the mcp CLI.
+
+Short commands must not import AI providers or HTTP clients, and --version
+must not load settings. Timings are tracked by scripts/bench_startup.py.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+MODULE_PATHS = [
+    REPO_ROOT / "modules" / "mcp_protocol" / "src",
+    REPO_ROOT / "modules" / "mcp_core" / "src",
+    REPO_ROOT / "modules" / "mcp_cli" / "src",
+    REPO_ROOT / "modules" / "mcp_target_blender" / "src",
+    REPO_ROOT / "modules" / "mcp_target_ue5" / "src",
+]
+
+PROBE = """
+import sys
+from mcp.cli import main
+main(sys.argv[1:])
+import mcp_core.config.settings as cfg
+heavy = [m for m in ("openai", "httpx", "mcp_target_blender.tools", "mcp_target_ue5.tools") if m in sys.modules]
+sys.stderr.write("HEAVY=" + ",".join(heavy) + "\\n")
+sys.stderr.write("SETTINGS_LOADED=" + str(cfg._settings is not None) + "\\n")
+"""
+
+
+def _run_cli(tmp_path: Path, *args: str) -> dict[str, str]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(str(p) for p in MODULE_PATHS)
+    env["MCP_ARTIFACTS__ROOT"] = str(tmp_path)
+    proc = subprocess.run(
+        [sys.executable, "-c", PROBE, *args],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    report = {}
+    for line in proc.stderr.splitlines():
+        key, sep, value = line.partition("=")
+        if sep and key in ("HEAVY", "SETTINGS_LOADED"):
+            report[key] = value
+    return report
+
+
+def test_version_does_not_load_settings(tmp_path):
+    report = _run_cli(tmp_path, "--version")
+    assert report["HEAVY"] == ""
+    assert report["SETTINGS_LOADED"] == "False"
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ("config", "get", "logging.level"),
+        ("list-commands",),
+        ("help", "mcp.generate_scene"),
+    ],
+)
+def test_short_commands_skip_heavy_imports(tmp_path, args):
+    report = _run_cli(tmp_path, *args)
+    assert report["HEAVY"] == ""
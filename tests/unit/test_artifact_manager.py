@@ -1,8 +1,12 @@
+import base64
 import json
+import sys
 from pathlib import Path
 
+import httpx
 import pytest
 from mcp_core.storage.artifact_manager import ArtifactManager
+from mcp_core.storage.manifest_writer import ManifestWriter
 from mcp_protocol import Artifact, RunManifest
 
 
@@ -54,6 +58,8 @@ def test_write_run_manifest(artifact_manager, tmp_path):
     )
 
     manifest_path = artifact_manager.write_run_manifest(manifest)
+    # Manifests are written behind by default
+    artifact_manager.flush()
 
     assert manifest_path is not None
     assert manifest_path.exists()
@@ -61,3 +67,73 @@ def test_write_run_manifest(artifact_manager, tmp_path):
     content = json.loads(manifest_path.read_text(encoding="utf-8"))
     assert content["run_id"] == run_id
     assert content["inputs"]["foo"] == "bar"
+
+
+def test_store_stream_deduplicates_blobs(artifact_manager, tmp_path):
+    first = artifact_manager.store_stream("run-a", [b"png", b"data"], "tex.png", "image/png")
+    second = artifact_manager.store_stream("run-b", iter([b"pngdata"]), "other.png", "image/png")
+
+    assert first.metadata["sha256"] == second.metadata["sha256"]
+    assert first.metadata["size"] == 7
+    assert Path(first.uri) == tmp_path / "run-a" / "tex.png"
+    assert Path(second.uri).read_bytes() == b"pngdata"
+    # One blob, linked into both runs
+    blobs = [p for p in (tmp_path / "blobs").rglob("*") if p.is_file()]
+    assert len(blobs) == 1
+    assert Path(first.uri).stat().st_ino == Path(second.uri).stat().st_ino == blobs[0].stat().st_ino
+
+
+def test_download_streams_into_run_dir(artifact_manager, monkeypatch):
+    client = httpx.Client(transport=httpx.MockTransport(lambda request: httpx.Response(200, content=b"x" * 3000)))
+    # The module is shadowed by the artifact_manager instance in mcp_core.storage
+    monkeypatch.setattr(sys.modules[ArtifactManager.__module__], "_http_client", client)
+
+    artifact = artifact_manager.download("run-c", "https://images.example/a.png", "a.png", "image/png")
+
+    assert Path(artifact.uri).read_bytes() == b"x" * 3000
+    assert artifact.content is None
+    assert not list(artifact_manager.blob_root.glob(".tmp-*"))
+
+
+def test_store_artifact_binary(artifact_manager, tmp_path):
+    data = bytes(range(256)) * 10
+    artifact = Artifact(type="image/png", content=data, metadata={"filename": "tex.png"})
+
+    stored = artifact_manager.store_artifact("run-bin", artifact)
+
+    assert stored.content is None
+    assert Path(stored.uri) == tmp_path / "run-bin" / "tex.png"
+    assert Path(stored.uri).read_bytes() == data
+    assert stored.metadata["media_type"] == "image/png"
+    assert stored.metadata["size"] == len(data)
+    # Binary content survives JSON as base64
+    assert Artifact.model_validate_json(artifact.model_dump_json()).content == base64.urlsafe_b64encode(data).decode()
+
+
+@pytest.mark.parametrize("transfer", ["link", "move"])
+def test_store_artifact_takes_over_files(artifact_manager, tmp_path, transfer):
+    source = tmp_path / "export.fbx"
+    source.write_bytes(b"FBX" * 1000)
+    inode = source.stat().st_ino
+    artifact = Artifact(type="model/fbx", uri=f"file://{source}", metadata={"transfer": transfer})
+
+    stored = artifact_manager.store_artifact("run-file", artifact)
+
+    assert Path(stored.uri) == tmp_path / "run-file" / "export.fbx"
+    # Neither moving nor linking copies the data
+    assert Path(stored.uri).stat().st_ino == inode
+    assert source.exists() == (transfer == "link")
+    assert "transfer" not in stored.metadata
+    assert stored.metadata["media_type"] == "model/fbx"
+
+
+def test_manifest_writer_batches_and_flushes(tmp_path):
+    writer = ManifestWriter(max_pending=4, batch_size=3)
+    paths = [tmp_path / f"run-{i}" / "run_manifest.json" for i in range(10)]
+
+    for i, path in enumerate(paths):
+        writer.submit(path, json.dumps({"run_id": i}))
+    writer.close()
+
+    assert [json.loads(p.read_text())["run_id"] for p in paths] == list(range(10))
+    assert not list(tmp_path.glob("*/.*.tmp"))
@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from mcp_core.execution.batch import BatchRunner
+from mcp_core.execution.tool_executor import ToolExecutor
+from mcp_core.observability.context import get_current_context
+from mcp_core.registry import ToolRegistry
+from mcp_protocol import ToolError, ToolResult
+from pydantic import BaseModel
+
+
+class SleepInput(BaseModel):
+    name: str
+    delay: float = 0.0
+
+
+class Tracker:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active: dict[str, int] = {}
+        self.peak: dict[str, int] = {}
+        self.trace_ids: set[str | None] = set()
+
+    def handler(self, target: str):
+        def run(inp: SleepInput) -> ToolResult:
+            with self.lock:
+                self.active[target] = self.active.get(target, 0) + 1
+                self.peak[target] = max(self.peak.get(target, 0), self.active[target])
+                self.trace_ids.add(get_current_context().trace_id)
+            time.sleep(inp.delay)
+            with self.lock:
+                self.active[target] -= 1
+            ctx = get_current_context()
+            return ToolResult(
+                tool=ctx.tool_name or "",
+                request_id=ctx.request_id or "",
+                run_id=ctx.run_id or "",
+                result={"name": inp.name},
+            )
+        return run
+
+
+@pytest.fixture
+def tracker() -> Tracker:
+    return Tracker()
+
+
+@pytest.fixture
+def runner(tracker, monkeypatch) -> BatchRunner:
+    monkeypatch.setattr("mcp_core.execution.tool_executor.artifact_manager", MagicMock())
+    monkeypatch.setattr("mcp_core.execution.tool_executor.policy_engine", MagicMock())
+
+    reg = ToolRegistry()
+    reg.register("mock.blender", "Blender tool", SleepInput, tracker.handler("blender"), target="blender")
+    reg.register("mock.local", "Local tool", SleepInput, tracker.handler("local"))
+    monkeypatch.setattr("mcp_core.execution.tool_executor.registry", reg)
+
+    return BatchRunner(
+        max_workers=4,
+        target_concurrency={"blender": 1},
+        tool_executor=ToolExecutor(),
+        tool_registry=reg,
+    )
+
+
+def _line(tool: str, name: str, delay: float = 0.0, **extra) -> str:
+    return json.dumps({"tool": tool, "input": {"name": name, "delay": delay}, **extra})
+
+
+def test_batch_runs_in_parallel_with_target_limits(runner, tracker):
+    lines = [_line("mock.blender", f"b{i}", 0.02) for i in range(3)]
+    lines += [_line("mock.local", f"l{i}", 0.05) for i in range(4)]
+
+    results = list(runner.run(lines))
+
+    assert all(isinstance(r, ToolResult) for r in results)
+    assert sorted(r.result["name"] for r in results) == sorted(
+        [f"b{i}" for i in range(3)] + [f"l{i}" for i in range(4)]
+    )
+    assert tracker.peak["blender"] == 1
+    assert tracker.peak["local"] > 1
+    # All requests in a batch share one trace
+    assert len(tracker.trace_ids) == 1
+
+
+def test_batch_gives_concurrent_requests_distinct_slots(tracker, monkeypatch):
+    monkeypatch.setattr("mcp_core.execution.tool_executor.artifact_manager", MagicMock())
+    monkeypatch.setattr("mcp_core.execution.tool_executor.policy_engine", MagicMock())
+    slots: dict[str, int] = {}
+    run = tracker.handler("blender")
+
+    def handler(inp: SleepInput) -> ToolResult:
+        slots[inp.name] = get_current_context().target_slot
+        return run(inp)
+
+    reg = ToolRegistry()
+    reg.register("mock.blender", "Blender tool", SleepInput, handler, target="blender")
+    monkeypatch.setattr("mcp_core.execution.tool_executor.registry", reg)
+    runner = BatchRunner(
+        max_workers=4, target_concurrency={"blender": 2}, tool_executor=ToolExecutor(), tool_registry=reg
+    )
+
+    results = list(runner.run([_line("mock.blender", f"b{i}", 0.05) for i in range(4)]))
+
+    assert all(isinstance(r, ToolResult) for r in results)
+    assert tracker.peak["blender"] == 2
+    # Each slot has its own Blender session; the limit bounds the slots in use
+    assert set(slots.values()) == {0, 1}
+
+
+def test_batch_streams_in_completion_order_unless_ordered(runner):
+    lines = [_line("mock.local", "slow", 0.2), _line("mock.local", "fast")]
+
+    assert [r.result["name"] for r in runner.run(lines)] == ["fast", "slow"]
+    assert [r.result["name"] for r in runner.run(lines, ordered=True)] == ["slow", "fast"]
+
+
+def test_batch_reports_invalid_lines_without_running_them(runner, tracker):
+    lines = [
+        "not json",
+        json.dumps({"input": {}}),
+        json.dumps({"tool": "mock.missing", "input": {}}),
+        json.dumps({"tool": "mock.local", "input": {"delay": "soon"}, "request_id": "bad-input"}),
+        "",
+        _line("mock.local", "ok", request_id="good"),
+    ]
+
+    results = list(runner.run(lines, ordered=True))
+
+    assert len(results) == 5
+    errors = [r for r in results if isinstance(r, ToolError)]
+    assert len(errors) == 4
+    assert {e.error.code for e in errors} == {"VALIDATION_ERROR"}
+    assert errors[3].request_id == "bad-input"
+    assert isinstance(results[4], ToolResult)
+    assert results[4].request_id == "good"
+    assert tracker.peak == {"local": 1}
@@ -0,0 +1,82 @@
+import importlib.util
+import json
+import sys
+from array import array
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+from mcp_target_blender.transport import StdioTransport, shm
+
+SERVER_PATH = Path(__file__).resolve().parents[2] / "modules" / "mcp_target_blender" / "scripts" / "blender_server.py"
+
+
+@pytest.fixture
+def server():
+    """Load blender_server with a mocked `bpy` module."""
+    bpy = MagicMock()
+    with patch.dict(sys.modules, {"bpy": bpy}):
+        spec = importlib.util.spec_from_file_location("blender_server_under_test", SERVER_PATH)
+        assert spec and spec.loader
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    # Host and "Blender" share one resource tracker here, so attach without
+    # unregistering (the host's unlink does that)
+    module._attach_shared_memory = lambda name: shm.shared_memory.SharedMemory(name=name)
+    return module, bpy
+
+
+def test_share_round_trips_buffers_through_shared_memory(server) -> None:
+    module, _ = server
+    coords = array("f", [0.5 * i for i in range(3000)])
+    indices = array("i", range(7))
+    params, buffers = shm.share({"mesh": {"co": coords, "loops": [indices]}, "name": "Rock"})
+    assert buffers is not None
+
+    sent = json.loads(json.dumps(params))
+    ref = sent["mesh"]["co"][shm.BUFFER_KEY]
+    assert (ref["format"], ref["count"]) == ("f", 3000)
+    assert sent["mesh"]["loops"][0][shm.BUFFER_KEY]["offset"] % 16 == 0
+
+    attached = module.AttachedBuffers()
+    resolved = attached.resolve(sent)
+    assert resolved["name"] == "Rock"
+    assert resolved["mesh"]["co"].tolist() == coords.tolist()
+    assert resolved["mesh"]["loops"][0].tolist() == list(range(7))
+    attached.close()
+    buffers.close()
+
+
+def test_share_without_buffers_is_a_no_op() -> None:
+    params = {"object_name": "Cube", "location": [0, 0, 0]}
+    assert shm.share(params) == (params, None)
+
+
+def test_generate_texture_sets_pixels_from_buffer(server) -> None:
+    module, bpy = server
+    pixels = array("f", [1.0, 0.0, 0.0, 1.0] * 4)
+    params, buffers = shm.share({"object_name": "Cube", "texture_type": "noise", "pixels": pixels,
+                                 "width": 2, "height": 2})
+    attached = module.AttachedBuffers()
+    try:
+        result = module.handle_generate_texture(attached.resolve(json.loads(json.dumps(params))))
+    finally:
+        attached.close()
+        buffers.close()
+
+    image = bpy.data.images.new.return_value
+    bpy.data.images.new.assert_called_once_with("Cube_noise", 2, 2, alpha=True)
+    assert image.pixels.foreach_set.call_args[0][0] is not None
+    assert result["message"] == "Applied 2x2 generated texture to 'Cube'"
+
+
+def test_transport_releases_shared_block_after_reply() -> None:
+    with patch("subprocess.Popen") as mock_popen:
+        process = mock_popen.return_value
+        process.stdout.readline.return_value = b'{"status": "ok", "data": {}}\n'
+        transport = StdioTransport(blender_path="blender_mock")
+        transport.send_command("generate_texture", {"pixels": array("f", [0.0] * 16)})
+
+    ref = json.loads(process.stdin.write.call_args[0][0])["params"]["pixels"][shm.BUFFER_KEY]
+    with pytest.raises(FileNotFoundError):
+        shm.shared_memory.SharedMemory(name=ref["name"])
@@ -15,6 +15,7 @@ from mcp_target_blender.tools import (
     export_asset,
     generate_scene,
     generate_texture,
+    get_transport,
 )
 from mcp_target_blender.transport import StdioTransport
 
@@ -22,9 +23,9 @@ from mcp_target_blender.transport import StdioTransport
 @pytest.fixture
 def context_setup():
     """Setup execution context for tests."""
-    # Reset global transport
+    # Reset the Blender sessions
     import mcp_target_blender.tools
-    mcp_target_blender.tools._transport = None
+    mcp_target_blender.tools._transports.clear()
 
     token = set_context(
         request_id="req-123",
@@ -34,7 +35,7 @@ def context_setup():
     )
     yield
     token.reset()
-    mcp_target_blender.tools._transport = None
+    mcp_target_blender.tools._transports.clear()
 
 
 @pytest.fixture
@@ -79,7 +80,7 @@ def test_generate_scene_live(context_setup, mock_subprocess) -> None:
             "objects_count": 5
         }
     }
-    mock_subprocess.stdout.readline.return_value = json.dumps(response)
+    mock_subprocess.stdout.readline.return_value = json.dumps(response).encode()
 
     input_data = GenerateSceneInput(
         description="Live run",
@@ -122,7 +123,7 @@ def test_add_object_live(context_setup, mock_subprocess) -> None:
             "location": {"x": 1.0, "y": 2.0, "z": 3.0}
         }
     }
-    mock_subprocess.stdout.readline.return_value = json.dumps(response)
+    mock_subprocess.stdout.readline.return_value = json.dumps(response).encode()
 
     input_data = AddObjectInput(
         object_type="Sphere",
@@ -165,7 +166,7 @@ def test_generate_texture_live(context_setup, mock_subprocess) -> None:
             "texture_path": "/tmp/marble.png"
         }
     }
-    mock_subprocess.stdout.readline.return_value = json.dumps(response)
+    mock_subprocess.stdout.readline.return_value = json.dumps(response).encode()
 
     input_data = GenerateTextureInput(
         object_name="Sphere",
@@ -224,7 +225,7 @@ def test_export_asset_live(context_setup, mock_subprocess) -> None:
             "file_size": 1024
         }
     }
-    mock_subprocess.stdout.readline.return_value = json.dumps(response)
+    mock_subprocess.stdout.readline.return_value = json.dumps(response).encode()
 
     input_data = ExportAssetInput(
         object_name="Sphere",
@@ -253,6 +254,20 @@ def test_export_asset_live(context_setup, mock_subprocess) -> None:
     assert artifact.metadata["type"] == "export_manifest"
 
 
+def test_get_transport_keeps_one_session_per_slot(context_setup) -> None:
+    first = get_transport()
+    assert get_transport() is first
+
+    token = set_context(target_slot=1)
+    try:
+        second = get_transport()
+    finally:
+        token.reset()
+
+    assert second is not first
+    assert get_transport() is first
+
+
 def test_transport_connection(mock_subprocess) -> None:
     transport = StdioTransport(blender_path="blender_mock")
 
@@ -262,7 +277,7 @@ def test_transport_connection(mock_subprocess) -> None:
 
     # Test send_command
     response_data = {"status": "ok", "data": "pong"}
-    mock_subprocess.stdout.readline.return_value = json.dumps(response_data)
+    mock_subprocess.stdout.readline.return_value = json.dumps(response_data).encode()
 
     resp = transport.send_command("ping", {})
     assert resp["status"] == "ok"
@@ -274,3 +289,97 @@ def test_transport_connection(mock_subprocess) -> None:
     # Test disconnect
     transport.disconnect()
     mock_subprocess.terminate.assert_called()
+
+
+@pytest.fixture
+def incremental_builds(tmp_path, monkeypatch):
+    from mcp_core.config.settings import settings
+
+    monkeypatch.setattr(settings.cache, "incremental_builds", True)
+    monkeypatch.setattr(settings.cache, "root", tmp_path / "cache")
+    return tmp_path
+
+
+def test_export_asset_reuses_unchanged_export(context_setup, mock_subprocess, incremental_builds) -> None:
+    export_path = incremental_builds / "chair.fbx"
+    fingerprint = {"status": "ok", "data": {"fingerprint": "state-1", "source_file": None}}
+    exported = {"status": "ok", "data": {"message": "Exported", "format": "fbx"}}
+
+    def respond():
+        request = json.loads(mock_subprocess.stdin.write.call_args[0][0])
+        if request["command"] == "export_asset":
+            export_path.write_bytes(b"fbx-data")
+            return json.dumps(exported).encode()
+        return json.dumps(fingerprint).encode()
+
+    mock_subprocess.stdout.readline.side_effect = respond
+    input_data = ExportAssetInput(object_name="Chair", format="fbx", filepath=str(export_path))
+
+    first = export_asset(input_data)
+    second = export_asset(input_data)
+
+    commands = [json.loads(c[0][0])["command"] for c in mock_subprocess.stdin.write.call_args_list]
+    assert commands == ["object_fingerprint", "export_asset", "object_fingerprint"]
+
+    first_manifest = json.loads(first.artifacts[0].content)
+    second_manifest = json.loads(second.artifacts[0].content)
+    assert first_manifest["provenance"]["reused"] is False
+    assert second.result["reused"] is True
+    assert second_manifest["provenance"]["reused"] is True
+    assert second_manifest["provenance"]["export_hash"] == first_manifest["provenance"]["export_hash"]
+
+    # A changed object state re-exports
+    fingerprint["data"]["fingerprint"] = "state-2"
+    export_asset(input_data)
+    assert json.loads(mock_subprocess.stdin.write.call_args[0][0])["command"] == "export_asset"
+
+
+def test_transport_negotiates_frames_for_large_requests(mock_subprocess) -> None:
+    from mcp_protocol import wire
+
+    transport = StdioTransport(blender_path="blender_mock")
+    transport.connect()
+    pong = {"id": 0, "status": "ok", "data": "pong", "wire": {"encodings": ["json"], "compression": ["gzip"]}}
+    mock_subprocess.stdout.readline.side_effect = [
+        json.dumps(pong).encode() + b"\n",
+        b"#json identity 30\n",
+    ]
+    mock_subprocess.stdout.read.return_value = json.dumps({"status": "ok", "data": {"n": 1}}).encode()
+
+    objects = [{"object_type": "cube", "location": {"x": i, "y": 0, "z": 0}} for i in range(2000)]
+    resp = transport.send_command("generate_scene", {"objects": objects})
+
+    assert resp["data"] == {"n": 1}
+    assert transport.wire_format == wire.WireFormat("json", "gzip")
+    handshake, frame = [c[0][0] for c in mock_subprocess.stdin.write.call_args_list]
+    assert json.loads(handshake)["params"]["wire"] == wire.capabilities()
+    header, _, payload = frame.partition(b"\n")
+    fmt, length = wire.parse_frame_header(header)
+    assert fmt.compression == "gzip"
+    assert wire.loads(payload[:length], fmt)["params"]["objects"] == objects
+
+
+def test_generate_texture_procedural_sends_pixel_buffer(context_setup, mock_subprocess) -> None:
+    pytest.importorskip("numpy")
+    response = {"id": 1, "status": "ok", "data": {"message": "Applied 64x64 generated texture to 'Floor'"}}
+    mock_subprocess.stdout.readline.return_value = json.dumps(response).encode()
+
+    input_data = GenerateTextureInput(
+        object_name="Floor",
+        texture_type="bricks",
+        pattern="bricks",
+        seed=7,
+        resolution="64",
+        normal_map=True,
+    )
+
+    result = generate_texture(input_data)
+
+    assert result.status == "ok"
+    assert result.result["resolution"] == 64
+    assert result.result["seed"] == 7
+    args, _ = mock_subprocess.stdin.write.call_args
+    params = json.loads(args[0])["params"]
+    assert params["width"] == params["height"] == 64
+    assert params["pixels"]["$buffer"]["count"] == 64 * 64 * 4
+    assert params["normal_pixels"]["$buffer"]["count"] == 64 * 64 * 4
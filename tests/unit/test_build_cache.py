@@ -0,0 +1,52 @@
+import os
+
+from mcp_core.storage.build_cache import BuildCache
+
+
+def test_fingerprint_is_order_independent():
+    a = BuildCache.fingerprint(params={"x": 1, "y": 2}, source_hash="abc")
+    b = BuildCache.fingerprint(source_hash="abc", params={"y": 2, "x": 1})
+
+    assert a == b
+    assert a != BuildCache.fingerprint(params={"x": 1, "y": 3}, source_hash="abc")
+
+
+def test_file_hash_tracks_content_changes(tmp_path):
+    cache = BuildCache(root=tmp_path)
+    path = tmp_path / "asset.fbx"
+
+    assert cache.file_hash(path) is None
+
+    path.write_bytes(b"v1")
+    first = cache.file_hash(path)
+    assert first == cache.file_hash(path)
+
+    path.write_bytes(b"v2-longer")
+    assert cache.file_hash(path) != first
+
+
+def test_file_hash_is_memoized_by_stat(tmp_path):
+    cache = BuildCache(root=tmp_path)
+    path = tmp_path / "asset.fbx"
+    path.write_bytes(b"v1")
+    stat = path.stat()
+    first = cache.file_hash(path)
+
+    # Same size and mtime: the memoized digest is returned without re-reading
+    path.write_bytes(b"v2")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    assert cache.file_hash(path) == first
+
+
+def test_records_round_trip_and_clear(tmp_path):
+    cache = BuildCache(root=tmp_path)
+    key = BuildCache.fingerprint(step="export")
+
+    assert cache.get("export", key) is None
+    cache.put("export", key, {"export_hash": "abc", "result": {"format": "fbx"}})
+
+    assert cache.get("export", key) == {"export_hash": "abc", "result": {"format": "fbx"}}
+    assert cache.get("import", key) is None
+
+    cache.clear()
+    assert cache.get("export", key) is None
@@ -1,4 +1,4 @@
-from mcp_core.config.settings import McpSettings
+from mcp_core.config.settings import McpSettings, config_hash
 
 
 def test_defaults():
@@ -23,3 +23,54 @@ def test_artifacts_path_expansion():
     # but we can check it's absolute
     settings = McpSettings()
     assert settings.artifacts.root.is_absolute()
+
+def test_config_hash_is_stable():
+    assert config_hash(McpSettings()) == config_hash(McpSettings())
+
+def test_config_hash_tracks_changes():
+    settings = McpSettings()
+    before = config_hash(settings)
+    assert config_hash(settings) == before
+
+    settings.policy.allow_destructive = True
+    changed = config_hash(settings)
+    assert changed != before
+
+    settings.policy.allow_destructive = False
+    assert config_hash(settings) == before
+
+def test_config_hash_tracks_in_place_list_changes():
+    settings = McpSettings()
+    before = config_hash(settings)
+
+    settings.policy.allowed_paths.append("/srv/project")
+    assert config_hash(settings) != before
+
+    settings.policy.allowed_paths.clear()
+    assert config_hash(settings) == before
+
+def test_config_hash_env_override(monkeypatch):
+    baseline = config_hash(McpSettings())
+    monkeypatch.setenv("MCP_LOGGING__LEVEL", "DEBUG")
+    assert config_hash(McpSettings()) != baseline
+
+def test_global_settings_load_lazily(monkeypatch):
+    import mcp_core.config.settings as cfg
+
+    monkeypatch.setattr(cfg, "_settings", None)
+    assert cfg._settings is None
+
+    assert cfg.settings.logging.level == cfg.get_settings().logging.level
+    assert cfg._settings is not None
+
+def test_reload_settings_picks_up_environment(monkeypatch):
+    import mcp_core.config.settings as cfg
+
+    monkeypatch.setattr(cfg, "_settings", None)
+    before = config_hash(cfg.settings)
+
+    monkeypatch.setenv("MCP_LOGGING__LEVEL", "DEBUG")
+    cfg.reload_settings()
+
+    assert cfg.settings.logging.level == "DEBUG"
+    assert config_hash(cfg.settings) != before
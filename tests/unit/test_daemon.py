@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import json
+import os
+import stat
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+CLI_SRC = Path(__file__).resolve().parents[2] / "modules" / "mcp_cli" / "src"
+sys.path.insert(0, str(CLI_SRC))
+
+from mcp.daemon import default_socket_path, forward_to_daemon, is_daemon_running, stop_daemon  # noqa: E402
+
+# The daemon redirects the process-wide stdout/stderr while it runs a request,
+# so it is started in its own interpreter rather than a thread of the test.
+RUNNER = """
+import json, os, sys
+from pathlib import Path
+from mcp.daemon import serve
+
+reloads = []
+
+def runner(argv):
+    if argv == ["bad-args"]:
+        raise SystemExit(2)
+    if argv == ["crash"]:
+        raise RuntimeError("boom")
+    if argv == ["env"]:
+        print(json.dumps({"level": os.environ.get("MCP_LOGGING__LEVEL"), "reloads": len(reloads)}))
+        return 0
+    print(json.dumps({"argv": argv, "cwd": os.getcwd()}))
+    print("warning", file=sys.stderr)
+    return 3 if argv == ["exit-3"] else 0
+
+serve(Path(sys.argv[1]), runner, on_environment_change=lambda: reloads.append(1))
+"""
+
+
+@pytest.fixture
+def socket_path() -> Iterator[Path]:
+    # AF_UNIX paths are length-limited, so avoid pytest's deep tmp_path
+    with tempfile.TemporaryDirectory(prefix="mcpd") as tmp:
+        yield Path(tmp) / "mcp.sock"
+
+
+@pytest.fixture
+def daemon(socket_path: Path) -> Iterator[subprocess.Popen]:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join([str(CLI_SRC), os.environ.get("PYTHONPATH", "")]))
+    proc = subprocess.Popen(
+        [sys.executable, "-c", textwrap.dedent(RUNNER), str(socket_path)],
+        env=env,
+        stdout=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 10
+    while not is_daemon_running(socket_path):
+        assert proc.poll() is None and time.monotonic() < deadline, "daemon did not start"
+        time.sleep(0.05)
+    yield proc
+    stop_daemon(socket_path)
+    proc.wait(10)
+
+
+def test_forward_streams_output_and_exit_code(daemon, socket_path, capsys):
+    assert forward_to_daemon(["exit-3"], socket_path) == 3
+
+    captured = capsys.readouterr()
+    assert json.loads(captured.out) == {"argv": ["exit-3"], "cwd": os.getcwd()}
+    assert captured.err == "warning\n"
+
+
+def test_runner_exits_and_errors_are_reported(daemon, socket_path, capsys):
+    assert forward_to_daemon(["bad-args"], socket_path) == 2
+    assert forward_to_daemon(["crash"], socket_path) == 1
+    assert "RuntimeError: boom" in capsys.readouterr().err
+    # The daemon keeps serving after a failed request
+    assert is_daemon_running(socket_path)
+
+
+def test_forward_applies_client_environment(daemon, socket_path, monkeypatch, capsys):
+    monkeypatch.delenv("MCP_LOGGING__LEVEL", raising=False)
+    forward_to_daemon(["env"], socket_path)
+    baseline = json.loads(capsys.readouterr().out)
+    assert baseline["level"] is None
+
+    monkeypatch.setenv("MCP_LOGGING__LEVEL", "DEBUG")
+    forward_to_daemon(["env"], socket_path)
+    forward_to_daemon(["env"], socket_path)
+    first, second = (json.loads(line) for line in capsys.readouterr().out.splitlines())
+    assert first == {"level": "DEBUG", "reloads": baseline["reloads"] + 1}
+    # Settings are only reloaded when the forwarded environment changes
+    assert second == first
+
+    monkeypatch.delenv("MCP_LOGGING__LEVEL")
+    forward_to_daemon(["env"], socket_path)
+    assert json.loads(capsys.readouterr().out) == {"level": None, "reloads": baseline["reloads"] + 2}
+
+
+def test_forward_without_daemon_returns_none(socket_path):
+    assert forward_to_daemon(["list-commands"], socket_path) is None
+
+    # A socket file left behind by a dead daemon is not reachable either
+    socket_path.touch()
+    assert forward_to_daemon(["list-commands"], socket_path) is None
+    assert not is_daemon_running(socket_path)
+
+
+def test_socket_is_owner_only(daemon, socket_path):
+    assert stat.S_IMODE(socket_path.stat().st_mode) == 0o600
+
+
+def test_default_socket_path_follows_config_files(tmp_path, monkeypatch):
+    config = tmp_path / "blender_mcp_config.json"
+    config.write_text(json.dumps({"daemon": {"socket_path": str(tmp_path / "configured.sock")}}))
+    monkeypatch.setattr("mcp_core.config.files.CONFIG_FILES", (tmp_path / "missing.json", config))
+    monkeypatch.delenv("MCP_DAEMON__SOCKET_PATH", raising=False)
+
+    assert default_socket_path() == tmp_path / "configured.sock"
+
+    # The environment overrides config files, as it does for the settings
+    monkeypatch.setenv("MCP_DAEMON__SOCKET_PATH", str(tmp_path / "env.sock"))
+    assert default_socket_path() == tmp_path / "env.sock"
+
+
+def test_stop_removes_socket(daemon, socket_path):
+    assert stop_daemon(socket_path)
+    daemon.wait(10)
+
+    assert not socket_path.exists()
+    assert not stop_daemon(socket_path)
+
+
+def test_cli_forwards_to_daemon(daemon, socket_path, monkeypatch, capsys):
+    from mcp.cli import main
+
+    monkeypatch.setenv("MCP_DAEMON__SOCKET_PATH", str(socket_path))
+    monkeypatch.delenv("MCP_NO_DAEMON", raising=False)
+
+    assert main(["config", "get", "logging.level"]) == 0
+    assert json.loads(capsys.readouterr().out)["argv"] == ["config", "get", "logging.level"]
+
+    # --version never needs the daemon
+    assert main(["--version"]) == 0
+    assert capsys.readouterr().out.strip() == "1.0.0"
@@ -1,3 +1,4 @@
+import os
 from unittest.mock import MagicMock
 
 import pytest
@@ -71,6 +72,8 @@ def test_execute_success(mock_storage, mock_policy):
     assert manifest.tool_name == "mock.tool"
     assert manifest.status == "success"
     assert manifest.inputs["value"] == "hello"
+    assert manifest.config_hash is not None
+    assert len(manifest.config_hash) == 64
 
 def test_execute_tool_not_found(mock_storage):
     executor = ToolExecutor()
@@ -122,3 +125,136 @@ def test_execute_policy_denied(mock_storage, mock_policy):
     assert "Not allowed" in result.error.message
 
     mock_storage.write_run_manifest.assert_called_once()
+
+def test_execute_uses_result_cache(mock_storage, mock_policy, monkeypatch, tmp_path):
+    from mcp_core.config.settings import McpSettings
+    from mcp_core.storage.result_cache import ResultCache
+
+    calls = []
+
+    def counting_handler(input: MockInput) -> ToolResult:
+        calls.append(input.value)
+        return ToolResult(
+            tool="mock.pure", request_id="req-1", run_id="run-1", result={"echo": input.value}
+        )
+
+    registry.register(
+        "mock.pure", "Deterministic Tool", MockInput, counting_handler, deterministic=True
+    )
+
+    settings = McpSettings()
+    settings.cache.enabled = True
+    monkeypatch.setattr("mcp_core.execution.tool_executor.settings", settings)
+    monkeypatch.setattr(
+        "mcp_core.execution.tool_executor.result_cache", ResultCache(root=tmp_path)
+    )
+
+    executor = ToolExecutor()
+    first = executor.execute("mock.pure", {"value": "seeded"})
+    second = executor.execute("mock.pure", {"value": "seeded"})
+
+    assert isinstance(second, ToolResult)
+    assert second.result == first.result
+    assert second.run_id != first.run_id
+    assert calls == ["seeded"]
+
+    executor.execute("mock.pure", {"value": "other"})
+    assert calls == ["seeded", "other"]
+
+def test_result_cache_keys_input_files_by_content(mock_storage, mock_policy, monkeypatch, tmp_path):
+    from mcp_core.config.settings import McpSettings
+    from mcp_core.storage.result_cache import ResultCache
+
+    class HeightmapInput(BaseModel):
+        heightmap_path: str
+
+    calls = []
+
+    def handler(input: HeightmapInput) -> ToolResult:
+        calls.append(input.heightmap_path)
+        return ToolResult(tool="mock.place", request_id="req-1", run_id="run-1", result={})
+
+    registry.register(
+        "mock.place", "Placement Tool", HeightmapInput, handler,
+        deterministic=True, path_fields=("heightmap_path",),
+    )
+    settings = McpSettings()
+    settings.cache.enabled = True
+    monkeypatch.setattr("mcp_core.execution.tool_executor.settings", settings)
+    monkeypatch.setattr("mcp_core.execution.tool_executor.result_cache", ResultCache(root=tmp_path / "cache"))
+    heightmap = tmp_path / "height.r16"
+    heightmap.write_bytes(b"\x00\x01")
+    executor = ToolExecutor()
+
+    executor.execute("mock.place", {"heightmap_path": str(heightmap)})
+    executor.execute("mock.place", {"heightmap_path": str(heightmap)})
+    assert len(calls) == 1
+
+    # Regenerated at the same path: the cached result is stale
+    heightmap.write_bytes(b"\x00\x02\x03")
+    executor.execute("mock.place", {"heightmap_path": str(heightmap)})
+    assert len(calls) == 2
+
+    # Directories cannot be keyed by content, so those calls are not cached
+    executor.execute("mock.place", {"heightmap_path": str(tmp_path)})
+    executor.execute("mock.place", {"heightmap_path": str(tmp_path)})
+    assert len(calls) == 4
+
+def test_execute_cache_disabled_by_default(mock_storage, mock_policy):
+    calls = []
+
+    def counting_handler(input: MockInput) -> ToolResult:
+        calls.append(input.value)
+        return mock_handler(input)
+
+    registry.register(
+        "mock.pure", "Deterministic Tool", MockInput, counting_handler, deterministic=True
+    )
+
+    executor = ToolExecutor()
+    executor.execute("mock.pure", {"value": "seeded"})
+    executor.execute("mock.pure", {"value": "seeded"})
+
+    assert calls == ["seeded", "seeded"]
+
+def test_read_only_system_tool_manifests_can_be_skipped(mock_storage, mock_policy, monkeypatch):
+    from mcp_core.config.settings import settings
+
+    registry.register("mock.read", "Read-only Tool", MockInput, mock_handler, read_only=True)
+    monkeypatch.setattr(settings.artifacts, "skip_read_only_manifests", True)
+    executor = ToolExecutor()
+
+    executor.execute("mock.read", MockInput(value="x"))
+    mock_storage.write_run_manifest.assert_not_called()
+
+    executor.execute("mock.tool", MockInput(value="x"))
+    mock_storage.write_run_manifest.assert_called_once()
+
+def test_policy_checks_follow_tool_metadata(mock_storage, mock_policy):
+    class ExportInput(BaseModel):
+        value: str
+        manifest_paths: list[str] = []
+        dry_run: bool = False
+
+    def handler(input: ExportInput) -> ToolResult:
+        return mock_handler(MockInput(value=input.value))
+
+    registry.register(
+        "mock.export", "Export Tool", ExportInput, handler, target="blender", path_fields=("manifest_paths",)
+    )
+    registry.register("mock.inspect", "Inspect Tool", ExportInput, handler, target="blender", read_only=True)
+    executor = ToolExecutor()
+
+    executor.execute("mock.export", {"value": "x", "manifest_paths": ["a.json", "b.json"]})
+    mock_policy.check_destructive_allowed.assert_called_with("mock.export", True)
+    # Path fields are made absolute before the checks and the handler see them
+    assert [c.args[0] for c in mock_policy.check_path_allowed.call_args_list] == [
+        os.path.abspath("a.json"),
+        os.path.abspath("b.json"),
+    ]
+
+    executor.execute("mock.export", {"value": "x", "dry_run": True})
+    mock_policy.check_destructive_allowed.assert_called_with("mock.export", False)
+
+    executor.execute("mock.inspect", {"value": "x"})
+    mock_policy.check_destructive_allowed.assert_called_with("mock.inspect", False)
@@ -0,0 +1,102 @@
+import sys
+
+import httpx
+import pytest
+from mcp_core.ai.client import AIClient
+from mcp_core.ai.image_cache import ImageCache, generate_image_artifacts, image_cache
+from mcp_core.ai.models import (
+    AICompletionRequest,
+    AICompletionResponse,
+    AIModelUsage,
+    ImageGenerationRequest,
+    ImageGenerationResponse,
+)
+from mcp_core.ai.provider import AIProvider
+from mcp_core.config.settings import AIConfig, SafetyConfig, settings
+from mcp_core.storage import ArtifactManager
+
+
+class ImageProvider(AIProvider):
+    def __init__(self):
+        self.calls = 0
+
+    @property
+    def name(self) -> str:
+        return "mock"
+
+    async def generate_text(self, request: AICompletionRequest) -> AICompletionResponse:
+        raise NotImplementedError
+
+    async def generate_image(self, request: ImageGenerationRequest) -> ImageGenerationResponse:
+        self.calls += 1
+        return ImageGenerationResponse(
+            urls=[f"https://images.example/{request.prompt}/{self.calls}.png"],
+            usage=AIModelUsage(cost_usd=0.04),
+        )
+
+    async def check_health(self) -> bool:
+        return True
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.artifacts, "root", tmp_path)
+    # Every download returns the same bytes for a prompt, whatever the URL
+    client = httpx.Client(transport=httpx.MockTransport(
+        lambda request: httpx.Response(200, content=request.url.path.split("/")[1].encode() * 100)
+    ))
+    monkeypatch.setattr(sys.modules[ArtifactManager.__module__], "_http_client", client)
+    image_cache._index = None
+    yield tmp_path
+    image_cache._index = None
+
+
+def _client(provider: AIProvider) -> AIClient:
+    return AIClient(provider=provider, config=AIConfig(), safety_config=SafetyConfig())
+
+
+def test_repeated_prompts_are_generated_once(store):
+    provider = ImageProvider()
+    client = _client(provider)
+    request = ImageGenerationRequest(prompt="wood")
+
+    first = generate_image_artifacts(client, request, "run-1", "texture_a.png")
+    second = generate_image_artifacts(client, request, "run-2", "texture_b.png")
+    generate_image_artifacts(client, ImageGenerationRequest(prompt="wood", size="512x512"), "run-2", "c.png")
+
+    assert provider.calls == 2
+    assert second[0].metadata["cached"] is True
+    assert second[0].metadata["sha256"] == first[0].metadata["sha256"]
+    assert (store / "run-2" / "texture_b.png").read_bytes() == b"wood" * 100
+    # Cached images are free unless configured otherwise
+    assert client.budget_tracker.current_cost_usd == pytest.approx(0.08)
+
+
+def test_cached_images_can_count_against_budget(store, monkeypatch):
+    monkeypatch.setattr(settings.ai.image_cache, "count_against_budget", True)
+    client = _client(ImageProvider())
+    request = ImageGenerationRequest(prompt="stone")
+
+    generate_image_artifacts(client, request, "run-1", "a.png")
+    generate_image_artifacts(client, request, "run-1", "b.png")
+
+    assert client.budget_tracker.current_cost_usd == pytest.approx(0.08)
+    assert client.budget_tracker.request_count == 2
+
+
+def test_eviction_drops_least_recently_used_entries_and_their_blobs(store):
+    manager = ArtifactManager()
+    cache = ImageCache(max_bytes=250)
+    first = manager.store_stream("run", [b"a" * 100], "a.png", "image/png")
+    second = manager.store_stream("run", [b"b" * 100], "b.png", "image/png")
+    third = manager.store_stream("run", [b"c" * 100], "c.png", "image/png")
+
+    cache.put("k1", [first])
+    cache.put("k2", [second])
+    assert cache.get("k1") is not None
+    cache.put("k3", [third])
+
+    assert cache.get("k2") is None
+    assert not manager.blob_path(second.metadata["sha256"]).exists()
+    assert cache.get("k1") is not None and cache.get("k3") is not None
+    assert len(ImageCache()) == 2
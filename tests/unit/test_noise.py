@@ -0,0 +1,49 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_core.procedural import fbm, perlin, perlin_grid  # noqa: E402
+
+
+def test_perlin_grid_matches_pointwise_evaluation():
+    xs = np.linspace(-3.2, 7.9, 120)
+    ys = np.linspace(10.1, 14.6, 80)
+
+    grid = perlin_grid(xs, ys, seed=3)
+
+    assert grid.shape == (80, 120)
+    assert np.allclose(grid, perlin(xs[None, :], ys[:, None], seed=3), atol=1e-5)
+    # Gradient noise is zero on lattice points
+    assert perlin_grid(np.arange(4.0), np.arange(3.0), seed=3) == pytest.approx(np.zeros((3, 4)), abs=1e-6)
+
+
+def test_noise_is_seeded():
+    xs = ys = np.linspace(0, 4, 64)
+
+    assert np.array_equal(fbm(xs, ys, seed=1), fbm(xs, ys, seed=1))
+    assert not np.array_equal(fbm(xs, ys, seed=1), fbm(xs, ys, seed=2))
+
+
+@pytest.mark.parametrize("options", [{}, {"ridged": True}, {"warp": 0.8}])
+def test_fbm_regions_are_seamless(options):
+    xs = np.arange(96) / 32
+    ys = np.arange(64) / 32
+
+    full = fbm(xs, ys, seed=5, octaves=4, **options)
+    left = fbm(xs[:40], ys, seed=5, octaves=4, **options)
+    right = fbm(xs[40:], ys, seed=5, octaves=4, **options)
+
+    assert np.allclose(np.hstack([left, right]), full, atol=1e-6)
+    assert np.abs(full).max() <= 1.0
+
+
+def test_fbm_tiles_with_integer_frequency():
+    coords = np.arange(64) / 64
+
+    tile = fbm(coords, coords, seed=2, octaves=4, frequency=4, tile=True)
+    shifted = fbm(coords + 1.0, coords + 2.0, seed=2, octaves=4, frequency=4, tile=True)
+
+    # One texture-space unit later the pattern repeats exactly
+    assert np.allclose(tile, shifted, atol=1e-6)
+    with pytest.raises(ValueError):
+        fbm(coords, coords, seed=2, frequency=2.5, tile=True)
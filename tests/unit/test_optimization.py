@@ -0,0 +1,60 @@
+from mcp_target_ue5.optimization import estimate_cost, plan
+
+
+def _component(actor: str, mesh: str, **overrides) -> dict:
+    entry = {
+        "actor": actor, "component": "StaticMeshComponent0", "mesh": mesh, "triangles": 1000,
+        "materials": 2, "instances": 1, "instanced": False, "lods": 4, "cull_distance": 1000.0,
+        "bounds_radius": 500.0,
+    }
+    entry.update(overrides)
+    return entry
+
+
+def _level() -> list[dict]:
+    rocks = [_component(f"Rock_{i}", "/Game/SM_Rock") for i in range(50)]
+    statue = [_component("Statue", "/Game/SM_Statue", triangles=200000, lods=1)]
+    props = [_component(f"Cup_{i}", "/Game/SM_Cup", cull_distance=0.0, bounds_radius=20.0) for i in range(3)]
+    grass = [_component("Grass", "/Game/SM_Grass", instanced=True, instances=10000, triangles=50, materials=1)]
+    return rocks + statue + props + grass
+
+
+def test_estimate_cost():
+    cost = estimate_cost(_level())
+
+    assert cost == {"draw_calls": 50 * 2 + 2 + 3 * 2 + 1, "triangles": 50000 + 200000 + 3000 + 500000,
+                    "instances": 50 + 1 + 3 + 10000}
+
+
+def test_plan_ranks_actions_for_exceeded_budgets():
+    result = plan(_level(), {"draw_calls": 60, "triangles": 10_000_000, "instances": 200000})
+
+    assert result["over_budget"] == ["draw_calls"]
+    first = result["actions"][0]
+    assert first["kind"] == "merge_to_instances"
+    assert first["params"] == {"mesh": "/Game/SM_Rock"}
+    assert len(first["targets"]) == 50
+    # Components, not whole actors, are merged
+    assert all(target.count(".") == 1 for target in first["targets"])
+    assert first["savings"] == {"draw_calls": 98.0}
+    assert result["projected"]["draw_calls"] <= 60
+    # LODs help no exceeded budget, so they are ranked but not selected
+    assert "generate_lods" not in [a["kind"] for a in result["actions"]]
+    assert "generate_lods" in [a["kind"] for a in result["candidates"]]
+
+
+def test_plan_targets_triangles_and_culling():
+    result = plan(_level(), {"draw_calls": 1000, "triangles": 500000, "instances": 200000})
+
+    kinds = [a["kind"] for a in result["actions"]]
+    assert kinds[0] == "generate_lods"
+    assert result["actions"][0]["targets"] == ["/Game/SM_Statue"]
+    cull = next(a for a in result["candidates"] if a["kind"] == "set_cull_distance")
+    assert cull["params"]["distances"] == {f"Cup_{i}.StaticMeshComponent0": 1000.0 for i in range(3)}
+
+
+def test_plan_within_budget_selects_nothing():
+    result = plan(_level(), {"draw_calls": 10_000, "triangles": 10_000_000, "instances": 200000})
+
+    assert result["over_budget"] == []
+    assert result["actions"] == []
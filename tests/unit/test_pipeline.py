@@ -0,0 +1,207 @@
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+from mcp_core.execution.tool_executor import ToolExecutor
+from mcp_core.observability.context import get_current_context
+from mcp_core.planning import Pipeline, PipelineRunner, resolve_references
+from mcp_core.registry import ToolRegistry
+from mcp_protocol import Artifact, ToolError, ToolErrorDetail, ToolResult
+from pydantic import BaseModel
+
+
+class ExportInput(BaseModel):
+    name: str
+    delay: float = 0.0
+    dry_run: bool = False
+
+
+class ImportInput(BaseModel):
+    manifest_path: str
+    label: str = ""
+
+
+def _result(**result) -> ToolResult:
+    ctx = get_current_context()
+    return ToolResult(tool=ctx.tool_name or "", request_id=ctx.request_id or "", run_id=ctx.run_id or "", result=result)
+
+
+class Tools:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.calls: list[tuple[str, BaseModel]] = []
+        self.trace_ids: set[str | None] = set()
+
+    def export(self, inp: ExportInput) -> ToolResult | ToolError:
+        with self.lock:
+            self.calls.append(("export", inp))
+            self.trace_ids.add(get_current_context().trace_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(inp.delay)
+        with self.lock:
+            self.active -= 1
+        if inp.name == "broken":
+            ctx = get_current_context()
+            return ToolError(
+                tool="mock.export", request_id=ctx.request_id or "", run_id=ctx.run_id or "",
+                error=ToolErrorDetail(code="EXECUTION_ERROR", message="export failed"),
+            )
+        result = _result(object=inp.name, dry_run=inp.dry_run)
+        result.artifacts = [
+            Artifact(type="text/plain", uri=f"file:///exports/{inp.name}.log"),
+            Artifact(type="application/json", uri=f"file:///exports/{inp.name}.manifest.json",
+                     metadata={"type": "export_manifest"}),
+        ]
+        return result
+
+    def import_(self, inp: ImportInput) -> ToolResult:
+        with self.lock:
+            self.calls.append(("import", inp))
+        return _result(imported=inp.manifest_path)
+
+
+@pytest.fixture
+def tools() -> Tools:
+    return Tools()
+
+
+@pytest.fixture
+def storage(monkeypatch):
+    mock_am = MagicMock()
+    mock_am.store_artifact.side_effect = lambda rid, art: art
+    monkeypatch.setattr("mcp_core.execution.tool_executor.artifact_manager", mock_am)
+    monkeypatch.setattr("mcp_core.execution.tool_executor.policy_engine", MagicMock())
+    return mock_am
+
+
+@pytest.fixture
+def runner(tools, storage, monkeypatch) -> PipelineRunner:
+    reg = ToolRegistry()
+    reg.register("mock.export", "Export", ExportInput, tools.export)
+    reg.register("mock.import", "Import", ImportInput, tools.import_, target="ue5")
+    monkeypatch.setattr("mcp_core.execution.tool_executor.registry", reg)
+    return PipelineRunner(
+        max_workers=4, target_concurrency={"ue5": 1}, tool_executor=ToolExecutor(), tool_registry=reg
+    )
+
+
+def _fan_out_spec(names: list[str], delay: float = 0.0) -> dict:
+    nodes: dict = {}
+    for name in names:
+        nodes[f"export_{name}"] = {"tool": "mock.export", "input": {"name": name, "delay": delay}}
+        nodes[f"import_{name}"] = {
+            "tool": "mock.import",
+            "input": {
+                "manifest_path": f"${{export_{name}.artifacts.export_manifest}}",
+                "label": f"${{export_{name}.result.object}}-v1",
+            },
+        }
+    return {"name": "assets", "nodes": nodes}
+
+
+def test_pipeline_infers_dependencies_from_references():
+    pipeline = Pipeline.from_dict(_fan_out_spec(["chair"]))
+
+    assert pipeline.nodes["import_chair"].needs == ("export_chair",)
+    assert pipeline.order == ["export_chair", "import_chair"]
+
+
+def test_pipeline_rejects_cycles_and_unknown_nodes():
+    with pytest.raises(ValueError, match="cycle: a -> b -> a"):
+        Pipeline.from_dict({"nodes": {
+            "a": {"tool": "t", "needs": ["b"]},
+            "b": {"tool": "t", "input": {"x": "${a.result.x}"}},
+        }})
+    with pytest.raises(ValueError, match="unknown node 'missing'"):
+        Pipeline.from_dict({"nodes": {"a": {"tool": "t", "needs": ["missing"]}}})
+
+
+def test_pipeline_load_json(tmp_path):
+    spec = tmp_path / "pipeline.json"
+    spec.write_text(json.dumps(_fan_out_spec(["chair"])))
+
+    assert Pipeline.load(spec).name == "assets"
+
+
+def test_resolve_references_keeps_single_reference_types():
+    upstream = ToolResult(tool="t", request_id="r", run_id="x", result={"count": 3, "items": ["a", "b"]})
+
+    resolved = resolve_references(
+        {"n": "${up.result.count}", "first": "${up.result.items.0}", "text": "n=${up.result.count}"},
+        {"up": upstream},
+    )
+
+    assert resolved == {"n": 3, "first": "a", "text": "n=3"}
+
+
+def test_pipeline_runs_branches_in_parallel_and_chains_artifacts(runner, tools, storage):
+    names = ["a", "b", "c", "d"]
+    pipeline = Pipeline.from_dict(_fan_out_spec(names, delay=0.05))
+
+    results = runner.run(pipeline)
+
+    assert all(r.status == "ok" for r in results.values())
+    assert tools.peak > 1
+    imports = {inp.manifest_path: inp.label for kind, inp in tools.calls if kind == "import"}
+    assert imports == {f"/exports/{n}.manifest.json": f"{n}-v1" for n in names}
+
+    # Every node records its own manifest and the run shares one trace
+    assert storage.write_run_manifest.call_count == len(pipeline.nodes)
+    assert {results[f"export_{n}"].request_id for n in names} == {f"assets:export_{n}" for n in names}
+    assert len(tools.trace_ids) == 1
+
+
+def test_pipeline_skips_nodes_downstream_of_failures(runner, tools):
+    results = runner.run(Pipeline.from_dict(_fan_out_spec(["broken", "ok"])))
+
+    assert results["export_broken"].status == "error"
+    assert results["import_broken"].status == "error"
+    assert "Skipped" in results["import_broken"].error.message
+    assert results["import_ok"].status == "ok"
+    assert [inp.manifest_path for kind, inp in tools.calls if kind == "import"] == ["/exports/ok.manifest.json"]
+
+
+def test_pipeline_dry_run_applies_to_nodes_that_support_it(runner, tools):
+    results = runner.run(Pipeline.from_dict(_fan_out_spec(["chair"])), dry_run=True)
+
+    assert results["export_chair"].result["dry_run"] is True
+    assert results["import_chair"].status == "ok"
+
+
+def test_pipeline_rejects_unknown_tools(runner):
+    with pytest.raises(ValueError, match="unknown tool 'mock.nope'"):
+        runner.run(Pipeline.from_dict({"nodes": {"a": {"tool": "mock.nope"}}}))
+
+
+def test_pipeline_runs_target_branches_in_their_own_slots(tools, storage, monkeypatch):
+    slots: dict[str, int] = {}
+
+    def scene(inp: ExportInput) -> ToolResult | ToolError:
+        slots[inp.name] = get_current_context().target_slot
+        return tools.export(inp)
+
+    reg = ToolRegistry()
+    reg.register("mock.scene", "Scene", ExportInput, scene, target="blender")
+    monkeypatch.setattr("mcp_core.execution.tool_executor.registry", reg)
+    runner = PipelineRunner(
+        max_workers=4, target_concurrency={"blender": 2}, tool_executor=ToolExecutor(), tool_registry=reg
+    )
+    nodes: dict = {}
+    for branch in ("a", "b"):
+        nodes[branch] = {"tool": "mock.scene", "input": {"name": branch, "delay": 0.05}}
+        nodes[f"{branch}_export"] = {"tool": "mock.scene", "input": {"name": f"{branch}_export"}, "needs": [branch]}
+
+    results = runner.run(Pipeline.from_dict({"name": "scenes", "nodes": nodes}))
+
+    assert all(r.status == "ok" for r in results.values())
+    # Independent branches hold different slots (Blender sessions) and overlap
+    assert tools.peak == 2
+    assert slots["a"] != slots["b"]
+    # Downstream nodes stay in their upstream's session
+    assert slots["a_export"] == slots["a"]
+    assert slots["b_export"] == slots["b"]
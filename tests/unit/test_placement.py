@@ -0,0 +1,92 @@
+import base64
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_target_ue5.placement import (  # noqa: E402
+    HeightField,
+    encode_transforms,
+    generate_transforms,
+    jittered_grid,
+    poisson_disk,
+)
+
+BOUNDS = (0.0, 0.0, 1000.0, 500.0)
+
+
+def _min_pairwise_distance(points: np.ndarray) -> float:
+    diff = points[:, None, :] - points[None, :, :]
+    dist = np.sqrt((diff ** 2).sum(axis=-1))
+    np.fill_diagonal(dist, np.inf)
+    return float(dist.min())
+
+
+def test_jittered_grid_fills_bounds():
+    points = jittered_grid(500, BOUNDS, np.random.default_rng(0))
+
+    assert points.shape == (500, 2)
+    assert (points[:, 0] >= 0).all() and (points[:, 0] <= 1000).all()
+    assert (points[:, 1] >= 0).all() and (points[:, 1] <= 500).all()
+
+
+def test_poisson_disk_respects_min_distance():
+    points = poisson_disk(2000, BOUNDS, 20.0, np.random.default_rng(0))
+
+    assert 500 < len(points) <= 2000
+    assert _min_pairwise_distance(points) >= 20.0
+
+
+@pytest.mark.parametrize("method", ["jittered_grid", "poisson"])
+def test_generate_transforms_is_seeded(method):
+    a = generate_transforms(300, BOUNDS, seed=7, method=method)
+    b = generate_transforms(300, BOUNDS, seed=7, method=method)
+    c = generate_transforms(300, BOUNDS, seed=8, method=method)
+
+    assert a.dtype == np.float32 and a.shape[1] == 5
+    assert np.array_equal(a, b)
+    assert not np.array_equal(a, c)
+
+
+def test_height_field_samples_and_filters():
+    # A ramp rising 1 unit per unit along x: heights 0..1000, slope 45 degrees
+    xs = np.linspace(0, 1000, 11)
+    heights = np.tile(xs, (6, 1))
+    field = HeightField(heights, BOUNDS)
+
+    assert field.height(np.array([[250.0, 100.0]]))[0] == pytest.approx(250.0)
+    assert field.slope(np.array([[500.0, 250.0]]))[0] == pytest.approx(45.0)
+
+    transforms = generate_transforms(400, BOUNDS, seed=1, height_field=field, height_range=(0.0, 500.0))
+    assert 0 < len(transforms) < 400
+    assert (transforms[:, 2] <= 500.0).all()
+    assert np.allclose(transforms[:, 2], transforms[:, 0], atol=1e-3)
+
+    assert len(generate_transforms(400, BOUNDS, seed=1, height_field=field, max_slope_deg=30.0)) == 0
+
+
+def test_encode_transforms_round_trips():
+    transforms = generate_transforms(10, BOUNDS, seed=3)
+    payload = encode_transforms(transforms)
+
+    decoded = np.frombuffer(base64.b64decode(payload["data"]), dtype="<f4").reshape(-1, 5)
+    assert payload["count"] == 10
+    assert np.array_equal(decoded, transforms)
+
+
+def test_height_field_reads_landscape_heightmaps(tmp_path):
+    path = tmp_path / "heightmap.npy"
+    np.save(path, np.full((4, 4), 32768 + 128, dtype=np.uint16))
+
+    field = HeightField.load(path, BOUNDS)
+
+    assert field.height(np.array([[500.0, 250.0]]))[0] == pytest.approx(100.0)
+    assert field.slope(np.array([[0.0, 0.0]]))[0] == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize("bounds", [(0, 0, 0, 100), (0, 0, 100, 0), (10, 0, 5, 100)])
+def test_degenerate_bounds_are_rejected(bounds):
+    with pytest.raises(ValueError, match="positive width and height"):
+        generate_transforms(10, bounds, seed=1)
+    with pytest.raises(ValueError, match="positive width and height"):
+        jittered_grid(10, bounds, np.random.default_rng(1))
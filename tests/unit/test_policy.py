@@ -70,3 +70,49 @@ def test_check_path_allowed_no_restrictions(policy_engine, monkeypatch, tmp_path
     monkeypatch.setattr("mcp_core.policy.engine.settings", settings)
 
     policy_engine.check_path_allowed(tmp_path / "anywhere.txt")
+
+def test_check_path_allowed_uses_component_boundaries(policy_engine, monkeypatch, tmp_path):
+    settings = McpSettings()
+    settings.policy.allowed_paths = [str(tmp_path / "a" / "safe"), str(tmp_path / "b")]
+    monkeypatch.setattr("mcp_core.policy.engine.settings", settings)
+
+    policy_engine.check_path_allowed(tmp_path / "a" / "safe" / "deep" / "file.fbx")
+    policy_engine.check_path_allowed(tmp_path / "b")
+    # A shared string prefix is not containment
+    with pytest.raises(PermissionError):
+        policy_engine.check_path_allowed(tmp_path / "a" / "safe2" / "file.fbx")
+    with pytest.raises(PermissionError):
+        policy_engine.check_path_allowed(tmp_path / "a")
+
+def test_check_path_allowed_rebuilds_on_config_change(policy_engine, monkeypatch, tmp_path):
+    settings = McpSettings()
+    settings.policy.allowed_paths = [str(tmp_path / "old")]
+    monkeypatch.setattr("mcp_core.policy.engine.settings", settings)
+
+    with pytest.raises(PermissionError):
+        policy_engine.check_path_allowed(tmp_path / "new" / "file.txt")
+
+    settings.policy.allowed_paths = [str(tmp_path / "new")]
+    policy_engine.check_path_allowed(tmp_path / "new" / "file.txt")
+    with pytest.raises(PermissionError):
+        policy_engine.check_path_allowed(tmp_path / "old" / "file.txt")
+
+    # Editing the list in place is a configuration change too
+    settings.policy.allowed_paths.append(str(tmp_path / "old"))
+    policy_engine.check_path_allowed(tmp_path / "old" / "file.txt")
+
+def test_check_path_allowed_follows_retargeted_symlinks(policy_engine, monkeypatch, tmp_path):
+    settings = McpSettings()
+    settings.policy.allowed_paths = [str(tmp_path / "safe")]
+    monkeypatch.setattr("mcp_core.policy.engine.settings", settings)
+    (tmp_path / "safe").mkdir()
+    (tmp_path / "outside").mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(tmp_path / "safe", target_is_directory=True)
+
+    policy_engine.check_path_allowed(link / "file.txt")
+
+    link.unlink()
+    link.symlink_to(tmp_path / "outside", target_is_directory=True)
+    with pytest.raises(PermissionError):
+        policy_engine.check_path_allowed(link / "file.txt")
@@ -0,0 +1,39 @@
+import pytest
+from mcp_target_ue5.profiling import count_hitches, percentile, summarize
+
+
+def test_percentile_interpolates():
+    values = [float(v) for v in range(1, 101)]
+
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([7.0], 95) == 7.0
+    with pytest.raises(ValueError):
+        percentile([], 50)
+
+
+def test_hitches_default_to_twice_the_median():
+    frames = [16.0] * 95 + [40.0] * 4 + [80.0]
+
+    hitches = count_hitches(frames)
+
+    assert hitches == {"threshold_ms": 32.0, "count": 5, "severe": 1}
+    assert count_hitches(frames, threshold_ms=50.0)["count"] == 1
+
+
+def test_summarize_synthetic_series():
+    series = {
+        "frame_ms": [10.0, 20.0, 10.0, 10.0, 50.0],
+        "gpu_ms": [8.0, 9.0, 8.0, 8.0, 30.0],
+        "draw_calls": [1200.0, 1300.0, 1250.0, 1200.0, 1400.0],
+    }
+
+    summary = summarize(series)
+
+    assert summary["frames"] == 5
+    assert summary["fps_avg"] == pytest.approx(1000 / 20)
+    assert summary["frame_time_ms"] == 10.0
+    assert summary["metrics"]["frame_ms"]["max"] == 50.0
+    assert summary["metrics"]["draw_calls"]["p50"] == 1250.0
+    assert summary["hitches"]["count"] == 1
+    assert summarize({}) == {"frames": 0, "metrics": {}}
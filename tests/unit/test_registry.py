@@ -1,5 +1,5 @@
 import pytest
-from mcp_core.registry import ToolRegistry
+from mcp_core.registry import LazyHandler, ToolRegistry
 from pydantic import BaseModel
 
 
@@ -40,3 +40,71 @@ def test_list_tools():
 def test_get_nonexistent_tool():
     registry = ToolRegistry()
     assert registry.get_tool("nonexistent") is None
+
+def test_register_lazy_handler():
+    registry = ToolRegistry()
+    registry.register("lazy.tool", "A lazy tool", MockInput, "json:dumps")
+
+    tool = registry.get_tool("lazy.tool")
+    assert isinstance(tool.handler, LazyHandler)
+    assert tool.handler({"a": 1}) == '{"a": 1}'
+
+def test_lazy_handler_rejects_bad_reference():
+    with pytest.raises(ValueError, match="module:function"):
+        LazyHandler("no_function_here")
+
+def test_register_target():
+    registry = ToolRegistry()
+    registry.register("remote.tool", "Remote", MockInput, mock_handler, target="blender")
+    registry.register("local.tool", "Local", MockInput, mock_handler)
+
+    assert registry.get_tool("remote.tool").target == "blender"
+    assert registry.get_tool("local.tool").target is None
+
+def test_schemas_and_catalog_are_cached_until_the_tool_set_changes():
+    registry = ToolRegistry()
+    registry.register("a.tool", "Tool A", MockInput, mock_handler)
+
+    schema = registry.input_schema("a.tool")
+    catalog = registry.catalog()
+
+    assert schema == MockInput.model_json_schema()
+    assert registry.input_schema("a.tool") is schema
+    assert registry.catalog() is catalog
+    assert registry.validate_input("a.tool", {"x": "3"}) == MockInput(x=3)
+
+    registry.register("b.tool", "Tool B", MockInput, mock_handler)
+    assert [t["name"] for t in registry.catalog()] == ["a.tool", "b.tool"]
+
+    registry.clear()
+    assert registry.catalog() == []
+    assert registry.input_schema("a.tool") is None
+
+def test_register_metadata():
+    class PathsInput(BaseModel):
+        filepath: str
+        extra: list[str] = []
+        dry_run: bool = False
+
+    registry = ToolRegistry()
+    registry.register(
+        "remote.tool", "Remote", PathsInput, mock_handler,
+        target="blender", cost="expensive", path_fields=("filepath", "extra"),
+    )
+    registry.register("query.tool", "Query", PathsInput, mock_handler, target="blender", read_only=True)
+    registry.register("local.tool", "Local", PathsInput, mock_handler, concurrency_group="disk")
+
+    remote = registry.get_tool("remote.tool").metadata
+    assert remote.group == "blender"
+    assert remote.paths(PathsInput(filepath="a.fbx", extra=["b", "c"])) == ["a.fbx", "b", "c"]
+    assert remote.is_destructive(PathsInput(filepath="a.fbx"))
+    assert not remote.is_destructive(PathsInput(filepath="a.fbx", dry_run=True))
+    assert not registry.get_tool("query.tool").metadata.is_destructive(PathsInput(filepath="a"))
+    assert not registry.get_tool("local.tool").metadata.is_destructive(PathsInput(filepath="a"))
+    assert registry.get_tool("local.tool").metadata.group == "disk"
+    assert registry.catalog()[2]["metadata"]["cost"] == "expensive"
+
+    with pytest.raises(ValueError, match="cost class"):
+        registry.register("bad.cost", "Bad", PathsInput, mock_handler, cost="free")
+    with pytest.raises(ValueError, match="unknown path fields"):
+        registry.register("bad.paths", "Bad", PathsInput, mock_handler, path_fields=("nope",))
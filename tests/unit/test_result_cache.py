@@ -0,0 +1,75 @@
+from pathlib import Path
+
+import pytest
+from mcp_core.storage.result_cache import ResultCache
+from mcp_protocol import Artifact, ToolResult
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return ResultCache(root=tmp_path, max_entries=3, max_bytes=1024 * 1024)
+
+def _result(value: str, artifacts: list[Artifact] | None = None) -> ToolResult:
+    return ToolResult(
+        tool="mock.tool",
+        request_id="req-1",
+        run_id="run-1",
+        result={"value": value},
+        artifacts=artifacts or [],
+    )
+
+def test_make_key_is_canonical():
+    a = ResultCache.make_key("t", {"a": 1, "b": 2}, "cfg", "1.0")
+    b = ResultCache.make_key("t", {"b": 2, "a": 1}, "cfg", "1.0")
+    assert a == b
+
+def test_make_key_components():
+    base = ResultCache.make_key("t", {"seed": 1}, "cfg", "1.0")
+    assert base != ResultCache.make_key("other", {"seed": 1}, "cfg", "1.0")
+    assert base != ResultCache.make_key("t", {"seed": 2}, "cfg", "1.0")
+    assert base != ResultCache.make_key("t", {"seed": 1}, "cfg2", "1.0")
+    assert base != ResultCache.make_key("t", {"seed": 1}, "cfg", "2.0")
+
+def test_put_and_get(cache):
+    cache.put("k1", _result("hello"))
+
+    hit = cache.get("k1")
+    assert hit is not None
+    assert hit.result["value"] == "hello"
+    assert cache.get("missing") is None
+
+def test_persists_across_instances(cache, tmp_path):
+    cache.put("k1", _result("hello"))
+
+    reopened = ResultCache(root=tmp_path)
+    assert reopened.get("k1") is not None
+    assert len(reopened) == 1
+
+def test_lru_eviction(cache):
+    cache.put("k1", _result("1"))
+    cache.put("k2", _result("2"))
+    cache.put("k3", _result("3"))
+    cache.get("k1")  # k2 is now least recently used
+    cache.put("k4", _result("4"))
+
+    assert len(cache) == 3
+    assert cache.get("k2") is None
+    assert cache.get("k1") is not None
+
+def test_size_eviction(tmp_path):
+    cache = ResultCache(root=tmp_path, max_entries=100, max_bytes=400)
+    cache.put("k1", _result("x" * 150))
+    cache.put("k2", _result("y" * 150))
+
+    assert cache.get("k1") is None
+    assert cache.get("k2") is not None
+
+def test_missing_artifact_is_a_miss(cache, tmp_path):
+    art_path = tmp_path / "art.txt"
+    art_path.write_text("data", encoding="utf-8")
+    cache.put("k1", _result("a", [Artifact(type="text/plain", uri=str(art_path))]))
+    assert cache.get("k1") is not None
+
+    Path(art_path).unlink()
+    assert cache.get("k1") is None
+    assert len(cache) == 0
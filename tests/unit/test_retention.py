@@ -0,0 +1,150 @@
+import importlib
+import json
+import time
+from datetime import UTC, datetime
+
+import pytest
+from mcp_core.storage import ArtifactManager, RetentionEngine, RetentionPolicy
+
+DAY = 86400
+NOW = time.time() + 2 * DAY
+
+
+@pytest.fixture
+def manager(tmp_path):
+    return ArtifactManager(root_path=tmp_path)
+
+
+@pytest.fixture
+def engine(manager):
+    return RetentionEngine(manager)
+
+
+def _run(manager, run_id, tool="mcp.generate_scene", status="success", age_days=0.0, files=None):
+    run_dir = manager.ensure_run_dir(run_id)
+    end = datetime.fromtimestamp(NOW - age_days * DAY, UTC).isoformat()
+    (run_dir / "run_manifest.json").write_text(json.dumps({
+        "run_id": run_id, "tool_name": tool, "status": status, "end_time": end,
+    }))
+    for name, data in (files or {}).items():
+        (run_dir / name).write_bytes(data)
+    return run_dir
+
+
+def test_age_limits_keep_newest_runs_and_failures_longer(manager, engine):
+    for i in range(4):
+        _run(manager, f"old-{i}", age_days=40 + i, files={"out.txt": b"x"})
+    _run(manager, "failed", status="error", age_days=60, files={"out.txt": b"x"})
+    _run(manager, "recent", age_days=1, files={"out.txt": b"x"})
+    policy = RetentionPolicy(max_age_days=30, failure_max_age_days=90, keep_last_per_tool=2)
+
+    report = engine.collect(policy, now=NOW)
+
+    # recent and old-0 are the two newest generate_scene runs
+    assert sorted(report["runs_deleted"]) == ["old-1", "old-2", "old-3"]
+    assert sorted(p.name for p in manager.root.iterdir()) == ["failed", "old-0", "recent"]
+
+
+def test_size_limit_deletes_oldest_successes_first(manager, engine):
+    _run(manager, "failed", status="error", age_days=5, files={"a.bin": b"x" * 1000})
+    _run(manager, "older", age_days=4, files={"a.bin": b"x" * 1000})
+    _run(manager, "newer", age_days=3, files={"a.bin": b"x" * 1000})
+    _run(manager, "newest", tool="mcp.other", age_days=2, files={"a.bin": b"x" * 1000})
+    policy = RetentionPolicy(max_total_bytes=2500, keep_last_per_tool=1)
+
+    report = engine.collect(policy, dry_run=True, now=NOW)
+
+    assert report["runs_deleted"] == ["older", "failed"]
+    # Dry runs delete nothing
+    assert (manager.root / "older").exists()
+
+
+def test_manifest_only_runs_are_packed(manager, engine):
+    for i in range(3):
+        _run(manager, f"bare-{i}", age_days=10 + i)
+    _run(manager, "with-files", age_days=10, files={"out.txt": b"x"})
+    policy = RetentionPolicy(keep_last_per_tool=0, compact_after_days=7)
+
+    report = engine.collect(policy, now=NOW)
+
+    assert report["manifests_compacted"] == 3
+    assert [p.name for p in manager.root.iterdir() if p.name != "packs"] == ["with-files"]
+    assert sorted(m["run_id"] for m in engine.packed_manifests()) == ["bare-0", "bare-1", "bare-2"]
+
+    # A later pass appends to the same segment
+    _run(manager, "bare-3", age_days=10)
+    engine.collect(policy, now=NOW)
+    assert len(list(engine.packed_manifests())) == 4
+
+
+def test_unreferenced_blobs_are_swept(manager, engine):
+    kept = manager.store_stream("run-a", [b"kept"], "a.png", "image/png")
+    orphan = manager.store_stream("run-b", [b"orphan"], "b.png", "image/png")
+    cached = manager.store_stream("run-c", [b"cached"], "c.png", "image/png")
+    record = manager.root / "image_cache" / "ab" / "key.json"
+    record.parent.mkdir(parents=True)
+    record.write_text(json.dumps({"blobs": [{"sha256": cached.metadata["sha256"], "size": 6}]}))
+    for run_id in ("run-b", "run-c"):
+        (manager.root / run_id / "b.png").unlink(missing_ok=True)
+        (manager.root / run_id / "c.png").unlink(missing_ok=True)
+
+    report = engine.collect(RetentionPolicy(), now=NOW)
+
+    assert report["blobs_deleted"] == 1
+    assert not manager.blob_path(orphan.metadata["sha256"]).exists()
+    assert manager.blob_path(kept.metadata["sha256"]).exists()
+    assert manager.blob_path(cached.metadata["sha256"]).exists()
+
+
+def test_time_budget_leaves_work_for_later(manager, engine):
+    for i in range(3):
+        _run(manager, f"old-{i}", age_days=40)
+
+    report = engine.collect(RetentionPolicy(max_age_days=30, keep_last_per_tool=0), time_budget=-1, now=NOW)
+
+    assert report["complete"] is False
+    assert report["runs_deleted"] == []
+
+
+def test_scan_stops_when_out_of_time_and_remembers_run_sizes(manager, engine, monkeypatch):
+    for i in range(3):
+        _run(manager, f"old-{i}", age_days=40, files={"out.txt": b"xyz"})
+
+    assert engine.scan_runs(NOW, out_of_time=lambda: True) == []
+    sizes = {r.run_id: r.size for r in engine.scan_runs(NOW)}
+
+    def rescanned(path, out_of_time):
+        raise AssertionError(f"{path} was walked again")
+
+    monkeypatch.setattr(importlib.import_module("mcp_core.storage.retention"), "_run_size", rescanned)
+    assert {r.run_id: r.size for r in engine.scan_runs(NOW)} == sizes
+
+
+def test_total_bytes_reuses_run_sizes_and_counts_shared_blobs_once(manager, engine, monkeypatch):
+    _run(manager, "a", files={"out.txt": b"x" * 100})
+    manager.store_stream("a", [b"shared" * 10], "a.png", "image/png")
+    manager.store_stream("b", [b"shared" * 10], "b.png", "image/png")
+    _run(manager, "b")
+    orphan = manager.store_stream("c", [b"orphan"], "c.png", "image/png")
+    (manager.root / "c" / "c.png").unlink()
+    (manager.root / "packs").mkdir()
+    (manager.root / "packs" / "manifests-2024-01.jsonl.gz").write_bytes(b"p" * 50)
+    runs = engine.scan_runs(NOW)
+
+    # Every distinct file once: hard links to a blob are one file
+    distinct = {}
+    for file in manager.root.rglob("*"):
+        if file.is_file():
+            distinct[file.stat().st_ino] = file.stat().st_size
+    assert engine.total_bytes(runs) == sum(distinct.values())
+    assert manager.blob_path(orphan.metadata["sha256"]).exists()
+
+    walked = []
+    retention_module = importlib.import_module("mcp_core.storage.retention")
+    run_size = retention_module._run_size
+    monkeypatch.setattr(
+        retention_module, "_run_size", lambda path, out_of_time: walked.append(path.name) or run_size(path, out_of_time)
+    )
+    engine.collect(RetentionPolicy(max_total_bytes=10**9), now=NOW)
+    # Finished runs are not walked again; c has no manifest yet, so it is still in progress
+    assert sorted(walked) == ["c", "packs"]
@@ -38,6 +38,8 @@ def test_list_commands_handler():
     tool_names = [t["name"] for t in tools]
     assert "mcp.list_commands" in tool_names
     assert "mcp.help" in tool_names
+    # The payload is built once and served until the tool set changes
+    assert list_commands_handler(inp).result["tools"] is tools
 
 def test_help_handler():
     register_system_tools()
@@ -0,0 +1,71 @@
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_target_ue5.terrain import (  # noqa: E402
+    DETAIL_LEVELS,
+    heightmap,
+    iter_tiles,
+    landscape_layout,
+    tile,
+    tile_grid,
+    write_memmap,
+    write_tiles,
+)
+
+
+def test_landscape_layout_covers_requested_size():
+    layout = landscape_layout(1000, 500, "low")
+
+    assert layout.component_quads == 63
+    assert (layout.components_x, layout.components_y) == (16, 8)
+    assert layout.resolution == (1009, 505)
+    assert landscape_layout(1000, 1000, "high").component_quads == 510
+
+
+def test_tiles_share_borders_and_match_full_heightmap():
+    layout = landscape_layout(200, 140, "low")
+    params = DETAIL_LEVELS["low"]
+    width, height = layout.resolution
+    full = heightmap(width, height, seed=9, params=params)
+
+    tiles = list(iter_tiles(layout, seed=9, params=params, components_per_tile=2))
+
+    assert full.dtype == np.uint16
+    assert {(t.x, t.y) for t in tiles} == {(x, y) for x in range(2) for y in range(2)}
+    for t in tiles:
+        x0, y0 = t.origin
+        h, w = t.heights.shape
+        assert np.array_equal(t.heights, full[y0:y0 + h, x0:x0 + w])
+    # Neighbouring tiles share their border column
+    left, right = tiles[0], tiles[1]
+    assert np.array_equal(left.heights[:, -1], right.heights[:, 0])
+
+
+def test_write_tiles_writes_r16(tmp_path):
+    layout = landscape_layout(64, 64, "low")
+
+    tiles = write_tiles(tmp_path, layout, seed=1, params=DETAIL_LEVELS["low"])
+
+    assert [t["path"] for t in tiles] == [str(tmp_path / "heightmap_x0_y0.r16")]
+    data = np.fromfile(tiles[0]["path"], dtype="<u2").reshape(64, 64)
+    assert np.array_equal(data, heightmap(64, 64, seed=1, params=DETAIL_LEVELS["low"]))
+
+
+def test_write_memmap_assembles_tiles(tmp_path):
+    layout = landscape_layout(200, 140, "low")
+    params = DETAIL_LEVELS["low"]
+
+    path = write_memmap(tmp_path / "heightmap.npy", layout, seed=9, params=params, components_per_tile=1)
+
+    width, height = layout.resolution
+    assert np.array_equal(np.load(path, mmap_mode="r"), heightmap(width, height, seed=9, params=params))
+
+
+def test_tile_rejects_out_of_range_coordinates():
+    layout = landscape_layout(200, 140, "low")
+
+    assert tile_grid(layout, components_per_tile=2) == (2, 2)
+    assert tile(layout, 1, 1, components_per_tile=2).origin == (126, 126)
+    with pytest.raises(ValueError, match="outside the landscape"):
+        tile(layout, 2, 0, components_per_tile=2)
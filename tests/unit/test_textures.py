@@ -0,0 +1,79 @@
+import os
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from mcp_core.config.settings import settings  # noqa: E402
+from mcp_target_blender import textures  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    textures.texture_cache.clear()
+    yield
+    textures.texture_cache.clear()
+
+
+def test_resolution_accepts_names_and_pixels():
+    assert textures.resolution("4K") == 4096
+    assert textures.resolution("2k") == 2048
+    assert textures.resolution("512") == 512
+    with pytest.raises(ValueError):
+        textures.resolution("huge")
+
+
+@pytest.mark.parametrize("pattern", sorted(textures.PATTERNS))
+def test_patterns_tile_seamlessly(pattern):
+    h = textures.height(pattern, 128, seed=4)
+
+    assert h.shape == (128, 128) and h.dtype == np.float32
+    # Wrapping across an edge is no steeper than the steepest step inside the texture
+    for axis in (0, 1):
+        inner = np.abs(np.diff(h, axis=axis)).max()
+        edge = np.abs(np.take(h, 0, axis=axis) - np.take(h, -1, axis=axis)).max()
+        assert edge <= inner + 1e-6
+
+
+def test_normal_map_of_flat_height_points_up():
+    normals = textures.normal_map(np.full((8, 8), 0.5, dtype=np.float32))
+
+    assert normals.dtype == np.uint8
+    assert (normals.reshape(-1, 4) == [128, 128, 255, 255]).all()
+
+
+def test_texture_is_cached_by_pattern_seed_and_resolution():
+    color, normals = textures.texture("bricks", 3, 64, normal=True)
+
+    assert color.shape == (64, 64, 4) and normals.shape == (64, 64, 4)
+    assert textures.texture("bricks", 3, 64)[0] is color
+    assert textures.texture("bricks", 4, 64)[0] is not color
+    assert textures.to_pixels(color).shape == (64 * 64 * 4,)
+
+
+def test_texture_cache_persists_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.cache, "enabled", True)
+    cache = textures.TextureCache(root=tmp_path)
+    value = np.arange(16, dtype=np.uint8)
+
+    cache.put(("noise", 1, 2), value)
+
+    assert (tmp_path / "textures" / "noise_1_2.npy").exists()
+    assert np.array_equal(textures.TextureCache(root=tmp_path).get(("noise", 1, 2)), value)
+
+
+def test_texture_cache_evicts_least_recently_used_files(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings.cache, "enabled", True)
+    value = np.zeros(1000, dtype=np.uint8)
+    cache = textures.TextureCache(max_bytes=0, root=tmp_path, disk_max_bytes=2500)
+    cache.put(("noise", 1, 2), value)
+    cache.put(("noise", 2, 2), value)
+    os.utime(tmp_path / "textures" / "noise_1_2.npy", (0, 0))
+    os.utime(tmp_path / "textures" / "noise_2_2.npy", (1, 1))
+
+    # A fresh cache orders the files by mtime; reading one makes it most recent
+    cache = textures.TextureCache(max_bytes=0, root=tmp_path, disk_max_bytes=2500)
+    assert cache.get(("noise", 1, 2)) is not None
+    cache.put(("noise", 3, 2), value)
+
+    assert sorted(p.name for p in (tmp_path / "textures").iterdir()) == ["noise_1_2.npy", "noise_3_2.npy"]
@@ -0,0 +1,335 @@
+import base64
+import gzip
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import zlib
+from array import array
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+PLUGIN_PATH = Path(__file__).resolve().parents[2] / "modules" / "mcp_target_ue5" / "plugin" / "ue5_mcp_server.py"
+
+
+@pytest.fixture
+def plugin():
+    """Load the UE5 plugin script with a mocked `unreal` module."""
+    unreal = MagicMock()
+    with patch.dict(sys.modules, {"unreal": unreal}):
+        spec = importlib.util.spec_from_file_location("ue5_mcp_server_under_test", PLUGIN_PATH)
+        assert spec and spec.loader
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    assert module.IN_UNREAL
+    return module, unreal
+
+
+def test_import_assets_submits_one_batch(plugin, tmp_path):
+    module, unreal = plugin
+    manifests = []
+    for name in ("a", "b"):
+        path = tmp_path / f"{name}.manifest.json"
+        path.write_text(json.dumps({"export_path": f"/exports/{name}.fbx"}))
+        manifests.append(str(path))
+
+    tasks = []
+
+    def new_task():
+        task = MagicMock()
+        task.get_editor_property.side_effect = lambda prop: [f"/Game/Imports/{task.filename[-5]}"]
+        tasks.append(task)
+        return task
+
+    unreal.AssetImportTask.side_effect = new_task
+    asset_tools = unreal.AssetToolsHelpers.get_asset_tools.return_value
+
+    result = module.handle_import_assets({
+        "manifest_paths": manifests + [str(tmp_path / "missing.json")],
+        "overwrite": True,
+    })
+
+    asset_tools.import_asset_tasks.assert_called_once_with(tasks)
+    assert all(task.replace_existing for task in tasks)
+    assert result["imported_count"] == 2
+    assert result["failed_count"] == 1
+    assert [r["status"] for r in result["results"]] == ["ok", "ok", "error"]
+    assert result["results"][0]["imported"] == ["/Game/Imports/a"]
+
+
+def test_populate_level_adds_instances_in_one_call(plugin):
+    module, unreal = plugin
+    values = array("f", [10.0, 20.0, 0.0, 90.0, 1.0, 30.0, 40.0, 5.0, 180.0, 1.5])
+    component = unreal.SubobjectDataBlueprintFunctionLibrary.get_object.return_value
+    unreal.get_engine_subsystem.return_value.add_new_subobject.return_value = (MagicMock(), "")
+    unreal.AssetRegistryHelpers.get_asset_registry.return_value.get_assets_by_path.return_value = [
+        _asset_data("/Game/Foliage/Tree_01", "StaticMesh"),
+    ]
+
+    result = module.handle_populate_level({
+        "asset_type": "Tree_01",
+        "transforms": {"count": 2, "data": base64.b64encode(values.tobytes()).decode("ascii")},
+    })
+
+    unreal.EditorAssetLibrary.load_asset.assert_called_once_with("/Game/Foliage/Tree_01.Tree_01")
+    component.add_instances.assert_called_once()
+    transforms = component.add_instances.call_args[0][0]
+    assert len(transforms) == 2
+    assert unreal.Rotator.call_args_list[1][1]["yaw"] == 180.0
+    assert result["count"] == 2
+
+
+def test_frame_sampler_keeps_latest_window(plugin, tmp_path):
+    module, _ = plugin
+    capture = tmp_path / "Profile.csv"
+    rows = ["FrameTime,GameThreadTime,GPUTime,RHI/DrawCalls"]
+    rows += [f"{16 + i},{8 + i},{12 + i},{1000 + i}" for i in range(6)]
+    rows += ["[HasHeaderRowAtEnd],1,,", "FrameTime,GameThreadTime,GPUTime,RHI/DrawCalls"]
+    capture.write_text("\n".join(rows) + "\n")
+
+    sampler = module.read_csv_profile(str(capture), module.FrameSampler(4))
+
+    assert len(sampler) == 4
+    assert sampler.series() == {
+        "frame_ms": [18.0, 19.0, 20.0, 21.0],
+        "game_ms": [10.0, 11.0, 12.0, 13.0],
+        "gpu_ms": [14.0, 15.0, 16.0, 17.0],
+        "draw_calls": [1002.0, 1003.0, 1004.0, 1005.0],
+    }
+
+
+def test_optimize_level_applies_cull_distances(plugin):
+    module, unreal = plugin
+    component = MagicMock()
+    component.get_name.return_value = "StaticMeshComponent0"
+    actor = MagicMock()
+    actor.get_name.return_value = "Cup_0"
+    actor.get_components_by_class.return_value = [component]
+    unreal.get_editor_subsystem.return_value.get_all_level_actors.return_value = [actor]
+
+    result = module.handle_optimize_level({"actions": [
+        {"kind": "set_cull_distance", "targets": ["Cup_0.StaticMeshComponent0"],
+         "params": {"distances": {"Cup_0.StaticMeshComponent0": 1000.0}}},
+        {"kind": "build_hlod", "targets": [], "params": {}},
+    ]})
+
+    component.set_editor_property.assert_called_once_with("ld_max_draw_distance", 1000.0)
+    assert result["optimized_count"] == 1
+    assert [a["status"] for a in result["applied"]] == ["ok", "skipped"]
+
+
+def test_optimize_level_merges_components_not_actors(plugin):
+    module, unreal = plugin
+
+    def component(name):
+        c = MagicMock()
+        c.get_name.return_value = name
+        return c
+
+    def actor(name, components):
+        a = MagicMock()
+        a.get_name.return_value = name
+        a.get_components_by_class.return_value = components
+        return a
+
+    rock, rock_extra, fence, lamp = (component(n) for n in ("Rock", "RockExtra", "Fence", "Lamp"))
+    rock_actor = actor("Rocks_0", [rock, rock_extra])
+    fence_actor = actor("Fence_0", [fence, lamp])
+    actor_subsystem = unreal.get_editor_subsystem.return_value
+    actor_subsystem.get_all_level_actors.return_value = [rock_actor, fence_actor]
+    library = unreal.SubobjectDataBlueprintFunctionLibrary
+    library.get_data.side_effect = lambda handle: handle
+    library.get_object.side_effect = lambda data: data
+    subobjects = unreal.get_engine_subsystem.return_value
+    subobjects.k2_gather_subobject_data_for_instance.side_effect = lambda a: ["root", *a.get_components_by_class()]
+    instances = MagicMock()
+    subobjects.add_new_subobject.return_value = (instances, "")
+
+    result = module.handle_optimize_level({"actions": [{
+        "kind": "merge_to_instances",
+        "targets": ["Rocks_0.Rock", "Rocks_0.RockExtra", "Fence_0.Fence", "Fence_0.Fence"],
+        "params": {"mesh": "/Game/SM_Rock"},
+    }]})
+
+    assert result["applied"][0]["merged"] == 3
+    # Instances are placed at the components' world transforms, each component once
+    transforms = instances.add_instances.call_args[0][0]
+    assert transforms == [c.get_world_transform.return_value for c in (rock, rock_extra, fence)]
+    # An actor left empty is destroyed; one with other components only loses the merged one
+    actor_subsystem.destroy_actor.assert_called_once_with(rock_actor)
+    subobjects.k2_delete_subobject.assert_called_once_with("root", fence, None)
+    assert result["applied"][0]["destroyed_actors"] == 1
+
+
+def _write_r16(path, width, height):
+    path.write_bytes(array("H", range(0, 2 * width * height, 2)).tobytes())
+    return {"path": str(path), "x": 0, "y": 0, "origin": [0, 0], "size": [width, height]}
+
+
+def test_generate_terrain_imports_tiles_into_existing_landscape(plugin, tmp_path):
+    module, unreal = plugin
+    landscape = MagicMock()
+    landscape.get_actor_label.return_value = "MCP_GeneratedTerrain"
+    unreal.GameplayStatics.get_all_actors_of_class.return_value = [landscape]
+    unreal.RenderingLibrary.begin_draw_canvas_to_render_target.return_value = (MagicMock(), None, "ctx")
+    pngs = []
+    unreal.RenderingLibrary.import_file_as_texture2d.side_effect = (
+        lambda world, path: pngs.append(Path(path).read_bytes()) or MagicMock()
+    )
+    tile = _write_r16(tmp_path / "terrain_x0_y0.r16", 3, 2)
+
+    result = module.handle_generate_terrain({"tiles": [tile], "resolution": [3, 2]})
+
+    # The PNG is a scratch file, not left next to the tile in the run dir
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["terrain_x0_y0.r16"]
+    png = pngs[0]
+    assert png.startswith(b"\x89PNG")
+    rows = zlib.decompress(png[png.index(b"IDAT") + 4:png.index(b"IEND") - 8])
+    # Filter byte, then (high, low, 0, 255) per sample
+    assert rows[:9] == bytes([0, 0, 0, 0, 255, 0, 2, 0, 255])
+    unreal.get_editor_subsystem.return_value.spawn_actor_from_class.assert_not_called()
+    landscape.landscape_import_heightmap_from_render_target.assert_called_once()
+    unreal.RenderingLibrary.end_draw_canvas_to_render_target.assert_called_once()
+    assert result["heightmap_imported"] is True
+    assert result["warnings"] == []
+
+
+def test_generate_terrain_warns_when_landscape_has_no_components(plugin, tmp_path):
+    module, unreal = plugin
+    unreal.GameplayStatics.get_all_actors_of_class.return_value = []
+    landscape = unreal.get_editor_subsystem.return_value.spawn_actor_from_class.return_value
+    landscape.get_components_by_class.return_value = []
+    tile = _write_r16(tmp_path / "terrain_x0_y0.r16", 3, 2)
+
+    result = module.handle_generate_terrain({"tiles": [tile], "resolution": [3, 2]})
+
+    landscape.set_actor_label.assert_called_once_with("MCP_GeneratedTerrain")
+    landscape.landscape_import_heightmap_from_render_target.assert_not_called()
+    assert result["heightmap_imported"] is False
+    assert "tiled import" in result["warnings"][0]
+
+
+def test_generate_terrain_leaves_oversized_heightmaps_to_tiled_import(plugin, tmp_path):
+    module, unreal = plugin
+    landscape = MagicMock()
+    landscape.get_actor_label.return_value = "MCP_GeneratedTerrain"
+    unreal.GameplayStatics.get_all_actors_of_class.return_value = [landscape]
+    tile = _write_r16(tmp_path / "terrain_x0_y0.r16", 3, 2)
+    size = module.MAX_HEIGHTMAP_IMPORT_SIZE + 1
+
+    result = module.handle_generate_terrain({"tiles": [tile], "resolution": [size, 2]})
+
+    unreal.RenderingLibrary.create_render_target2d.assert_not_called()
+    assert result["heightmap_imported"] is False
+    assert str(module.MAX_HEIGHTMAP_IMPORT_SIZE) in result["warnings"][0]
+    assert "tiled import" in result["warnings"][0]
+
+
+def _asset_data(package, class_name, tags=None):
+    asset_data = MagicMock()
+    asset_data.package_name = package
+    asset_data.asset_name = package.rsplit("/", 1)[-1]
+    asset_data.asset_class_path.asset_name = class_name
+    asset_data.get_tag_value.side_effect = lambda tag: (tags or {}).get(tag)
+    return asset_data
+
+
+def test_asset_index_queries_and_follows_registry_events(plugin):
+    module, unreal = plugin
+    registry = unreal.AssetRegistryHelpers.get_asset_registry.return_value
+    registry.get_assets_by_path.return_value = [
+        _asset_data("/Game/Props/SM_Cup", "StaticMesh"),
+        _asset_data("/Game/Props/SM_Plate", "StaticMesh"),
+        _asset_data("/Game/Props/M_Wood", "Material"),
+        _asset_data("/Game/Blueprints/BP_Door", "Blueprint", {"ParentClass": "Actor"}),
+    ]
+
+    result = module.handle_query_assets({"prefix": "/Game/Props/", "class_name": "StaticMesh", "limit": 1})
+    assert result["count"] == 2
+    assert result["truncated"] is True
+    assert result["assets"][0]["path"] == "/Game/Props/SM_Cup.SM_Cup"
+    assert module.handle_query_assets({"tag": "ParentClass=Actor"})["assets"][0]["name"] == "BP_Door"
+
+    # Later queries use the index; registry events keep it current
+    module.handle_query_assets({})
+    registry.get_assets_by_path.assert_called_once()
+    on_added = registry.on_asset_added.add_callable.call_args[0][0]
+    on_removed = registry.on_asset_removed.add_callable.call_args[0][0]
+    on_renamed = registry.on_asset_renamed.add_callable.call_args[0][0]
+    on_added(_asset_data("/Game/Props/SM_Bowl", "StaticMesh"))
+    on_removed(_asset_data("/Game/Props/SM_Plate", "StaticMesh"))
+    on_renamed(_asset_data("/Game/Props/SM_Mug", "StaticMesh"), "/Game/Props/SM_Cup.SM_Cup")
+
+    names = [a["name"] for a in module.handle_query_assets({"class_name": "StaticMesh"})["assets"]]
+    assert names == ["SM_Bowl", "SM_Mug"]
+    assert module.ASSET_INDEX.find("SM_Mug", "StaticMesh") == ["/Game/Props/SM_Mug.SM_Mug"]
+
+
+def test_wire_round_trip_with_gzip(plugin):
+    module, _ = plugin
+    request = {"command": "populate_level", "params": {"transforms": {"data": "A" * 50000}}}
+    body = gzip.compress(json.dumps(request).encode())
+    assert module.wire_decode(body, "application/json", "gzip") == request
+
+    response = {"status": "ok", "data": {"series": {"frame_ms": [16.6] * 5000}}}
+    body, headers = module.wire_encode(response, "application/json", "gzip, deflate")
+    assert headers == {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+    assert json.loads(gzip.decompress(body)) == response
+
+    # Small responses, and clients that accept no compression, get plain JSON
+    assert module.wire_encode({"status": "ok"}, None, "gzip")[1] == {"Content-Type": "application/json"}
+    assert "Content-Encoding" not in module.wire_encode(response, None, None)[1]
+    assert "gzip" in module.wire_capabilities()["compression"]
+
+
+# Loads the plugin outside Unreal on the engine's Python and exercises the
+# parts that run without the editor
+ENGINE_PYTHON_SMOKE = """
+import importlib.util, sys
+spec = importlib.util.spec_from_file_location("ue5_mcp_server", sys.argv[1])
+module = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(module)
+
+index = module.AssetIndex()
+index.build([
+    {"path": "/Game/Props/Chair", "name": "Chair", "class": "StaticMesh", "tags": {}},
+    {"path": "/Game/Props/Table", "name": "Table", "class": "StaticMesh", "tags": {}},
+])
+assert index.find("Chair", "StaticMesh") == ["/Game/Props/Chair"]
+assert index.query(prefix="/Game/Props", limit=1)[1] == 2
+
+data = {"values": list(range(2000))}
+body, headers = module.wire_encode(data, "application/json", "gzip")
+assert module.wire_decode(body, headers["Content-Type"], headers.get("Content-Encoding")) == data
+print(sys.version_info[:2])
+"""
+
+
+@pytest.fixture
+def engine_python():
+    """The Python UE5 bundles (3.9): MCP_UE5_PYTHON, else python3.9 on PATH."""
+    python = os.environ.get("MCP_UE5_PYTHON") or shutil.which("python3.9")
+    if not python:
+        pytest.skip("Python 3.9 is not available")
+    try:
+        version = subprocess.run(
+            [python, "-c", "import sys; print(sys.version_info[:2])"], capture_output=True, text=True, timeout=30
+        ).stdout.strip()
+    except OSError:
+        version = ""
+    if version != "(3, 9)":
+        pytest.skip(f"{python} is not a working Python 3.9")
+    return python
+
+
+def test_plugin_runs_on_engine_python(engine_python):
+    proc = subprocess.run(
+        [engine_python, "-c", ENGINE_PYTHON_SMOKE, str(PLUGIN_PATH)], capture_output=True, text=True, timeout=60
+    )
+
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip().endswith("(3, 9)")
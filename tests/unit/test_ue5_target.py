@@ -1,3 +1,4 @@
+import json
 from unittest.mock import MagicMock, patch
 
 import pytest
@@ -7,18 +8,22 @@ from mcp_protocol.models import (
     GenerateBlueprintInput,
     GenerateTerrainInput,
     ImportAssetInput,
+    ImportAssetsInput,
     OptimizeLevelInput,
     PopulateLevelInput,
     ProfilePerformanceInput,
+    QueryAssetsInput,
 )
 from mcp_target_ue5.tools import (
     debug_blueprint,
     generate_blueprint,
     generate_terrain,
     import_asset,
+    import_assets,
     optimize_level,
     populate_level,
     profile_performance,
+    query_assets,
 )
 from mcp_target_ue5.transport import HttpTransport
 
@@ -99,12 +104,18 @@ def test_profile_performance(context_setup) -> None:
 
 
 def test_optimize_level(context_setup) -> None:
+    mock_transport = MagicMock()
+    mock_transport.send_command.return_value = {"data": {"components": []}}
     input_data = OptimizeLevelInput(
         dry_run=True
     )
-    result = optimize_level(input_data)
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = optimize_level(input_data)
     assert result.status == "ok"
-    assert result.result["message"] == "Optimization pass complete"
+    assert result.result["message"] == "Planned 0 optimization actions"
+    # A dry run reads the level inventory but never applies anything
+    mock_transport.send_command.assert_called_once()
+    assert mock_transport.send_command.call_args[0][0] == "level_inventory"
 
 
 def test_debug_blueprint(context_setup) -> None:
@@ -136,3 +147,265 @@ def test_transport_instantiation() -> None:
         resp = transport.send_command("ping", {})
         assert resp["status"] == "ok"
         transport.disconnect()
+
+
+def test_transport_compresses_large_requests_after_handshake() -> None:
+    import gzip
+
+    transport = HttpTransport(host="localhost", port=8080)
+    with patch("httpx.get") as mock_get, patch("httpx.post") as mock_post:
+        mock_get.return_value.json.return_value = {
+            "status": "ok", "wire": {"encodings": ["json"], "compression": ["gzip"]}
+        }
+        mock_post.return_value.headers = {"Content-Type": "application/json"}
+        mock_post.return_value.json.return_value = {"status": "ok", "data": {}}
+
+        transport.send_command("ping", {})
+        mock_get.assert_not_called()
+
+        transforms = {"count": 100000, "data": "A" * 100000}
+        transport.send_command("populate_level", {"transforms": transforms})
+
+    mock_get.assert_called_once()
+    kwargs = mock_post.call_args.kwargs
+    assert kwargs["headers"]["Content-Encoding"] == "gzip"
+    assert len(kwargs["content"]) < 100000
+    assert json.loads(gzip.decompress(kwargs["content"]))["params"]["transforms"] == transforms
+
+
+def test_import_asset_skips_unchanged_export(context_setup, tmp_path, monkeypatch) -> None:
+    from mcp_core.config.settings import settings
+    from mcp_protocol.models import ExportManifest
+
+    monkeypatch.setattr(settings.cache, "incremental_builds", True)
+    monkeypatch.setattr(settings.cache, "root", tmp_path / "cache")
+
+    export_path = tmp_path / "chair.fbx"
+    export_path.write_bytes(b"fbx-v1")
+    manifest_path = tmp_path / "chair.fbx.manifest.json"
+    manifest_path.write_text(
+        ExportManifest(export_path=str(export_path), format="fbx", object_name="Chair").model_dump_json()
+    )
+
+    status = {"project": "/Projects/A/A.uproject", "missing": []}
+
+    def send_command(command, params, timeout=None):
+        if command == "asset_status":
+            return {"data": status}
+        return {"data": {"asset_path": "/Game/Imports/", "imported": ["/Game/Imports/Chair"], "project": "/Projects/A/A.uproject"}}
+
+    mock_transport = MagicMock()
+    mock_transport.base_url = "http://localhost:8080"
+    mock_transport.send_command.side_effect = send_command
+    input_data = ImportAssetInput(manifest_path=str(manifest_path))
+
+    def imports() -> int:
+        return sum(1 for c in mock_transport.send_command.call_args_list if c.args[0] == "import_asset")
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        first = import_asset(input_data)
+        second = import_asset(input_data)
+        assert imports() == 1
+        assert "skipped" not in first.result
+        assert second.result["skipped"] is True
+        assert second.result["asset_path"] == "/Game/Imports/"
+
+        export_path.write_bytes(b"fbx-v2 changed")
+        third = import_asset(input_data)
+        assert imports() == 2
+        assert "skipped" not in third.result
+
+        # Assets deleted since, or another project open in the editor, import again
+        status["missing"] = ["/Game/Imports/Chair"]
+        assert "skipped" not in import_asset(input_data).result
+        status.update(missing=[], project="/Projects/B/B.uproject")
+        assert "skipped" not in import_asset(input_data).result
+        assert imports() == 4
+
+        # A different UE5 server never shares records
+        mock_transport.base_url = "http://buildbox:8080"
+        status["project"] = "/Projects/A/A.uproject"
+        assert "skipped" not in import_asset(input_data).result
+
+
+def test_import_assets_dry_run_resolves_glob(context_setup, tmp_path) -> None:
+    for name in ("b", "a"):
+        (tmp_path / f"{name}.manifest.json").write_text("{}")
+    explicit = str(tmp_path / "b.manifest.json")
+
+    result = import_assets(ImportAssetsInput(
+        manifest_paths=[explicit],
+        manifest_glob=str(tmp_path / "*.manifest.json"),
+        dry_run=True,
+    ))
+
+    assert result.status == "ok"
+    assert result.result["manifest_paths"] == [explicit, str(tmp_path / "a.manifest.json")]
+
+
+def test_import_assets_checks_glob_matches_against_policy(context_setup, tmp_path, monkeypatch) -> None:
+    from mcp_core.config.settings import settings
+
+    for folder in ("safe", "outside"):
+        (tmp_path / folder).mkdir()
+        (tmp_path / folder / "rock.manifest.json").write_text("{}")
+    monkeypatch.setattr(settings.policy, "allowed_paths", [str(tmp_path / "safe")])
+
+    result = import_assets(ImportAssetsInput(manifest_glob=str(tmp_path / "*" / "*.manifest.json"), dry_run=True))
+
+    assert result.status == "error"
+    assert result.error.code == "POLICY_DENIED"
+    assert "outside" in result.error.message
+
+
+def test_import_assets_requires_manifests(context_setup, tmp_path) -> None:
+    result = import_assets(ImportAssetsInput(manifest_glob=str(tmp_path / "*.json")))
+
+    assert result.status == "error"
+    assert result.error.code == "VALIDATION_ERROR"
+
+
+def test_import_assets_sends_one_command(context_setup) -> None:
+    mock_transport = MagicMock()
+    mock_transport.timeout = 30.0
+    mock_transport.send_command.return_value = {"data": {"results": [
+        {"manifest_path": "a.json", "status": "ok", "imported": ["/Game/Imports/A"]},
+        {"manifest_path": "b.json", "status": "error", "error": "Manifest not found"},
+    ]}}
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = import_assets(ImportAssetsInput(manifest_paths=["a.json", "b.json", "a.json"], overwrite=True))
+
+    mock_transport.send_command.assert_called_once()
+    command, params = mock_transport.send_command.call_args[0]
+    assert command == "import_assets"
+    assert params == {"manifest_paths": ["a.json", "b.json"], "overwrite": True}
+    assert mock_transport.send_command.call_args[1]["timeout"] > 30.0
+
+    assert result.status == "ok"
+    assert result.result["imported_count"] == 1
+    assert result.result["failed_count"] == 1
+    assert result.warnings == ["b.json: Manifest not found"]
+
+
+def test_populate_level_clamps_to_budget_and_sends_transforms(context_setup, tmp_path) -> None:
+    np = pytest.importorskip("numpy")
+
+    heightmap = tmp_path / "terrain.npy"
+    np.save(heightmap, np.zeros((8, 8)))
+    mock_transport = MagicMock()
+    mock_transport.timeout = 30.0
+    mock_transport.send_command.return_value = {"data": {"count": 50, "actor": "/Game/Map.Map:MCP_Tree_Instances"}}
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = populate_level(PopulateLevelInput(
+            asset_type="Tree_01", density=500, seed=1, budget_max_instances=50,
+            bounds=(0, 0, 1000, 1000), heightmap_path=str(heightmap),
+        ))
+
+    command, params = mock_transport.send_command.call_args[0]
+    assert command == "populate_level"
+    assert params["asset_type"] == "Tree_01"
+    assert params["transforms"]["count"] == 50
+    assert result.result["count"] == 50
+    assert result.result["actor"] == "/Game/Map.Map:MCP_Tree_Instances"
+    assert "exceeds the budget of 50" in result.warnings[0]
+
+
+def test_populate_level_rejects_degenerate_bounds(context_setup) -> None:
+    pytest.importorskip("numpy")
+    result = populate_level(PopulateLevelInput(asset_type="Tree_01", density=10, bounds=(0, 0, 0, 1000)))
+
+    assert result.status == "error"
+    assert result.error.code == "VALIDATION_ERROR"
+    assert "positive width and height" in result.error.message
+
+
+def test_generate_terrain_writes_heightmap_tiles(context_setup, tmp_path, monkeypatch) -> None:
+    monkeypatch.setattr("mcp_target_ue5.tools.artifact_manager.ensure_run_dir", lambda run_id: tmp_path)
+    mock_transport = MagicMock()
+    mock_transport.send_command.return_value = {"data": {"terrain_path": "/Game/Maps/MCP_GeneratedTerrain"}}
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = generate_terrain(GenerateTerrainInput(width=100, height=100, detail_level="low", seed=4))
+
+    command, params = mock_transport.send_command.call_args[0]
+    assert command == "generate_terrain"
+    assert params["layout"]["quads_per_section"] == 63
+    assert len(params["tiles"]) == 1
+    assert (tmp_path / "terrain" / "heightmap_x0_y0.r16").stat().st_size == 127 * 127 * 2
+    assert result.result["resolution"] == [127, 127]
+    assert [a.metadata["type"] for a in result.artifacts] == ["heightmap_tile"]
+
+
+def test_profile_performance_summarizes_series(context_setup) -> None:
+    mock_transport = MagicMock()
+    mock_transport.timeout = 30.0
+    mock_transport.send_command.return_value = {"data": {
+        "message": "Profiled level 'TestLevel'",
+        "frames": 4,
+        "series": {"frame_ms": [16.0, 16.0, 17.0, 60.0], "draw_calls": [900.0, 950.0, 1000.0, 1100.0]},
+    }}
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = profile_performance(ProfilePerformanceInput(level_name="TestLevel", frames=4))
+
+    assert mock_transport.send_command.call_args[0][1] == {"level_name": "TestLevel", "frames": 4}
+    assert result.result["metrics"]["frame_ms"]["max"] == 60.0
+    assert result.result["hitches"]["count"] == 1
+    assert result.artifacts[0].metadata["type"] == "profile_series"
+    assert '"frame_ms": [16.0, 16.0, 17.0, 60.0]' in result.artifacts[0].content
+
+
+def test_optimize_level_dry_run_plans_supplied_inventory(context_setup) -> None:
+    inventory = [
+        {"actor": f"Rock_{i}", "mesh": "/Game/SM_Rock", "materials": 1, "triangles": 100} for i in range(10)
+    ]
+
+    result = optimize_level(OptimizeLevelInput(dry_run=True, inventory=inventory, budgets={"max_draw_calls": 5}))
+
+    assert result.result["budgets"]["draw_calls"] == 5
+    assert result.result["over_budget"] == ["draw_calls"]
+    assert [a["kind"] for a in result.result["actions"]] == ["merge_to_instances"]
+    assert result.result["message"] == "Planned 1 optimization actions"
+
+
+def test_optimize_level_applies_plan_from_level_inventory(context_setup) -> None:
+    inventory = [
+        {"actor": f"Rock_{i}", "mesh": "/Game/SM_Rock", "materials": 1, "triangles": 100} for i in range(10)
+    ]
+    mock_transport = MagicMock()
+    mock_transport.timeout = 30.0
+    mock_transport.send_command.side_effect = [
+        {"data": {"components": inventory}},
+        {"data": {"message": "Optimization pass complete", "optimized_count": 1, "applied": [{"status": "ok"}]}},
+    ]
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = optimize_level(OptimizeLevelInput(budgets={"max_draw_calls": 5}))
+
+    commands = [c[0][0] for c in mock_transport.send_command.call_args_list]
+    assert commands == ["level_inventory", "optimize_level"]
+    sent = mock_transport.send_command.call_args_list[1][0][1]["actions"]
+    assert sent[0]["kind"] == "merge_to_instances"
+    assert result.result["optimized_count"] == 1
+
+
+def test_query_assets_warns_when_truncated(context_setup) -> None:
+    mock_transport = MagicMock()
+    mock_transport.send_command.return_value = {"data": {
+        "assets": [{"path": "/Game/Props/SM_Cup.SM_Cup", "name": "SM_Cup", "class": "StaticMesh", "tags": {}}],
+        "count": 3,
+        "truncated": True,
+    }}
+
+    with patch("mcp_target_ue5.tools.get_transport", return_value=mock_transport):
+        result = query_assets(QueryAssetsInput(prefix="/Game/Props/", class_name="StaticMesh", limit=1))
+
+    assert mock_transport.send_command.call_args[0][:2] == (
+        "query_assets",
+        {"prefix": "/Game/Props/", "class_name": "StaticMesh", "limit": 1, "refresh": False},
+    )
+    assert result.result["count"] == 3
+    assert len(result.result["assets"]) == 1
+    assert result.warnings
@@ -0,0 +1,41 @@
+import gzip
+import json
+
+import pytest
+from mcp_protocol import wire
+
+
+def test_dumps_compresses_only_large_payloads() -> None:
+    fmt = wire.WireFormat("json", "gzip")
+    small, used = wire.dumps({"a": 1}, fmt)
+    assert used == wire.JSON
+    assert json.loads(small) == {"a": 1}
+
+    message = {"values": list(range(10000))}
+    large, used = wire.dumps(message, fmt)
+    assert used == fmt
+    assert len(large) < len(json.dumps(message))
+    assert json.loads(gzip.decompress(large)) == message
+    assert wire.loads(large, used) == message
+
+
+def test_negotiate_falls_back_to_json() -> None:
+    assert wire.negotiate(None) == wire.JSON
+    assert wire.negotiate("pong") == wire.JSON
+    assert wire.negotiate({"encodings": ["cbor"], "compression": ["brotli"]}) == wire.JSON
+    assert wire.negotiate({"encodings": ["json"], "compression": ["gzip"]}) == wire.WireFormat("json", "gzip")
+
+
+def test_frame_header_round_trip() -> None:
+    header = wire.frame_header(wire.WireFormat("json", "gzip"), 1234)
+    assert header == b"#json gzip 1234\n"
+    assert wire.parse_frame_header(header) == (wire.WireFormat("json", "gzip"), 1234)
+    assert wire.parse_frame_header(b"#json identity 5\n") == (wire.JSON, 5)
+    with pytest.raises(ValueError, match="Malformed frame header"):
+        wire.parse_frame_header(b"#json\n")
+
+
+def test_encoding_for_content_type() -> None:
+    assert wire.encoding_for("application/msgpack") == "msgpack"
+    assert wire.encoding_for("application/json; charset=utf-8") == "json"
+    assert wire.encoding_for(None) == "json"